@@ -0,0 +1,102 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark loading the arguments of every command of the command table, as `az -h` and tab
+completion do, with and without the cached signatures of the operations."""
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+
+from automation.performance.benchmark import best_time, report, main
+
+
+def run_benchmark(number):
+    folder = tempfile.mkdtemp()
+    os.environ['AZURE_CONFIG_DIR'] = folder
+    try:
+        from importlib import import_module
+        import azure.cli.core.commands._signature_cache as signature_cache
+        from azure.cli.core.commands import (get_command_table, command_module_map, CliArgumentType,
+                                             _update_command_definitions, _cli_argument_registry)
+
+        command_table = get_command_table()
+        # register the argument overrides of all the modules
+        modules = {}
+        for name, module in command_module_map.items():
+            modules.setdefault(module[:module.rfind('.')], name)
+        for module, name in modules.items():
+            try:
+                import_module(module).load_params(name)
+            except Exception as ex:  # pylint: disable=broad-except
+                print('Unable to load the parameters of {}: {}'.format(module, ex))
+        # leave out the commands whose operations cannot be imported, e.g. a missing SDK
+        for name, command in list(command_table.items()):
+            try:
+                command.load_arguments()
+            except ImportError as ex:
+                print('Unable to load the arguments of {}: {}'.format(name, ex))
+                del command_table[name]
+        print('{} commands of {} modules'.format(len(command_table), len(modules)))
+
+        def _load_arguments():
+            # a new cache, which reads the cache files again
+            signature_cache._signature_cache = None  # pylint: disable=protected-access
+            with signature_cache.get_signature_cache().transaction():
+                for command in command_table.values():
+                    command.arguments = {}
+                    command.load_arguments()
+
+        def _load_arguments_cold():
+            shutil.rmtree(os.path.join(folder, signature_cache.SIGNATURE_CACHE_DIR_NAME),
+                          ignore_errors=True)
+            _load_arguments()
+
+        report('extract arguments, signatures not cached', best_time(_load_arguments_cold, number))
+        report('extract arguments, signatures cached', best_time(_load_arguments, number))
+
+        # the overrides by scope, resolved by probing every prefix of the command names
+        scopes = {}
+
+        def _add_scopes(node, words):
+            scopes[' '.join(words)] = node.arguments
+            for word, child in node.children.items():
+                _add_scopes(child, words + [word])
+        _add_scopes(_cli_argument_registry._root, [])  # pylint: disable=protected-access
+
+        def _resolve_by_probing():
+            for name, command in command_table.items():
+                parts = name.split()
+                for argument in command.arguments:
+                    result = CliArgumentType()
+                    for index in range(0, len(parts) + 1):
+                        override = scopes.get(' '.join(parts[0:index]), {}).get(argument, None)
+                        if override:
+                            result.update(override)
+
+        report('resolve overrides by probing the scopes', best_time(_resolve_by_probing, number))
+
+        def _resolve_by_argument():
+            for name, command in command_table.items():
+                for argument in command.arguments:
+                    _cli_argument_registry.get_cli_argument(name, argument)
+
+        report('resolve overrides argument by argument', best_time(_resolve_by_argument, number))
+
+        def _resolve_by_command():
+            for name in command_table:
+                _cli_argument_registry.get_cli_arguments(name, list(command_table[name].arguments))
+
+        report('resolve overrides command by command', best_time(_resolve_by_command, number))
+        report('update the command definitions',
+               best_time(lambda: _update_command_definitions(command_table), number))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main('Argument loading benchmark', run_benchmark)
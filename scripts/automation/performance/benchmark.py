@@ -0,0 +1,55 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Command line and timing shared by the benchmarks, run as
+
+    python -m automation.performance.<benchmark> [--number N] [options]
+
+from the scripts folder.
+"""
+
+from __future__ import print_function
+
+import timeit
+
+
+def best_time(func, number):
+    """The best time of `number` runs of `func`, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+
+def average_time(func, number):
+    """The average time of `number` runs of `func`, in seconds."""
+    return timeit.timeit(func, number=number) / number
+
+
+def peak_memory(func):
+    """The peak memory allocated by a run of `func` in bytes, or None when it cannot be traced."""
+    try:
+        import tracemalloc
+    except ImportError:  # Python 2
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def report(name, seconds):
+    print('{:<55}{:>12.3f} ms'.format(name, seconds * 1000))
+
+
+def main(description, benchmark, arguments=None, number=5):
+    """Parse the command line and run `benchmark` with the arguments as keywords. Besides
+    --number, the number of runs, the benchmark takes the `arguments` given as (flags,
+    add_argument keywords). Returns the result of the benchmark."""
+    import argparse
+    parser = argparse.ArgumentParser(description)
+    parser.add_argument('--number', type=int, default=number, help='Number of runs.')
+    for flags, kwargs in arguments or []:
+        parser.add_argument(*flags, **kwargs)
+    return benchmark(**vars(parser.parse_args()))
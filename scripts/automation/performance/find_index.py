@@ -0,0 +1,62 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark building, updating and querying the `az find` search index."""
+
+from __future__ import print_function
+
+import json
+import os
+import shutil
+import tempfile
+
+from automation.performance.benchmark import average_time, report, main
+
+QUERIES = [['vm', 'create'], ['storage', 'blob', 'upload'], ['keyvault', 'secret'],
+           ['network', 'AND', 'dns']]
+
+
+def run_benchmark(module, number):  # pylint: disable=protected-access
+    from whoosh.qparser import MultifieldParser
+    import azure.cli.command_modules.find.custom as find_custom
+
+    folder = tempfile.mkdtemp()
+    find_custom.INDEX_PATH = os.path.join(folder, 'search_index')
+    find_custom.MODULE_VERSIONS_PATH = os.path.join(find_custom.INDEX_PATH,
+                                                    'module_versions.json')
+    try:
+        report('full index build', average_time(find_custom._create_index, 1))
+
+        def _update_module():
+            with open(find_custom.MODULE_VERSIONS_PATH, 'r') as f:
+                versions = json.load(f)
+            versions[module] = 'stale'
+            with open(find_custom.MODULE_VERSIONS_PATH, 'w') as f:
+                json.dump(versions, f)
+            find_custom._update_index()
+
+        report("incremental update of module '{}'".format(module), average_time(_update_module, 1))
+        report('up to date check', average_time(find_custom._update_index, number))
+
+        ix = find_custom._get_index()
+        parser = MultifieldParser(['cmd_name', 'short_summary', 'long_summary', 'examples'],
+                                  schema=find_custom.schema)
+        for criteria in QUERIES:
+            query = parser.parse(' '.join(criteria) if 'AND' in criteria
+                                 else ' OR '.join(criteria))
+
+            def _search():
+                with ix.searcher() as searcher:
+                    list(searcher.search(query))
+            report('query: {}'.format(' '.join(criteria)), average_time(_search, number))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main('Search index benchmark', run_benchmark,
+         [(['--module'], {'default': 'vm',
+                          'help': 'The command module to re-index in the incremental update.'})],
+         number=20)
@@ -0,0 +1,55 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark the latency of `az <group> -h` for every command group."""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+
+from automation.performance.benchmark import average_time, main
+
+
+def get_command_groups():
+    import azure.cli.core.application
+
+    config = azure.cli.core.application.Configuration([])
+    azure.cli.core.application.APPLICATION = azure.cli.core.application.Application(config)
+    return sorted(set(name.split()[0] for name in config.get_command_table()))
+
+
+def time_help(group, number):
+    with open(os.devnull, 'w') as devnull:
+        def _run():
+            subprocess.call([sys.executable, '-m', 'azure.cli', group, '-h'],
+                            stdout=devnull, stderr=devnull)
+        return average_time(_run, number)
+
+
+def run_benchmark(groups, number):
+    from azure.cli.core.help_files import get_help_store
+
+    groups = groups or get_command_groups()
+    help_store = get_help_store().filename
+    print('{:<20}{:>15}{:>15}'.format('GROUP', 'FIRST RUN', 'CACHED'))
+    total_first, total_cached = 0.0, 0.0
+    for group in groups:
+        if os.path.exists(help_store):
+            os.remove(help_store)
+        first = time_help(group, 1)
+        cached = time_help(group, number)
+        total_first += first
+        total_cached += cached
+        print('{:<20}{:>12.0f} ms{:>12.0f} ms'.format(group, first * 1000, cached * 1000))
+    print('{:<20}{:>12.0f} ms{:>12.0f} ms'.format('TOTAL', total_first * 1000,
+                                                  total_cached * 1000))
+
+
+if __name__ == '__main__':
+    main('Help latency benchmark', run_benchmark,
+         [(['--group'], {'action': 'append', 'dest': 'groups',
+                         'help': 'The command groups to benchmark. Defaults to all of them.'})])
@@ -0,0 +1,232 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Replay recorded scenario tests offline and time the phases of the commands they run.
+
+A scenario is given as `<path to test file>:<TestClass>.<test_method>` of a `ScenarioTest` with
+a recording. Its commands are executed in-process against the VCR recording, so no request goes
+to the network. The time of each phase is the median over the runs; the first run, which imports
+the command modules, is not measured.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import unittest
+from timeit import default_timer
+
+from automation.performance.benchmark import peak_memory, main
+
+PHASES = ('load', 'parse', 'execute', 'transform', 'output')
+
+# Phases are not reported as regressed when they are slower by less than this (in seconds)
+ABSOLUTE_TOLERANCE = 0.002
+
+
+class PhaseTimer(object):
+    '''Accumulates the time spent in each phase of the commands executed in-process while in
+    the context, using the events raised by the application:
+
+    load: loading the command table
+    parse: loading the parser and parsing the arguments
+    execute: validating the arguments and running the command
+    transform: converting the result to a dict and transforming and filtering it (--query)
+    output: formatting and writing the result
+    '''
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self._mark = None
+        self._todict = 0.0
+        self._patches = []
+
+    def __enter__(self):
+        import mock
+        from azure.cli.core.application import Application, APPLICATION
+        from azure.cli.core._output import OutputProducer
+        import azure.cli.core.application
+
+        original_execute = Application.execute
+        original_raise_event = Application.raise_event
+        original_todict = azure.cli.core.application.todict
+        original_out = OutputProducer.out
+
+        def _execute(app, argv):
+            self._mark = default_timer()
+            self._todict = 0.0
+            try:
+                return original_execute(app, argv)
+            finally:
+                self._lap('transform')
+                self.totals['execute'] -= self._todict
+                self.totals['transform'] += self._todict
+
+        def _raise_event(app, name, **kwargs):
+            if app is APPLICATION and self._mark is not None:
+                phase = {Application.COMMAND_TABLE_LOADED: 'load',
+                         Application.COMMAND_PARSER_PARSED: 'parse',
+                         Application.TRANSFORM_RESULT: 'execute'}.get(name)
+                if phase:
+                    self._lap(phase)
+            return original_raise_event(app, name, **kwargs)
+
+        def _todict(obj):
+            start = default_timer()
+            try:
+                return original_todict(obj)
+            finally:
+                self._todict += default_timer() - start
+
+        def _out(producer, obj):
+            start = default_timer()
+            try:
+                return original_out(producer, obj)
+            finally:
+                self.totals['output'] += default_timer() - start
+
+        self._patches = [mock.patch.object(Application, 'execute', _execute),
+                         mock.patch.object(Application, 'raise_event', _raise_event),
+                         mock.patch('azure.cli.core.application.todict', _todict),
+                         mock.patch.object(OutputProducer, 'out', _out)]
+        for patch in self._patches:
+            patch.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for patch in reversed(self._patches):
+            patch.stop()
+        self._mark = None
+
+    def _lap(self, phase):
+        now = default_timer()
+        self.totals[phase] += now - self._mark
+        self._mark = now
+
+
+def load_scenario(spec):
+    '''Returns the test class and method name of `<path>:<TestClass>.<test_method>`.'''
+    path, name = spec.rsplit(':', 1)
+    class_name, method_name = name.split('.')
+    path = os.path.abspath(path)
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        import importlib.util
+        module_spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_name] = module
+        module_spec.loader.exec_module(module)
+    except ImportError:  # Python 2
+        import imp
+        module = imp.load_source(module_name, path)
+    test_class = getattr(module, class_name)
+    if not os.path.exists(test_class(method_name).recording_file):
+        raise ValueError("Scenario '{}' has no recording to replay.".format(spec))
+    return test_class, method_name
+
+
+def run_scenario(test_class, method_name):
+    result = unittest.TestResult()
+    test_class(method_name).run(result)
+    if result.errors or result.failures:
+        raise RuntimeError('Scenario {}.{} failed:\n{}'.format(
+            test_class.__name__, method_name, (result.errors + result.failures)[0][1]))
+
+
+def measure_scenario(test_class, method_name, number):
+    '''Returns the median time of each phase in seconds, their total and the peak memory
+    allocated by a run in bytes (None when it cannot be traced).'''
+    run_scenario(test_class, method_name)
+    runs = []
+    for _ in range(number):
+        with PhaseTimer() as timer:
+            run_scenario(test_class, method_name)
+        runs.append(timer.totals)
+    measurement = {p: _median([r[p] for r in runs]) for p in PHASES}
+    measurement['total'] = _median([sum(r.values()) for r in runs])
+    measurement['peak_memory'] = peak_memory(lambda: run_scenario(test_class, method_name))
+    return measurement
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def find_regressions(results, baseline, threshold):
+    '''Returns (scenario, metric, baseline value, value) of the metrics more than `threshold`
+    (a ratio) worse than in the baseline.'''
+    regressions = []
+    for scenario, measurement in sorted(results.items()):
+        for metric, value in sorted(measurement.items()):
+            expected = baseline.get(scenario, {}).get(metric)
+            if value is None or expected is None:
+                continue
+            tolerance = 0 if metric == 'peak_memory' else ABSOLUTE_TOLERANCE
+            if value > expected * (1 + threshold) + tolerance:
+                regressions.append((scenario, metric, expected, value))
+    return regressions
+
+
+def _format(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'peak_memory':
+        return '{:.1f} MB'.format(value / 1024.0 / 1024.0)
+    return '{:.0f} ms'.format(value * 1000)
+
+
+def report(results):
+    metrics = PHASES + ('total', 'peak_memory')
+    print(('{:<60}' + '{:>12}' * len(metrics)).format('SCENARIO', *[m.upper() for m in metrics]))
+    for scenario, measurement in sorted(results.items()):
+        print(('{:<60}' + '{:>12}' * len(metrics)).format(
+            scenario, *[_format(m, measurement[m]) for m in metrics]))
+
+
+def run_benchmark(specs, number, baseline_file=None, save_baseline=False, threshold=0.1):
+    from azure.cli.testsdk.const import ENV_LIVE_TEST
+    os.environ.pop(ENV_LIVE_TEST, None)
+    results = {}
+    for spec in specs:
+        test_class, method_name = load_scenario(spec)
+        results['{}.{}'.format(test_class.__name__, method_name)] = \
+            measure_scenario(test_class, method_name, number)
+    report(results)
+
+    if baseline_file and save_baseline:
+        baseline = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(baseline_file, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print('Baseline saved to {}'.format(baseline_file))
+    elif baseline_file:
+        with open(baseline_file) as f:
+            regressions = find_regressions(results, json.load(f), threshold)
+        for scenario, metric, expected, value in regressions:
+            print('REGRESSION {} {}: {} -> {}'.format(scenario, metric, _format(metric, expected),
+                                                      _format(metric, value)))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main('Offline performance regression benchmark of recorded scenarios', run_benchmark, [
+        (['specs'], {'nargs': '+', 'metavar': 'scenario',
+                     'help': 'Scenarios as <path to test file>:<TestClass>.<test_method>.'}),
+        (['--baseline'], {'dest': 'baseline_file',
+                          'help': 'JSON file of the baseline measurements.'}),
+        (['--save-baseline'], {'action': 'store_true',
+                               'help': 'Store the measurements in the baseline instead of '
+                                       'comparing them.'}),
+        (['--threshold'], {'type': float, 'default': 0.1,
+                           'help': 'Ratio by which a phase or the peak memory may exceed the '
+                                   'baseline.'})]))
@@ -0,0 +1,63 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark the table output of large results, formatted by tabulate or streamed."""
+
+from __future__ import print_function
+
+from collections import OrderedDict
+
+from automation.performance.benchmark import best_time, peak_memory, main
+
+
+def create_result(size):
+    return [OrderedDict([('name', 'vm{}'.format(i)),
+                         ('resourceGroup', 'group{}'.format(i % 10)),
+                         ('location', 'westus'),
+                         ('vmSize', 'Standard_DS1_v2'),
+                         ('diskSizeGb', 128 + i % 3),
+                         ('provisioningState', 'Succeeded')]) for i in range(size)]
+
+
+class _NullFile(object):  # pylint: disable=too-few-public-methods
+    '''Counts the characters written instead of writing them.'''
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, text):
+        self.written += len(text)
+
+
+def run_benchmark(sizes, number, sample_rows):
+    from azure.cli.core._output import TableOutput, OutputProducer
+
+    def _out(output):
+        OutputProducer(formatter=lambda _: output, file=_NullFile()).out(None)
+
+    print('{:<12}{:<12}{:>12}{:>12}{:>16}'.format('ROWS', 'FORMATTER', 'TIME', 'PEAK MEMORY',
+                                                  'FIRST OUTPUT'))
+    for size in sizes:
+        result = create_result(size)
+        for name, format_table in [
+                ('tabulate', lambda: TableOutput().dump(result)),
+                ('streamed', lambda: TableOutput().stream(result, sample_rows))]:
+            seconds = best_time(lambda: _out(format_table()), number)
+            peak = peak_memory(lambda: _out(format_table()))
+            # the time until the first line can be written
+            first = best_time(lambda: next(iter([format_table()] if name == 'tabulate'
+                                                else format_table())), number)
+            print('{:<12}{:<12}{:>9.0f} ms{:>12}{:>13.0f} ms'.format(
+                size, name, seconds * 1000,
+                '-' if peak is None else '{:.1f} MB'.format(peak / 1024.0 / 1024.0), first * 1000))
+
+
+if __name__ == '__main__':
+    main('Table output benchmark', run_benchmark, [
+        (['--sizes'], {'type': int, 'nargs': '+', 'default': [10000, 100000],
+                       'help': 'Numbers of rows of the tables.'}),
+        (['--sample-rows'], {'type': int, 'default': 1000,
+                             'help': 'Number of rows the streamed table determines its columns '
+                                     'from.'})], number=3)
@@ -0,0 +1,74 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark loading, querying and updating the token cache with many cached tokens."""
+
+from __future__ import print_function
+
+import json
+import os
+import shutil
+import tempfile
+
+import adal
+
+from azure.cli.core._token_store import IndexedTokenCache, TokenStore, ADD
+from automation.performance.benchmark import average_time, report, main
+
+
+def _create_entries(count):
+    entries = []
+    for i in range(count):
+        entries.append({
+            'tokenType': 'Bearer',
+            'expiresOn': '2017-04-01 12:00:00.000000',
+            'resource': 'https://management.core.windows.net/',
+            'accessToken': 'access token {}'.format(i) * 20,
+            'refreshToken': 'refresh token {}'.format(i) * 20,
+            'userId': 'user{}@contoso.com'.format(i),
+            'isMRRT': True,
+            '_clientId': '04b07795-8ddb-461a-bbee-02f9e1bf7b46',
+            '_authority': 'https://login.microsoftonline.com/tenant{}'.format(i % 50)
+        })
+    return entries
+
+
+def run_benchmark(count, number):
+    folder = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(folder, 'accessTokens.json')
+        entries = _create_entries(count)
+        with open(filename, 'w') as f:
+            json.dump(entries, f)
+        store = TokenStore(filename)
+        state = json.dumps(store.load())
+        query = {'userId': 'user{}@contoso.com'.format(count // 2),
+                 '_clientId': '04b07795-8ddb-461a-bbee-02f9e1bf7b46'}
+        adal_cache = adal.TokenCache(state)
+        indexed_cache = IndexedTokenCache(state)
+        refreshed = dict(entries[0], accessToken='refreshed')
+
+        def _rewrite_all():
+            with open(filename + '.full', 'w') as f:
+                f.write(json.dumps(entries))
+
+        print('{} cached tokens, average of {} runs'.format(count, number))
+        report('load file and journal', average_time(store.load, number))
+        report('build adal.TokenCache', average_time(lambda: adal.TokenCache(state), number))
+        report('build IndexedTokenCache', average_time(lambda: IndexedTokenCache(state), number))
+        report('find with adal.TokenCache', average_time(lambda: adal_cache.find(query), number))
+        report('find with IndexedTokenCache',
+               average_time(lambda: indexed_cache.find(query), number))
+        report('persist refreshed token (full rewrite)', average_time(_rewrite_all, number))
+        report('persist refreshed token (journal)',
+               average_time(lambda: store.append([(ADD, refreshed)]), number))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main('Token cache benchmark', run_benchmark,
+         [(['--count'], {'type': int, 'default': 10000, 'help': 'Number of cached tokens.'})],
+         number=20)
@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Benchmark the transformation of a large command result and the events raised with it."""
+
+from __future__ import print_function
+
+from automation.performance.benchmark import best_time, average_time, report, main
+
+_ID = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/group{}/providers/' \
+      'Microsoft.Compute/virtualMachines/vm{}'
+
+
+def create_result(size):
+    '''A list of `size` resources with nested dicts, a few of them with certificates.'''
+    result = []
+    for i in range(size):
+        item = {
+            'id': _ID.format(i % 10, i),
+            'name': 'vm{}'.format(i),
+            'location': 'westus',
+            'tags': {'env': 'test'},
+            'properties': {
+                'provisioningState': 'Succeeded',
+                'hardwareProfile': {'vmSize': 'Standard_DS1_v2'},
+                'networkProfile': {'networkInterfaces': [{'id': _ID.format(i % 10, i) + '-nic'}]}
+            }
+        }
+        if i % 100 == 0:
+            item['properties']['secrets'] = [{
+                'sourceVault': {'id': _ID.format(0, 'vault')},
+                'vaultCertificates': [{'x509Thumbprint': 'AAECAwQFBgcICQ=='}]}]
+        result.append(item)
+    return result
+
+
+def _time(func, size, number):
+    '''The best time of `number` runs of `func` on a new result of `size` items.'''
+    results = [create_result(size) for _ in range(number)]
+    return best_time(lambda: func(results.pop()), number)
+
+
+def run_benchmark(size, number):
+    import logging
+    import os
+    import sys
+    import azure.cli.core.azlogging as azlogging
+    from azure.cli.core.application import Application, Configuration
+    from azure.cli.core.extensions.transform import (
+        transform_result, result_transforms, _add_resource_group, _add_x509_hex)
+
+    def _separate(result):
+        _add_resource_group(result)
+        _add_x509_hex(result)
+
+    print('{} items'.format(size))
+    report('transforms in separate traversals', _time(_separate, size, number))
+    report('transforms in one traversal',
+           _time(lambda r: transform_result(r, result_transforms), size, number))
+
+    application = Application(Configuration([]))
+    event_data = {'result': create_result(size)}
+    loggers = [logging.getLogger(), logging.getLogger('az')]
+    handlers = [logger.handlers for logger in loggers]
+    stderr = sys.stderr
+    try:
+        for name, argv in [('event raised', []),
+                           ('event raised, --verbose', ['--verbose']),
+                           ('event raised, --debug', ['--debug'])]:
+            # the console handlers are created by configure_logging, writing the debug output
+            # to the null device
+            for logger in loggers:
+                logger.handlers = []
+            sys.stderr = open(os.devnull, 'w')
+            azlogging.configure_logging(argv)
+            seconds = average_time(
+                lambda: application.raise_event('Benchmark.Event', event_data=event_data),
+                number)
+            sys.stderr.close()
+            sys.stderr = stderr
+            report(name, seconds)
+    finally:
+        sys.stderr = stderr
+        for logger, logger_handlers in zip(loggers, handlers):
+            logger.handlers = logger_handlers
+
+
+if __name__ == '__main__':
+    main('Result transformation benchmark', run_benchmark,
+         [(['--size'], {'type': int, 'default': 100000, 'help': 'Number of items of the result.'})],
+         number=3)
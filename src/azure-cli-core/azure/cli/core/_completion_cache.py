@@ -0,0 +1,139 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import time
+from functools import wraps
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core._environment import get_config_dir
+
+logger = azlogging.get_az_logger(__name__)
+
+COMPLETION_CACHE_FILE_NAME = 'completionCache.json'
+DEFAULT_COMPLETION_CACHE_TTL = 5 * 60
+# stale values are still served, while being refreshed, until they are this old
+MAX_COMPLETION_AGE = 7 * 24 * 3600
+# a refresh not done after this many seconds is started again
+REFRESH_TIMEOUT = 60
+
+_VALUES, _UPDATED, _REFRESHING = range(3)
+
+
+class CompletionCache(object):
+    '''Values of tab completion providers, persisted in a session file. Values are fresh for `ttl`
+    seconds. Stale values are served immediately while the completer refreshes them in the
+    background.
+    '''
+
+    def __init__(self, session, ttl=DEFAULT_COMPLETION_CACHE_TTL, clock=None, refresh=None):
+        self.session = session
+        self.ttl = ttl
+        self._clock = clock or time.time
+        self._refresh = refresh or _refresh_in_background
+
+    def get(self, key, complete):
+        '''Return the cached values of `key`, calling `complete` to get them when they are not
+        cached. Stale values are returned as they are and `complete` is called in the background
+        to replace them.'''
+        if self.ttl <= 0:
+            return complete()
+        now = self._clock()
+        entry = self.session.get(key)
+        if not entry or entry[_UPDATED] + MAX_COMPLETION_AGE <= now:
+            return self.set(key, complete())
+        if entry[_UPDATED] + self.ttl <= now and entry[_REFRESHING] + REFRESH_TIMEOUT <= now:
+            logger.debug("Refreshing the stale completion values of '%s'", key)
+            # mark the refresh so that the next completions don't start another one
+            self.session[key] = [entry[_VALUES], entry[_UPDATED], now]
+            self._refresh(lambda: self.set(key, complete()))
+        return entry[_VALUES]
+
+    def set(self, key, values):
+        values = list(values)
+        now = self._clock()
+        with self.session.transaction():
+            for k in [k for k, entry in self.session.data.items()
+                      if entry[_UPDATED] + MAX_COMPLETION_AGE <= now]:
+                del self.session[k]
+            self.session[key] = [values, now, 0]
+        return values
+
+
+def _refresh_in_background(refresh):
+    '''Call `refresh` in a detached process, so that it completes after the completions are
+    returned and the process exits. Without fork, `refresh` runs on a thread.'''
+    try:
+        pid = os.fork()
+    except (AttributeError, OSError):
+        import threading
+        threading.Thread(target=refresh).start()
+        return
+    if pid:
+        os.waitpid(pid, 0)
+        return
+    # fork again, so that the refresh is not a child of this process to wait for
+    try:
+        if not os.fork():
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in range(3):
+                os.dup2(devnull, fd)
+            # the shell reads the completions from fd 8 (and debug output from fd 9) until all
+            # the processes writing to them exit
+            for fd in (8, 9):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            try:
+                refresh()
+            except Exception:  # pylint: disable=broad-except
+                pass
+    finally:
+        os._exit(0)  # pylint: disable=protected-access
+
+
+def _get_current_subscription():
+    from azure.cli.core.cloud import get_active_cloud_name, get_cloud_subscription
+    return get_cloud_subscription(get_active_cloud_name())
+
+
+_completion_cache = None
+
+
+def get_completion_cache():
+    global _completion_cache  # pylint: disable=global-statement
+    if _completion_cache is None:
+        from azure.cli.core._config import az_config
+        from azure.cli.core._session import Session
+        session = Session()
+        session.load(os.path.join(get_config_dir(), COMPLETION_CACHE_FILE_NAME))
+        _completion_cache = CompletionCache(
+            session, az_config.getint('core', 'completion_cache_ttl',
+                                      fallback=DEFAULT_COMPLETION_CACHE_TTL))
+    return _completion_cache
+
+
+def cached_completer(name=None, args=None):
+    '''Decorate a completer to cache its values by `name` (the name of the completer by default),
+    the current subscription and the values of the parsed arguments `args` it depends on.'''
+    def _decorator(completer):
+        completer_name = name or '{}.{}'.format(completer.__module__, completer.__name__)
+
+        @wraps(completer)
+        def _completer(prefix, **kwargs):
+            parsed_args = kwargs.get('parsed_args')
+            key = [completer_name, _get_current_subscription()]
+            key.extend(getattr(parsed_args, arg, None) for arg in args or [])
+            try:
+                cache = get_completion_cache()
+            except (OSError, IOError, ValueError) as ex:
+                logger.debug('Completion cache unavailable: %s', ex)
+                return completer(prefix, **kwargs)
+            return cache.get(' '.join(str(k) for k in key),
+                             lambda: completer(prefix, **kwargs))
+        return _completer
+    return _decorator
@@ -8,7 +8,7 @@ import argparse
 import sys
 import textwrap
 
-from azure.cli.core.help_files import _load_help_file
+from azure.cli.core.help_files import _load_help_file, get_help_store
 
 __all__ = ['print_detailed_help', 'print_welcome_message', 'GroupHelpFile', 'CommandHelpFile']
 
@@ -50,6 +50,7 @@ def show_help(nouns, parser, is_group):
         help_file.command = ''
 
     print_detailed_help(help_file)
+    get_help_store().save()
 
 
 def show_welcome(parser):
@@ -58,6 +59,7 @@ def show_welcome(parser):
 
     help_file = GroupHelpFile('', parser)
     print_description_list(help_file.children)
+    get_help_store().save()
 
 
 def print_welcome_message():
@@ -456,9 +458,8 @@ def _normalize_text(s):
 
 
 def _load_help_file_from_string(text):
-    import yaml
     try:
-        return yaml.load(text) if text else None
+        return get_help_store().parse(text) if text else None
     except Exception:  # pylint: disable=broad-except
         return text
 
@@ -0,0 +1,304 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+
+from requests.adapters import HTTPAdapter
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core._environment import get_config_dir
+
+logger = azlogging.get_az_logger(__name__)
+
+HTTP_CACHE_DIR_NAME = 'httpCache'
+HTTP_CACHE_SECTION = 'http_cache'
+DEFAULT_HTTP_CACHE_MAX_SIZE = 50
+
+_INDEX_FILE_NAME = 'index.json'
+# the headers of a response which are cached with its body
+_CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+class HttpCachePolicy(object):  # pylint: disable=too-few-public-methods
+    '''Caches the responses of the GET requests of the paths matching `paths` for `max_age`
+    seconds. In the paths, `*` matches a segment and `**` any number of segments. The maximum age
+    can be configured as `name` in the [http_cache] section of the configuration. Responses older
+    than their maximum age are revalidated with their ETag or Last-Modified date.
+    '''
+
+    def __init__(self, name, paths, max_age=0):
+        self.name = name
+        self.max_age = max_age
+        self._patterns = [_compile_path(p) for p in paths]
+
+    def matches(self, path):
+        return any(p.match(path) for p in self._patterns)
+
+
+def _compile_path(path):
+    parts = []
+    for part in re.split(r'(\*\*|\*)', path.rstrip('/')):
+        if part == '**':
+            parts.append('.*')
+        elif part == '*':
+            parts.append('[^/]+')
+        else:
+            parts.append(re.escape(part))
+    return re.compile('^{}/?$'.format(''.join(parts)), re.IGNORECASE)
+
+
+http_cache_policies = [
+    # ARM sends no ETag for providers, they are cached for a short time and their responses are
+    # removed when a provider is registered or unregistered
+    HttpCachePolicy('providers', ['/subscriptions/*/providers', '/subscriptions/*/providers/*'],
+                    max_age=3600),
+    HttpCachePolicy('locations', ['/subscriptions/*/locations'], max_age=24 * 3600)
+]
+
+
+def register_http_cache_policy(name, paths, max_age=0):
+    '''Cache the responses of the read-only operations of `paths`, see HttpCachePolicy.'''
+    http_cache_policies.append(HttpCachePolicy(name, paths, max_age))
+
+
+def _get_policy(path):
+    from azure.cli.core._config import az_config
+    policy = next((p for p in reversed(http_cache_policies) if p.matches(path)), None)
+    if policy is None:
+        return None
+    return az_config.getint(HTTP_CACHE_SECTION, policy.name, fallback=policy.max_age)
+
+
+class HttpCache(object):
+    '''Bodies of the responses of read-only requests, stored in files of `folder` and indexed in a
+    session file with their validators. The least recently used responses are evicted when their
+    size exceeds `max_size` bytes.
+    '''
+
+    def __init__(self, folder, max_size=DEFAULT_HTTP_CACHE_MAX_SIZE * 1024 * 1024, clock=None):
+        self.folder = folder
+        self.max_size = max_size
+        self._clock = clock or time.time
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            from azure.cli.core._session import Session
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+            self._index = Session()
+            self._index.load(os.path.join(self.folder, _INDEX_FILE_NAME))
+        return self._index
+
+    @staticmethod
+    def get_key(identity, url):
+        return hashlib.sha256('{} {}'.format(identity, url).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        '''Return the entry and the body of a response, or (None, None) when it isn't cached.'''
+        entry = self.index.get(key)
+        if not entry:
+            return None, None
+        try:
+            with open(os.path.join(self.folder, key), 'rb') as f:
+                body = f.read()
+        except (OSError, IOError):
+            body = None
+        if body is None or len(body) != entry['size']:
+            del self.index[key]
+            return None, None
+        return entry, body
+
+    def is_fresh(self, entry):
+        return entry['stored'] + entry['maxAge'] > self._clock()
+
+    def touch(self, key, headers=None):
+        '''Mark a response as used, and as revalidated when given the `headers` of a 304.'''
+        entry = dict(self.index[key], used=self._clock())
+        if headers is not None:
+            entry['stored'] = entry['used']
+            entry['headers'].update((h, headers[h]) for h in _CACHED_HEADERS if h in headers)
+        self.index[key] = entry
+        return entry
+
+    def put(self, key, url, headers, body, max_age):
+        '''Store the body of a response which can be revalidated or is cached for some time.'''
+        headers = dict((h, headers[h]) for h in _CACHED_HEADERS if h in headers)
+        if len(body) > self.max_size or \
+                not (max_age > 0 or 'ETag' in headers or 'Last-Modified' in headers):
+            return
+        from azure.cli.core._session import replace_file
+        filename = os.path.join(self.folder, key)
+        temp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        try:
+            with open(temp_filename, 'wb') as f:
+                f.write(body)
+            replace_file(temp_filename, filename)
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to cache the response of '%s': %s", url, ex)
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            return
+        now = self._clock()
+        with self.index.transaction():
+            self.index[key] = {'url': url, 'headers': headers, 'size': len(body), 'stored': now,
+                               'used': now, 'maxAge': max_age}
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self.index.data.items(), key=lambda item: item[1]['used'], reverse=True)
+        size = 0
+        for key, entry in entries:
+            size += entry['size']
+            if size > self.max_size:
+                self._remove(key)
+
+    def _remove(self, key):
+        if key in self.index.data:
+            del self.index[key]
+        try:
+            os.remove(os.path.join(self.folder, key))
+        except OSError:
+            pass
+
+    def get_summary(self):
+        return OrderedDict([('folder', self.folder),
+                            ('entries', len(self.index.data)),
+                            ('size', sum(e['size'] for e in self.index.data.values())),
+                            ('maxSize', self.max_size)])
+
+    def list(self):
+        now = self._clock()
+
+        def _describe(entry):
+            return OrderedDict([
+                ('url', entry['url']),
+                ('size', entry['size']),
+                ('etag', entry['headers'].get('ETag')),
+                ('lastModified', entry['headers'].get('Last-Modified')),
+                ('age', int(now - entry['stored'])),
+                ('maxAge', entry['maxAge']),
+                ('lastUsed', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(entry['used'])))])
+        return [_describe(e) for e in
+                sorted(self.index.data.values(), key=lambda e: e['used'], reverse=True)]
+
+    def invalidate(self, path):
+        '''Remove the responses of `path`, of the paths under it and of the paths above it, e.g.
+        the listing of the collection holding a resource written to.'''
+        from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+        path = path.rstrip('/').lower()
+        with self.index.transaction():
+            for key, entry in list(self.index.data.items()):
+                cached_path = urlparse(entry['url']).path.rstrip('/').lower()
+                if _is_same_or_under(cached_path, path) or _is_same_or_under(path, cached_path):
+                    logger.debug("Response of '%s' removed from the HTTP cache", entry['url'])
+                    self._remove(key)
+
+    def clear(self):
+        with self.index.transaction():
+            for key in list(self.index.data):
+                self._remove(key)
+
+    def mount(self, config, identity):
+        '''Cache the read-only requests of a client with the configuration `config`, on behalf of
+        `identity`, e.g. the user of the subscription.'''
+        callback = getattr(config, 'session_configuration_callback', None)
+        if callback is None:
+            return
+        from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+        adapter = CachingHTTPAdapter(self, identity)
+        protocol = '{}://'.format(urlparse(config.base_url).scheme)
+
+        def _configure_session(session, global_config, local_config, **kwargs):
+            # the retry policy set by the client on the adapters of the protocols
+            adapter.max_retries = session.adapters[protocol].max_retries
+            session.mount(config.base_url, adapter)
+            return callback(session, global_config, local_config, **kwargs)
+        config.session_configuration_callback = _configure_session
+
+
+def _is_same_or_under(path, parent):
+    return path == parent or path.startswith(parent + '/')
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    '''Serves the GET requests having a cache policy from the cache while their responses are
+    fresh, and revalidates them with If-None-Match or If-Modified-Since once they are stale. The
+    other requests remove the cached responses of the paths they write to.'''
+
+    def __init__(self, cache, identity, **kwargs):
+        super(CachingHTTPAdapter, self).__init__(**kwargs)
+        self.cache = cache
+        self.identity = identity
+
+    def send(self, request, stream=False, **kwargs):  # pylint: disable=arguments-differ
+        from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+        path = urlparse(request.url).path
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            self.cache.invalidate(path)
+        # the client streams every response, the ones having a policy are read here
+        max_age = _get_policy(path) if request.method == 'GET' else None
+        if max_age is None:
+            return super(CachingHTTPAdapter, self).send(request, stream=stream, **kwargs)
+
+        key = self.cache.get_key(self.identity, request.url)
+        entry, body = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry):
+            logger.debug("Response of '%s' served from the HTTP cache", request.url)
+            return self._build_cached_response(request, self.cache.touch(key), body)
+        if entry:
+            if 'ETag' in entry['headers']:
+                request.headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                request.headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        response = super(CachingHTTPAdapter, self).send(request, stream=stream, **kwargs)
+        if entry and response.status_code == 304:
+            logger.debug("Response of '%s' revalidated in the HTTP cache", request.url)
+            response.close()
+            return self._build_cached_response(request, self.cache.touch(key, response.headers),
+                                               body)
+        if response.status_code == 200:
+            self.cache.put(key, request.url, response.headers, response.content, max_age)
+        return response
+
+    def _build_cached_response(self, request, entry, body):
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+        response = Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+_http_cache = None
+
+
+def get_http_cache():
+    global _http_cache  # pylint: disable=global-statement
+    if _http_cache is None:
+        from azure.cli.core._config import az_config
+        _http_cache = HttpCache(
+            os.path.join(get_config_dir(), HTTP_CACHE_DIR_NAME),
+            az_config.getint('core', 'http_cache_max_size',
+                             fallback=DEFAULT_HTTP_CACHE_MAX_SIZE) * 1024 * 1024)
+    return _http_cache
+
+
+def is_http_cache_enabled():
+    from azure.cli.core._config import az_config
+    return az_config.getboolean('core', 'http_cache', fallback=False)
@@ -6,6 +6,8 @@
 from __future__ import print_function, unicode_literals
 
 import errno
+import itertools
+import numbers
 import sys
 import platform
 import json
@@ -61,7 +63,12 @@ def format_text(obj):
         return ''
 
 
+# Tables with more rows are streamed, with the columns determined from this many first rows
+DEFAULT_TABLE_SAMPLE_ROWS = 1000
+
+
 def format_table(obj):
+    from azure.cli.core._config import az_config
     result = obj.result
     try:
         if obj.table_transformer and not obj.is_query_active:
@@ -69,6 +76,11 @@ def format_table(obj):
         result_list = result if isinstance(result, list) else [result]
         should_sort_keys = not obj.is_query_active and not obj.table_transformer
         to = TableOutput(should_sort_keys)
+        sample_rows = az_config.getint('core', 'table_sample_rows',
+                                       fallback=DEFAULT_TABLE_SAMPLE_ROWS)
+        max_width = az_config.getint('core', 'table_max_column_width', fallback=0)
+        if len(result_list) > sample_rows or max_width:
+            return to.stream(result_list, sample_rows, max_width)
         return to.dump(result_list)
     except:
         logger.debug(traceback.format_exc())
@@ -109,16 +121,24 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
         if platform.system() == 'Windows':
             self.file = colorama.AnsiToWin32(self.file).stream
         output = self.formatter(obj)
+        # formatters return the output, or an iterator of its chunks when streamed
+        chunks = [output] if isinstance(output, string_types) else output
+        for chunk in chunks:
+            if not self._write(chunk):
+                break
+
+    def _write(self, output):
         try:
             print(output, file=self.file, end='')
         except IOError as ex:
             if ex.errno == errno.EPIPE:
-                pass
+                return False
             else:
                 raise
         except UnicodeEncodeError:
             print(output.encode('ascii', 'ignore').decode('utf-8', 'ignore'),
                   file=self.file, end='')
+        return True
 
     @staticmethod
     def get_formatter(format_type):
@@ -170,6 +190,78 @@ class TableOutput(object):  # pylint: disable=too-few-public-methods
             raise ValueError('Unable to extract fields for table.')
         return table_str + '\n'
 
+    def stream(self, data, sample_rows, max_width=0):
+        '''Return an iterator of the lines of the table of the `data` list, laid out like
+        `dump` but without formatting all the rows first. The columns and their widths are
+        determined from the first `sample_rows` rows, and limited to `max_width` if not 0;
+        longer values are truncated and fields first found in later rows are not shown.
+        '''
+        rows = (self._auto_table_item(item) for item in data)
+        sample = list(itertools.islice(rows, sample_rows))
+        headers = OrderedDict()
+        for row in sample:
+            for header in row:
+                headers[header] = None
+        if not headers:
+            if sample:
+                raise ValueError('Unable to extract fields for table.')
+            return iter(['\n'])
+        columns = [_TableColumn(h, [r.get(h) for r in sample], max_width) for h in headers]
+        lines = ['  '.join(c.format_header() for c in columns).rstrip(),
+                 '  '.join('-' * c.width for c in columns)]
+        return _stream_table_lines(lines, itertools.chain(sample, rows), columns)
+
+
+def _stream_table_lines(lines, rows, columns, chunk_rows=500):
+    for row in rows:
+        lines.append('  '.join(c.format(row.get(c.header)) for c in columns).rstrip())
+        if len(lines) >= chunk_rows:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+class _TableColumn(object):  # pylint: disable=too-few-public-methods
+    '''A column of a streamed table. Numbers are aligned right, like tabulate does. The values of
+    columns of strings only are formatted without converting them.'''
+
+    def __init__(self, header, values, max_width):
+        present = [v for v in values if v is not None]
+        self.header = header
+        self.is_string = all(isinstance(v, string_types) for v in present)
+        self.is_numeric = bool(present) and all(_is_number(v) for v in present)
+        width = max([len(header) + 2] + [len(self._to_text(v)) for v in present])
+        self.width = min(width, max_width) if max_width else width
+
+    def format_header(self):
+        return self._align(self._truncate(self.header))
+
+    def format(self, value):
+        if self.is_string and (value is None or isinstance(value, string_types)):
+            text = value or ''
+        else:
+            text = self._to_text(value)
+        return self._align(self._truncate(text))
+
+    @staticmethod
+    def _to_text(value):
+        if value is None:
+            return ''
+        return value if isinstance(value, string_types) else _decode_str(value)
+
+    def _truncate(self, text):
+        if len(text) <= self.width:
+            return text
+        return text[:self.width - 3] + '...' if self.width > 3 else text[:self.width]
+
+    def _align(self, text):
+        return text.rjust(self.width) if self.is_numeric else text.ljust(self.width)
+
 
 class TextOutput(object):
 
@@ -6,7 +6,6 @@
 from __future__ import print_function
 
 import collections
-import errno
 import json
 import os.path
 from pprint import pformat
@@ -17,7 +16,8 @@ import adal
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core._environment import get_config_dir
 from azure.cli.core._session import ACCOUNT
-from azure.cli.core.util import CLIError, get_file_json
+from azure.cli.core._token_store import IndexedTokenCache, TokenStore, ADD, REMOVE
+from azure.cli.core.util import CLIError
 from azure.cli.core.adal_authentication import AdalAuthentication
 from azure.cli.core.cloud import get_active_cloud, set_cloud_subscription
 
@@ -77,18 +77,7 @@ def get_authority_url(tenant=None):
 
 
 def _load_tokens_from_file(file_path):
-    all_entries = []
-    if os.path.isfile(file_path):
-        all_entries = get_file_json(file_path, throw_on_empty=False) or []
-    return all_entries
-
-
-def _delete_file(file_path):
-    try:
-        os.remove(file_path)
-    except OSError as e:
-        if e.errno != errno.ENOENT:
-            raise
+    return TokenStore(file_path).load()
 
 
 class CredentialType(Enum):  # pylint: disable=too-few-public-methods
@@ -324,6 +313,11 @@ class Profile(object):
 class SubscriptionFinder(object):
     '''finds all subscriptions for a user or service principal'''
 
+    # the maximum number of tenants whose subscriptions are looked up concurrently
+    MAX_CONCURRENT_TENANTS = 10
+    # the number of seconds after which the lookup of the subscriptions of a tenant is abandoned
+    TENANT_TIMEOUT = 60
+
     def __init__(self, auth_context_factory, adal_token_cache, arm_client_factory=None):
         from azure.mgmt.resource.subscriptions import SubscriptionClient
         from azure.cli.core._debug import allow_debug_connection
@@ -387,25 +381,85 @@ class SubscriptionFinder(object):
         all_subscriptions = []
         token_credential = BasicTokenAuthentication({'access_token': access_token})
         client = self._arm_client_factory(token_credential)
-        tenants = client.tenants.list()
-        for t in tenants:
-            tenant_id = t.tenant_id
+        tenants = [t.tenant_id for t in client.tenants.list()]
+
+        def _find_using_tenant(tenant_id):
             temp_context = self._create_auth_context(tenant_id)
-            try:
-                temp_credentials = temp_context.acquire_token(resource, self.user_id, _CLIENT_ID)
-            except adal.AdalError as ex:
-                # because user creds went through the 'common' tenant, the error here must be
-                # tenant specific, like the account was disabled. For such errors, we will continue
-                # with other tenants.
-                logger.warning("Failed to authenticate '%s' due to error '%s'", t, ex)
-                continue
-            subscriptions = self._find_using_specific_tenant(
-                tenant_id,
-                temp_credentials[_ACCESS_TOKEN])
-            all_subscriptions.extend(subscriptions)
+            temp_credentials = temp_context.acquire_token(resource, self.user_id, _CLIENT_ID)
+            return self._find_using_specific_tenant(tenant_id, temp_credentials[_ACCESS_TOKEN])
+
+        # because user creds went through the 'common' tenant, errors here must be tenant
+        # specific, like the account was disabled. For such errors, we continue with the other
+        # tenants.
+        results = self._run_per_tenant(tenants, _find_using_tenant)
+        for tenant_id in tenants:
+            all_subscriptions.extend(results.get(tenant_id, []))
 
         return all_subscriptions
 
+    def _run_per_tenant(self, tenants, func):
+        '''Runs func(tenant) for the tenants concurrently. Returns a dict of the results by
+        tenant, leaving out the tenants which failed or exceeded TENANT_TIMEOUT. The tenants run
+        on daemon threads, so that the requests of the abandoned tenants don't keep the process
+        from exiting.'''
+        import threading
+        import time
+        from six.moves import queue  # pylint: disable=import-error
+
+        results = {}
+        if not tenants:
+            return results
+
+        queued = queue.Queue()
+        for tenant in tenants:
+            queued.put(tenant)
+        finished = queue.Queue()
+        started = {}
+
+        def _work():
+            while True:
+                try:
+                    tenant = queued.get_nowait()
+                except queue.Empty:
+                    return
+                started[tenant] = time.time()
+                try:
+                    finished.put((tenant, func(tenant), None))
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.debug("Failed to authenticate '%s'", tenant, exc_info=True)
+                    finished.put((tenant, None, ex))
+
+        def _start_worker():
+            thread = threading.Thread(target=_work)
+            thread.daemon = True
+            thread.start()
+
+        for _ in range(min(self.MAX_CONCURRENT_TENANTS, len(tenants))):
+            _start_worker()
+
+        remaining = set(tenants)
+        while remaining:
+            deadlines = [started[t] + self.TENANT_TIMEOUT for t in remaining if t in started]
+            timeout = max(0, min(deadlines) - time.time()) if deadlines else self.TENANT_TIMEOUT
+            try:
+                tenant, result, ex = finished.get(timeout=timeout)
+                remaining.discard(tenant)
+                if ex is None:
+                    results[tenant] = result
+                else:
+                    logger.warning("Failed to authenticate '%s' due to error '%s'", tenant, ex)
+            except queue.Empty:
+                pass
+            now = time.time()
+            for tenant in [t for t in remaining if t in started and
+                           now - started[t] >= self.TENANT_TIMEOUT]:
+                logger.warning("Abandoned tenant '%s' after %s seconds", tenant,
+                               self.TENANT_TIMEOUT)
+                remaining.discard(tenant)
+                # the worker of the tenant may never return, replace it for the queued tenants
+                _start_worker()
+        return results
+
     def _find_using_specific_tenant(self, tenant, access_token):
         from msrest.authentication import BasicTokenAuthentication
 
@@ -428,25 +482,27 @@ class CredsCache(object):
         # AZURE_ACCESS_TOKEN_FILE is used by Cloud Console and not meant to be user configured
         self._token_file = (os.environ.get('AZURE_ACCESS_TOKEN_FILE', None) or
                             os.path.join(get_config_dir(), 'accessTokens.json'))
+        self._token_store = TokenStore(self._token_file)
         self._service_principal_creds = []
+        self._pending_sp_changes = []
         self._auth_ctx_factory = auth_ctx_factory or _AUTH_CTX_FACTORY
         self.adal_token_cache = None
         self._load_creds()
 
-    def persist_cached_creds(self):
-        with os.fdopen(os.open(self._token_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
-                       'w+') as cred_file:
-            items = self.adal_token_cache.read_items()
-            all_creds = [entry for _, entry in items]
-
+    def persist_cached_creds(self, compact=False):
+        '''Persist the tokens and service principal creds changed since they were last
+        persisted, compacting the journal into the token file when `compact` is set.'''
+        changes = []
+        for op, entry in self.adal_token_cache.pending_changes:
             # trim away useless fields (needed for cred sharing with xplat)
-            for i in all_creds:
-                for key in TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE:
-                    i.pop(key, None)
-
-            all_creds.extend(self._service_principal_creds)
-            cred_file.write(json.dumps(all_creds))
-
+            entry = {k: v for k, v in entry.items()
+                     if k not in TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE}
+            changes.append((op, entry))
+        changes.extend(self._pending_sp_changes)
+        self._token_store.append(changes, compact=compact)
+
+        self.adal_token_cache.pending_changes = []
+        self._pending_sp_changes = []
         self.adal_token_cache.has_state_changed = False
 
     def retrieve_token_for_user(self, username, tenant, resource):
@@ -485,7 +541,7 @@ class CredsCache(object):
         all_entries = _load_tokens_from_file(self._token_file)
         self._load_service_principal_creds(all_entries)
         real_token = [x for x in all_entries if x not in self._service_principal_creds]
-        self.adal_token_cache = adal.TokenCache(json.dumps(real_token))
+        self.adal_token_cache = IndexedTokenCache(json.dumps(real_token))
         return self.adal_token_cache
 
     def save_service_principal_cred(self, sp_entry):
@@ -495,16 +551,17 @@ class CredsCache(object):
         state_changed = False
         if matched:
             # pylint: disable=line-too-long
-            if (sp_entry.get(_ACCESS_TOKEN, None) != getattr(matched[0], _ACCESS_TOKEN, None) or
-                    sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE, None) != getattr(matched[0], _SERVICE_PRINCIPAL_CERT_FILE, None)):
-                self._service_principal_creds.pop(matched[0])
-                self._service_principal_creds.append(matched[0])
+            if (sp_entry.get(_ACCESS_TOKEN, None) != matched[0].get(_ACCESS_TOKEN, None) or
+                    sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE, None) != matched[0].get(_SERVICE_PRINCIPAL_CERT_FILE, None)):
+                self._service_principal_creds.remove(matched[0])
+                self._service_principal_creds.append(sp_entry)
                 state_changed = True
         else:
             self._service_principal_creds.append(sp_entry)
             state_changed = True
 
         if state_changed:
+            self._pending_sp_changes.append((ADD, sp_entry))
             self.persist_cached_creds()
 
     def _load_service_principal_creds(self, creds):
@@ -528,13 +585,15 @@ class CredsCache(object):
             state_changed = True
             self._service_principal_creds = [x for x in self._service_principal_creds
                                              if x not in matched]
+            self._pending_sp_changes.extend((REMOVE, x) for x in matched)
 
         if state_changed:
-            self.persist_cached_creds()
+            # the creds logged out are removed from the token file right away
+            self.persist_cached_creds(compact=True)
 
     def remove_all_cached_creds(self):
         # we can clear file contents, but deleting it is simpler
-        _delete_file(self._token_file)
+        self._token_store.clear()
 
 
 class ServicePrincipalAuth(object):
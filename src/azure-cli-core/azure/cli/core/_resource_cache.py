@@ -0,0 +1,147 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import time
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core._environment import get_config_dir
+
+logger = azlogging.get_az_logger(__name__)
+
+RESOURCE_CACHE_FILE_NAME = 'resourceCache.json'
+DEFAULT_RESOURCE_CACHE_TTL = 24 * 3600
+
+
+def _get_key(subscription_id, resource_type, name):
+    return '/'.join([subscription_id, resource_type, name]).lower()
+
+
+def _parse_key(resource_id):
+    from azure.cli.core.commands.arm import parse_resource_id
+    parts = parse_resource_id(resource_id)
+    if not all(parts.get(p) for p in ('subscription', 'namespace', 'type', 'name')):
+        return None
+    return _get_key(parts['subscription'],
+                    '{}/{}'.format(parts['namespace'], parts['type']), parts['name'])
+
+
+class ResourceIdCache(object):
+    '''Ids of resources by subscription, resource type and name, persisted in a session file so
+    that commands locating a resource by its name don't list the resources of the subscription
+    every time. Entries expire after `ttl` seconds.
+    '''
+
+    def __init__(self, session, ttl=DEFAULT_RESOURCE_CACHE_TTL, clock=None):
+        self.session = session
+        self.ttl = ttl
+        self._clock = clock or time.time
+
+    def get(self, subscription_id, resource_type, name):
+        entry = self.session.get(_get_key(subscription_id, resource_type, name))
+        if entry and entry[1] > self._clock():
+            return entry[0]
+        return None
+
+    def add(self, resource_ids):
+        '''Cache the ids of resources, typically all the ones returned by a listing. Names shared
+        by several resources of a type are not cached.'''
+        if self.ttl <= 0:
+            return
+        ids_by_key = {}
+        for resource_id in resource_ids:
+            key = _parse_key(resource_id)
+            if key:
+                ids_by_key.setdefault(key, set()).add(resource_id)
+        now = self._clock()
+        with self.session.transaction():
+            for key in [k for k, entry in self.session.data.items() if entry[1] <= now]:
+                del self.session[key]
+            for key, ids in ids_by_key.items():
+                if len(ids) == 1:
+                    self.session[key] = [ids.pop(), now + self.ttl]
+                elif key in self.session.data:
+                    del self.session[key]
+
+    def remove(self, subscription_id, resource_type, name):
+        key = _get_key(subscription_id, resource_type, name)
+        if key in self.session.data:
+            del self.session[key]
+
+
+_resource_id_cache = None
+
+
+def get_resource_id_cache():
+    global _resource_id_cache  # pylint: disable=global-statement
+    if _resource_id_cache is None:
+        from azure.cli.core._config import az_config
+        from azure.cli.core._session import Session
+        session = Session()
+        session.load(os.path.join(get_config_dir(), RESOURCE_CACHE_FILE_NAME))
+        _resource_id_cache = ResourceIdCache(
+            session, az_config.getint('core', 'resource_cache_ttl',
+                                      fallback=DEFAULT_RESOURCE_CACHE_TTL))
+    return _resource_id_cache
+
+
+def find_resource_ids(subscription_id, resource_type, name, list_resources):
+    '''Return the ids of the resources of `resource_type` named `name` in the subscription.
+    The id is taken from the cache when present. Otherwise the resources returned by
+    `list_resources` are cached and searched.
+    '''
+    cache = get_resource_id_cache()
+    resource_id = cache.get(subscription_id, resource_type, name)
+    if resource_id:
+        return [resource_id]
+    resource_ids = [r.id for r in list_resources()]
+    cache.add(resource_ids)
+    key = _get_key(subscription_id, resource_type, name)
+    return [i for i in resource_ids if _parse_key(i) == key]
+
+
+def call_with_resource_ids(subscription_id, resource_type, name, list_resources, operation,
+                           child_operation=False):
+    '''Return `operation` called with the ids of the resources of `resource_type` named `name`,
+    as found by `find_resource_ids`. When the operation fails with 404 on an id taken from the
+    cache, the id is dropped and the operation is called again with ids from a new listing.
+    With `child_operation`, the operation may act on a child of the resource, e.g. a consumer
+    group of an IoT hub, and only fails on the id when ARM reports the resource or its resource
+    group missing, not the child.
+    '''
+    cache = get_resource_id_cache()
+    resource_id = cache.get(subscription_id, resource_type, name)
+    if resource_id:
+        try:
+            return operation([resource_id])
+        except Exception as ex:  # pylint: disable=broad-except
+            if not (_is_resource_not_found(ex, resource_type, name) if child_operation
+                    else _is_not_found(ex)):
+                raise
+            logger.info("Cached resource '%s' was not found, listing %s again", resource_id,
+                        resource_type)
+            cache.remove(subscription_id, resource_type, name)
+    return operation(find_resource_ids(subscription_id, resource_type, name, list_resources))
+
+
+def _is_not_found(ex):
+    status_code = getattr(ex, 'status_code', None) or \
+        getattr(getattr(ex, 'response', None), 'status_code', None)
+    return status_code == 404
+
+
+def _is_resource_not_found(ex, resource_type, name):
+    '''Whether ARM failed the request as the resource or its resource group doesn't exist, e.g.
+    "The Resource 'Microsoft.Devices/IotHubs/myhub' under resource group 'rg' was not found."'''
+    if not _is_not_found(ex):
+        return False
+    try:
+        error = ex.response.json()['error']
+        code, message = error['code'], error['message'].lower()
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return code == 'ResourceGroupNotFound' or \
+        (code == 'ParentResourceNotFound' and "'{}'".format(name).lower() in message) or \
+        (code == 'ResourceNotFound' and "'{}/{}'".format(resource_type, name).lower() in message)
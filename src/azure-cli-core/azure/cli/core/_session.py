@@ -5,7 +5,10 @@
 
 import json
 import os
+import tempfile
 import time
+from contextlib import contextmanager
+from copy import deepcopy
 try:
     import collections.abc as collections
 except ImportError:
@@ -19,31 +22,57 @@ class Session(collections.MutableMapping):
     '''A simple dict-like class that is backed by a JSON file.
 
     All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    be followed by a call to `save_with_retry` or `save`. Modifications made within
+    a `transaction()` are saved once, when the outermost transaction exits.
+
+    The file is always replaced atomically while holding a lock shared with other
+    processes. When another process changed the file since it was loaded, the top level
+    keys modified by this session are merged into the current content of the file instead
+    of overwriting it.
     '''
 
     def __init__(self, encoding=None):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        self._base = {}
+        self._stamp = None
+        self._transaction_depth = 0
+        self._pending_save = False
 
     def load(self, filename, max_age=0):
         self.filename = filename
         self.data = {}
+        self._base = {}
+        self._stamp = None
         try:
             if max_age > 0:
                 st = os.stat(self.filename)
-                if st.st_mtime + max_age < time.clock():
-                    self.save()
-            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
-                self.data = json.load(f)
+                if st.st_mtime + max_age < time.time():
+                    with FileLock(self._lock_filename):
+                        self._write({})
+            self.data, self._stamp = self._read()
+            self._base = deepcopy(self.data)
         except (OSError, IOError):
             self.save()
 
     def save(self):
-        if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+        if not self.filename:
+            return
+        if self._transaction_depth:
+            self._pending_save = True
+            return
+
+        with FileLock(self._lock_filename):
+            data = self.data
+            if self._stamp is None or self._stamp != _get_file_stamp(self.filename):
+                try:
+                    data = self._merge(self._read()[0])
+                except (OSError, IOError):
+                    pass
+            self._write(data)
+            self.data = data
+            self._base = deepcopy(data)
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -55,9 +84,27 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    @contextmanager
+    def transaction(self):
+        '''Defer the saves of the modifications made within the context to a single save,
+        which is skipped when the context raises.'''
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                pending_save, self._pending_save = self._pending_save, False
+        if not self._transaction_depth and pending_save:
+            self.save_with_retry()
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
+    def update(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        with self.transaction():
+            super(Session, self).update(*args, **kwargs)
+
     def __getitem__(self, key):
         return self.data.setdefault(key, {})
 
@@ -75,6 +122,114 @@ class Session(collections.MutableMapping):
     def __len__(self):
         return len(self.data)
 
+    @property
+    def _lock_filename(self):
+        return self.filename + '.lock'
+
+    def _read(self):
+        stamp = _get_file_stamp(self.filename)
+        with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+            return json.load(f), stamp
+
+    def _merge(self, current):
+        '''Apply the top level keys changed since the session was loaded onto `current`.'''
+        merged = dict(current)
+        for key in set(self._base) | set(self.data):
+            if key not in self.data:
+                merged.pop(key, None)
+            elif key not in self._base or self._base[key] != self.data[key]:
+                merged[key] = self.data[key]
+        return merged
+
+    def _write(self, data):
+        directory, name = os.path.split(os.path.abspath(self.filename))
+        fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=name, suffix='.tmp')
+        os.close(fd)
+        try:
+            with codecs_open(temp_filename, 'w', encoding=self._encoding) as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            replace_file(temp_filename, self.filename)
+        except Exception:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        self._stamp = _get_file_stamp(self.filename)
+
+
+class FileLock(object):
+    '''Exclusive lock on a file, shared with other processes.'''
+
+    def __init__(self, filename, timeout=10.0):
+        self.filename = filename
+        self.timeout = timeout
+        self._file = None
+
+    def acquire(self):
+        '''Wait up to `timeout` seconds for the lock, raising OSError when it is still held.'''
+        self._file = open(self.filename, 'a')
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                _lock_file(self._file)
+                return
+            except (OSError, IOError):
+                if time.time() > deadline:
+                    self._file.close()
+                    raise OSError("Timed out waiting for the lock on '{}'".format(self.filename))
+                time.sleep(0.05)
+
+    def release(self):
+        try:
+            _unlock_file(self._file)
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+try:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _get_file_stamp(filename):
+    try:
+        st = os.stat(filename)
+    except (OSError, IOError):
+        return None
+    return st.st_ino, st.st_size, st.st_mtime
+
+
+def replace_file(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:  # Python 2
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
 
 # ACCOUNT contains subscriptions information
 ACCOUNT = Session()
@@ -0,0 +1,176 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import tempfile
+from collections import OrderedDict, defaultdict
+
+import adal
+from adal.constants import TokenResponseFields
+from adal.token_cache import _get_cache_key
+
+from azure.cli.core._session import FileLock, replace_file
+from azure.cli.core.util import get_file_json
+
+_SERVICE_PRINCIPAL_ID = 'servicePrincipalId'
+_SERVICE_PRINCIPAL_TENANT = 'servicePrincipalTenant'
+
+ADD = 'add'
+REMOVE = 'remove'
+
+
+def _lower(value):
+    return value.lower() if value else ''
+
+
+class IndexedTokenCache(adal.TokenCache):
+    '''adal TokenCache which indexes the entries by the (user id, client id) pair adal queries
+    the cache with, instead of scanning all of them, and records the changes made to it since
+    `pending_changes` was last cleared so they can be persisted record by record.
+    '''
+
+    def __init__(self, state=None):
+        self._index = defaultdict(set)
+        self.pending_changes = []
+        super(IndexedTokenCache, self).__init__(state)
+
+    @staticmethod
+    def _index_key(entry):
+        return (_lower(entry.get(TokenResponseFields.USER_ID)),
+                _lower(entry.get(TokenResponseFields._CLIENT_ID)))  # pylint: disable=protected-access
+
+    def _add_entry(self, entry):
+        key = _get_cache_key(entry)
+        self._remove_entry(key)
+        self._cache[key] = entry
+        self._index[self._index_key(entry)].add(key)
+
+    def _remove_entry(self, key):
+        removed = self._cache.pop(key, None)
+        if removed is not None:
+            self._index[self._index_key(removed)].discard(key)
+        return removed
+
+    def add(self, entries):
+        with self._lock:
+            for e in entries:
+                self._add_entry(e)
+                # adal modifies the entries it removes, e.g. before adding them back
+                self.pending_changes.append((ADD, dict(e)))
+            self.has_state_changed = True
+
+    def remove(self, entries):
+        with self._lock:
+            for e in entries:
+                if self._remove_entry(_get_cache_key(e)) is not None:
+                    self.pending_changes.append((REMOVE, dict(e)))
+                    self.has_state_changed = True
+
+    def deserialize(self, state):
+        with self._lock:
+            self._cache.clear()
+            self._index.clear()
+            for e in json.loads(state) if state else []:
+                self._add_entry(e)
+
+    def _query_cache(self, is_mrrt, user_id, client_id):
+        if user_id is None or client_id is None:
+            return super(IndexedTokenCache, self)._query_cache(is_mrrt, user_id, client_id)
+        keys = self._index.get((_lower(user_id), _lower(client_id)), ())
+        return [self._cache[k] for k in keys
+                if is_mrrt is None or is_mrrt == self._cache[k].get(TokenResponseFields.IS_MRRT)]
+
+
+def get_entry_key(entry):
+    '''Identity of a persisted entry: a service principal credential or an adal token.'''
+    if entry.get(_SERVICE_PRINCIPAL_ID):
+        return ('sp', entry[_SERVICE_PRINCIPAL_ID], entry.get(_SERVICE_PRINCIPAL_TENANT))
+    key = _get_cache_key(entry)
+    return ('token', _lower(key.authority), _lower(key.resource), _lower(key.client_id),
+            _lower(key.user_id))
+
+
+class TokenStore(object):
+    '''Persists the cached credentials in a JSON file, in the format shared with azure-xplat-cli,
+    plus a journal of the record level changes made since the file was last compacted.
+
+    Every change is appended to the journal instead of rewriting the whole file. Once the
+    journal holds `compaction_threshold` records, or when asked to, e.g. on logout, it is folded
+    back into the file. Both files are only modified while holding a lock shared by all
+    processes, and the file is replaced atomically.
+    '''
+
+    def __init__(self, filename, compaction_threshold=100):
+        self.filename = filename
+        self.journal_filename = filename + '.journal'
+        self.compaction_threshold = compaction_threshold
+
+    def load(self):
+        '''Return the persisted entries with the journaled changes applied.'''
+        entries = OrderedDict()
+        if os.path.isfile(self.filename):
+            for entry in get_file_json(self.filename, throw_on_empty=False) or []:
+                entries[get_entry_key(entry)] = entry
+        for op, entry in self._read_journal():
+            if op == ADD:
+                entries[get_entry_key(entry)] = entry
+            elif op == REMOVE:
+                entries.pop(get_entry_key(entry), None)
+        return list(entries.values())
+
+    def append(self, changes, compact=False):
+        '''Persist a list of (op, entry) changes.'''
+        if not changes and not compact:
+            return
+        with FileLock(self.filename + '.lock'):
+            records = self._append_journal(changes)
+            if compact or records >= self.compaction_threshold:
+                self._compact()
+
+    def compact(self):
+        with FileLock(self.filename + '.lock'):
+            self._compact()
+
+    def clear(self):
+        with FileLock(self.filename + '.lock'):
+            for filename in (self.filename, self.journal_filename):
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+    def _read_journal(self):
+        if not os.path.isfile(self.journal_filename):
+            return
+        with open(self.journal_filename, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a record torn by a crash while it was being written
+                    continue
+                yield record['op'], record['entry']
+
+    def _append_journal(self, changes):
+        fd = os.open(self.journal_filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'a') as f:
+            for op, entry in changes:
+                f.write(json.dumps({'op': op, 'entry': entry}) + '\n')
+        with open(self.journal_filename, 'r') as f:
+            return sum(1 for _ in f)
+
+    def _compact(self):
+        entries = self.load()
+        directory, name = os.path.split(os.path.abspath(self.filename))
+        fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(json.dumps(entries))
+            replace_file(temp_filename, self.filename)
+        except Exception:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        if os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
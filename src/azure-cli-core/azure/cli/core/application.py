@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 from collections import defaultdict
+import logging
 import sys
 import os
 import uuid
@@ -15,6 +16,7 @@ import azure.cli.core._help as _help
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core.util import todict, truncate_text, CLIError, read_file_content
 from azure.cli.core._config import az_config
+from azure.cli.core.profiling import measure, PROFILE_STARTUP_ARG
 
 import azure.cli.core.telemetry as telemetry
 
@@ -88,9 +90,11 @@ class Application(object):
 
     def execute(self, unexpanded_argv):  # pylint: disable=too-many-statements
         argv = Application._expand_file_prefixed_files(unexpanded_argv)
-        command_table = self.configuration.get_command_table()
+        with measure('phase', 'command table'):
+            command_table = self.configuration.get_command_table()
         self.raise_event(self.COMMAND_TABLE_LOADED, command_table=command_table)
-        self.parser.load_command_table(command_table)
+        with measure('phase', 'parser construction'):
+            self.parser.load_command_table(command_table)
         self.raise_event(self.COMMAND_PARSER_LOADED, parser=self.parser)
 
         if len(argv) == 0:
@@ -119,17 +123,23 @@ class Application(object):
         command = ' '.join(nouns)
 
         if argv[-1] in ('--help', '-h') or command in command_table:
-            self.configuration.load_params(command)
+            with measure('phase', 'load_params'):
+                self.configuration.load_params(command)
             self.raise_event(self.COMMAND_TABLE_PARAMS_LOADED, command_table=command_table)
-            self.parser.load_command_table(command_table)
+            with measure('phase', 'parser construction with params'):
+                self.parser.load_command_table(command_table)
 
         if self.session['completer_active']:
             enable_autocomplete(self.parser)
 
-        args = self.parser.parse_args(argv)
+        with measure('phase', 'parse'):
+            args = self.parser.parse_args(argv)
 
-        self.raise_event(self.COMMAND_PARSER_PARSED, command=args.command, args=args)
+        self.raise_event(self.COMMAND_PARSER_PARSED, command=args.command, args=args,
+                         command_table=command_table)
         results = []
+        batch_handler = getattr(command_table[args.command], 'batch_handler', None)
+        batch_params = []
         for expanded_arg in _explode_list_args(args):
             self.session['command'] = expanded_arg.command
             try:
@@ -154,10 +164,25 @@ class Application(object):
                                           self.configuration.output_format,
                                           [p for p in unexpanded_argv if p.startswith('-')])
 
+            if batch_handler:
+                batch_params.append((expanded_arg.func, params))
+                continue
+
             result = expanded_arg.func(params)
             result = todict(result)
             results.append(result)
 
+        if len(batch_params) > 1:
+            # the handler returns the results of the resources, if any
+            batch_result = batch_handler([params for _, params in batch_params])
+            if isinstance(batch_result, list):
+                results.extend(todict(batch_result))
+            elif batch_result is not None:
+                results.append(todict(batch_result))
+        elif batch_params:
+            func, params = batch_params[0]
+            results.append(todict(func(params)))
+
         if len(results) == 1:
             results = results[0]
 
@@ -172,8 +197,10 @@ class Application(object):
     def raise_event(self, name, **kwargs):
         '''Raise the event `name`.
         '''
-        data = truncate_text(str(kwargs), width=500)
-        logger.debug("Application event '%s' with event data %s", name, data)
+        # formatting the event data stringifies the whole result of the command
+        if azlogging.is_logged(logger, logging.DEBUG):
+            logger.debug("Application event '%s' with event data %s", name,
+                         truncate_text(str(kwargs), width=500))
         for func in list(self._event_handlers[name]):  # Make copy in case handler modifies the list
             func(**kwargs)
 
@@ -214,6 +241,11 @@ class Application(object):
                                   help='Increase logging verbosity. Use --debug for full debug logs.')  # pylint: disable=line-too-long
         global_group.add_argument('--debug', dest='_log_verbosity_debug', action='store_true',
                                   help='Increase logging verbosity to show all debug logs.')
+        # Like the verbosity, profiling is enabled before the arguments are parsed.
+        global_group.add_argument(PROFILE_STARTUP_ARG, dest='_profile_startup',
+                                  action='store_true',
+                                  help='Report the time and memory spent loading the CLI and '
+                                       'its command modules.')
 
     @staticmethod
     def _maybe_load_file(arg):
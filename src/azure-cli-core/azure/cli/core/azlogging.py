@@ -160,5 +160,20 @@ def configure_logging(argv):
         get_az_logger(__name__).debug("File logging enabled - Writing logs to '%s'.", LOG_DIR)
 
 
+def is_logged(logger, level):
+    '''Whether a record of `level` logged by `logger` reaches one of the handlers, e.g. to skip
+    building costly debug messages. The loggers are set to DEBUG by configure_logging, and the
+    handlers filter the records by the verbosity, so logger.isEnabledFor() is always true.'''
+    if not logger.isEnabledFor(level):
+        return False
+    while logger:
+        if any(level >= handler.level for handler in logger.handlers):
+            return True
+        if not logger.propagate:
+            return False
+        logger = logger.parent
+    return False
+
+
 def get_az_logger(module_name=None):
     return logging.getLogger('az.' + module_name if module_name else 'az')
@@ -21,9 +21,12 @@ from azure.cli.core.util import CLIError
 from azure.cli.core.application import APPLICATION
 from azure.cli.core.prompting import prompt_y_n, NoTTYException
 from azure.cli.core._config import az_config, DEFAULTS_SECTION
+from azure.cli.core.profiling import measure
+from azure.cli.core.extensions.timing import COMMAND_TIMING
 
 from ._introspection import (extract_args_from_signature,
                              extract_full_summary_from_signature)
+from ._signature_cache import get_signature_cache
 
 logger = azlogging.get_az_logger(__name__)
 
@@ -54,7 +57,8 @@ class CliArgumentType(object):
 
 
 class CliCommandArgument(object):
-    _NAMED_ARGUMENTS = ('options_list', 'validator', 'completer', 'id_part', 'arg_group')
+    _NAMED_ARGUMENTS = ('options_list', 'validator', 'completer', 'id_part', 'id_part_optional',
+                        'arg_group')
 
     def __init__(self, dest=None, argtype=None, **kwargs):
         self.type = CliArgumentType(overrides=argtype, **kwargs)
@@ -97,13 +101,28 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         self.finish_msg = finish_msg
         self.poller_done_interval_ms = poller_done_interval_ms
 
-    def _delay(self):
-        time.sleep(self.poller_done_interval_ms / 1000.0)
+    def _delay(self, poller):
+        """ Wait for the operation, which the poller polls on its own thread honoring Retry-After,
+        up to the interval at which the correlation id is refreshed and Ctrl+C is handled. A poller
+        which cannot be waited on is polled at that interval. """
+        from msrest.exceptions import ClientException
+        interval = self.poller_done_interval_ms / 1000.0
+        try:
+            wait = poller.wait
+        except AttributeError:
+            time.sleep(interval)
+            return
+        try:
+            wait(timeout=interval)
+        except ClientException:
+            # the error of the operation is raised by poller.result()
+            pass
 
     def __call__(self, poller):
         from msrest.exceptions import ClientException
         logger.info("Starting long running operation '%s'", self.start_msg)
         correlation_message = ''
+        start = timeit.default_timer()
         while not poller.done():
             try:
                 # pylint: disable=protected-access
@@ -115,10 +134,14 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
                 pass
 
             try:
-                self._delay()
+                waited = timeit.default_timer()
+                self._delay(poller)
+                COMMAND_TIMING.add_poll_sleep(timeit.default_timer() - waited)
             except KeyboardInterrupt:
                 logger.error('Long running operation wait cancelled.  %s', correlation_message)
                 raise
+        logger.info("'%s' completed in %.2f seconds", self.start_msg or 'long running operation',
+                    timeit.default_timer() - start)
         try:
             result = poller.result()
         except ClientException as client_exception:
@@ -194,6 +217,11 @@ class CliCommand(object):  # pylint:disable=too-many-instance-attributes
         self.arguments_loader = arguments_loader
         self.table_transformer = table_transformer
         self.formatter_class = formatter_class
+        # optional handler invoked once with the arguments of every resource when several
+        # resources are given through --ids, instead of invoking the handler for each of them
+        self.batch_handler = None
+        # optional QueryPushdown of the predicates of --query the command can evaluate on the server
+        self.query_pushdown = None
 
     @staticmethod
     def _should_load_description():
@@ -238,17 +266,20 @@ command_module_map = {}
 
 
 def load_params(command):
-    try:
-        command_table[command].load_arguments()
-    except KeyError:
-        return
-    command_module = command_module_map.get(command, None)
-    if not command_module:
-        logger.debug("Unable to load commands for '%s'. No module in command module map found.",
-                     command)  # pylint: disable=line-too-long
-        return
-    module_to_load = command_module[:command_module.rfind('.')]
-    import_module(module_to_load).load_params(command)
+    # the values extracted from signatures are saved once, when the arguments are loaded
+    with get_signature_cache().transaction():
+        try:
+            command_table[command].load_arguments()
+        except KeyError:
+            return
+        command_module = command_module_map.get(command, None)
+        if not command_module:
+            logger.debug("Unable to load commands for '%s'. No module in command module map found.",
+                         command)  # pylint: disable=line-too-long
+            return
+        module_to_load = command_module[:command_module.rfind('.')]
+        with measure('module', module_to_load.split('.')[-1] + ' load_params'):
+            import_module(module_to_load).load_params(command)
     _update_command_definitions(command_table)
 
 
@@ -260,7 +291,7 @@ def get_command_table(module_name=None):
     loaded = False
     if module_name and module_name not in BLACKLISTED_MODS:
         try:
-            import_module('azure.cli.command_modules.' + module_name).load_commands()
+            _load_module_commands(module_name)
             logger.debug("Successfully loaded command table from module '%s'.", module_name)
             loaded = True
         except ImportError:
@@ -281,7 +312,7 @@ def get_command_table(module_name=None):
         for mod in installed_command_modules:
             try:
                 start_time = timeit.default_timer()
-                import_module('azure.cli.command_modules.' + mod).load_commands()
+                _load_module_commands(mod)
                 elapsed_time = timeit.default_timer() - start_time
                 logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
                 cumulative_elapsed_time += elapsed_time
@@ -300,6 +331,13 @@ def get_command_table(module_name=None):
     return ordered_commands
 
 
+def _load_module_commands(module_name):
+    with measure('module', module_name + ' import'):
+        module = import_module('azure.cli.command_modules.' + module_name)
+    with measure('module', module_name + ' load_commands'):
+        module.load_commands()
+
+
 def register_cli_argument(scope, dest, arg_type=None, **kwargs):
     '''Specify CLI specific metadata for a given argument for a given scope.
     '''
@@ -316,12 +354,14 @@ def register_extra_cli_argument(command, dest, **kwargs):
 def cli_command(module_name, name, operation,
                 client_factory=None, transform=None, table_transformer=None,
                 no_wait_param=None, confirmation=None, exception_handler=None,
-                formatter_class=None):
+                formatter_class=None, batch_operation=None, query_pushdown=None):
     """ Registers a default Azure CLI command. These commands require no special parameters. """
     command_table[name] = create_command(module_name, name, operation, transform, table_transformer,
                                          client_factory, no_wait_param, confirmation=confirmation,
                                          exception_handler=exception_handler,
-                                         formatter_class=formatter_class)
+                                         formatter_class=formatter_class,
+                                         batch_operation=batch_operation,
+                                         query_pushdown=query_pushdown)
 
 
 def get_op_handler(operation):
@@ -339,7 +379,7 @@ def get_op_handler(operation):
 def create_command(module_name, name, operation,
                    transform_result, table_transformer, client_factory,
                    no_wait_param=None, confirmation=None, exception_handler=None,
-                   formatter_class=None):
+                   formatter_class=None, batch_operation=None, query_pushdown=None):
     if not isinstance(operation, string_types):
         raise ValueError("Operation must be a string. Got '{}'".format(operation))
 
@@ -412,6 +452,10 @@ def create_command(module_name, name, operation,
     cmd = CliCommand(name, _execute_command, table_transformer=table_transformer,
                      arguments_loader=arguments_loader, description_loader=description_loader,
                      formatter_class=formatter_class)
+    if batch_operation:
+        # the batch operation takes the list of the keyword arguments of every resource
+        cmd.batch_handler = lambda args_list: get_op_handler(batch_operation)(args_list)
+    cmd.query_pushdown = query_pushdown
     if confirmation:
         cmd.add_argument(CONFIRM_PARAM_NAME, '--yes', '-y',
                          action='store_true',
@@ -461,25 +505,56 @@ def _get_cli_extra_arguments(command):
     return _cli_extra_argument_registry[command].items()
 
 
+class _ScopeNode(object):  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.children = {}
+        self.arguments = {}
+
+
 class _ArgumentRegistry(object):
+    '''The argument overrides registered by scope, in a trie of the words of the scopes.'''
+
     def __init__(self):
-        self.arguments = defaultdict(lambda: {})
+        self._root = _ScopeNode()
 
     def register_cli_argument(self, scope, dest, argtype, **kwargs):
         argument = CliArgumentType(overrides=argtype,
                                    **kwargs)
-        self.arguments[scope][dest] = argument
+        node = self._root
+        for word in scope.split():
+            node = node.children.setdefault(word, _ScopeNode())
+        node.arguments[dest] = argument
+
+    def _get_scopes(self, command):
+        '''Yield the nodes of the scopes of `command`, from the widest to the command itself.'''
+        node = self._root
+        yield node
+        for word in command.split():
+            node = node.children.get(word)
+            if node is None:
+                return
+            yield node
 
     def get_cli_argument(self, command, name):
-        parts = command.split()
         result = CliArgumentType()
-        for index in range(0, len(parts) + 1):
-            probe = ' '.join(parts[0:index])
-            override = self.arguments.get(probe, {}).get(name, None)
+        for node in self._get_scopes(command):
+            override = node.arguments.get(name, None)
             if override:
                 result.update(override)
         return result
 
+    def get_cli_arguments(self, command, names):
+        '''Returns the overrides of the arguments `names` of `command`, by argument name.'''
+        results = dict((name, CliArgumentType()) for name in names)
+        for node in self._get_scopes(command):
+            if not node.arguments:
+                continue
+            for name, result in results.items():
+                override = node.arguments.get(name, None)
+                if override:
+                    result.update(override)
+        return results
+
 
 _cli_argument_registry = _ArgumentRegistry()
 _cli_extra_argument_registry = defaultdict(lambda: {})
@@ -487,11 +562,14 @@ _cli_extra_argument_registry = defaultdict(lambda: {})
 
 def _update_command_definitions(command_table_to_update):
     for command_name, command in command_table_to_update.items():
+        extra_arguments = list(_get_cli_extra_arguments(command_name))
+        # the overrides of all the arguments of the command are resolved in one walk of the scopes
+        overrides = _cli_argument_registry.get_cli_arguments(
+            command_name, list(command.arguments) + [name for name, _ in extra_arguments])
         for argument_name in command.arguments:
-            overrides = _get_cli_argument(command_name, argument_name)
-            command.update_argument(argument_name, overrides)
+            command.update_argument(argument_name, overrides[argument_name])
 
         # Add any arguments explicitly registered for this command
-        for argument_name, argument_definition in _get_cli_extra_arguments(command_name):
+        for argument_name, argument_definition in extra_arguments:
             command.arguments[argument_name] = argument_definition
-            command.update_argument(argument_name, _get_cli_argument(command_name, argument_name))
+            command.update_argument(argument_name, CliArgumentType(overrides[argument_name]))
@@ -6,9 +6,16 @@
 import inspect
 import re
 
+from ._signature_cache import get_signature_cache
+
 
 def extract_full_summary_from_signature(operation):
     """ Extract the summary from the doccomments of the command. """
+    return get_signature_cache().get(operation, 'summary',
+                                     lambda: _extract_full_summary(operation))
+
+
+def _extract_full_summary(operation):
     lines = inspect.getdoc(operation)
     regex = r'\s*(:param)\s+(.+?)\s*:(.*)'
     summary = ''
@@ -64,6 +71,14 @@ def extract_args_from_signature(operation, no_wait_param=None):
         no_wait_param: SDK parameter which disables LRO polling. For now it is 'raw'
     """
     from azure.cli.core.commands import CliCommandArgument
+    args = get_signature_cache().get(
+        operation, 'args:{}'.format(no_wait_param or ''),
+        lambda: list(_extract_args(operation, no_wait_param)))
+    for arg_name, settings in args:
+        yield (arg_name, CliCommandArgument(arg_name, **settings))
+
+
+def _extract_args(operation, no_wait_param):
     args = []
     try:
         # only supported in python3 - falling back to argspec if not available
@@ -112,12 +127,11 @@ def extract_args_from_signature(operation, no_wait_param=None):
             options_list = ['--' + arg_name.replace('_', '-')]
             help_str = arg_docstring_help.get(arg_name)
 
-        yield (arg_name, CliCommandArgument(arg_name,
-                                            options_list=options_list,
-                                            required=required,
-                                            default=default,
-                                            help=help_str,
-                                            action=action))
+        yield [arg_name, {'options_list': options_list,
+                          'required': required,
+                          'default': default,
+                          'help': help_str,
+                          'action': action}]
     if no_wait_param and not found_no_wait_param:
         raise ValueError("Command authoring error: unable to enable no-wait option. Operation '{}' "
                          "does not have a '{}' parameter.".format(operation, no_wait_param))
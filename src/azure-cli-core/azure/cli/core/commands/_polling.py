@@ -0,0 +1,108 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import random
+import time
+import timeit
+
+import azure.cli.core.azlogging as azlogging
+from azure.cli.core.extensions.timing import COMMAND_TIMING
+
+logger = azlogging.get_az_logger(__name__)
+
+
+class PollingBackoff(object):  # pylint: disable=too-few-public-methods
+    """ Computes the delay before the next poll of an operation.
+
+    A delay requested by the service through Retry-After is honored as is. Otherwise the delay
+    starts at `initial` seconds and is multiplied by `factor` after every poll, up to `maximum`
+    seconds. Up to `jitter` (a fraction of the delay) is randomly taken off every delay so
+    concurrent pollers don't poll in lockstep.
+    """
+
+    def __init__(self, initial=1.0, maximum=30.0, factor=2.0, jitter=0.1, rand=None):
+        if initial <= 0 or maximum < initial:
+            raise ValueError('invalid polling delays: initial {}, maximum {}'.format(
+                initial, maximum))
+        self.initial = float(initial)
+        self.maximum = float(maximum)
+        self.factor = float(factor)
+        self.jitter = float(jitter)
+        self._rand = rand or random.random
+        self._current = self.initial
+
+    @classmethod
+    def fixed(cls, interval):
+        """ A backoff which always waits `interval` seconds. """
+        return cls(initial=interval, maximum=interval, factor=1.0, jitter=0.0)
+
+    def next_delay(self, retry_after=None):
+        if retry_after is not None:
+            return max(float(retry_after), 0.0)
+
+        delay = self._current
+        self._current = min(self._current * self.factor, self.maximum)
+        if self.jitter:
+            delay -= delay * self.jitter * self._rand()
+        return delay
+
+
+def get_retry_after(response):
+    """ Return the delay in seconds requested through the Retry-After header of an HTTP response,
+    or None when the response doesn't carry a usable one. """
+    headers = getattr(response, 'headers', None)
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_tz, mktime_tz
+    parsed = parsedate_tz(value)
+    if not parsed:
+        return None
+    return max(mktime_tz(parsed) - time.time(), 0.0)
+
+
+def poll_until(condition, backoff=None, timeout=None, retry_after=None, description='operation',
+               clock=None, sleep=None):
+    """ Evaluate `condition` until it returns a truthy value and return that value.
+
+    :param condition: callable evaluated once per poll
+    :param backoff: the PollingBackoff computing the delay between polls
+    :param timeout: seconds after which polling gives up and None is returned
+    :param retry_after: optional callable returning the delay last requested by the service
+    :param description: name of the operation used in the log messages
+    :param clock: callable returning the current time in seconds
+    :param sleep: callable used to wait between the polls
+    """
+    backoff = backoff or PollingBackoff()
+    clock = clock or timeit.default_timer
+    sleep = sleep or time.sleep
+    start = clock()
+    polls = 0
+    while True:
+        polls += 1
+        result = condition()
+        elapsed = clock() - start
+        if result:
+            logger.info("'%s' completed in %.2f seconds after %d poll(s)", description, elapsed,
+                        polls)
+            return result
+
+        delay = backoff.next_delay(retry_after() if retry_after else None)
+        if timeout is not None:
+            if elapsed >= timeout:
+                logger.info("'%s' timed out after %.2f seconds and %d poll(s)", description,
+                            elapsed, polls)
+                return None
+            delay = min(delay, timeout - elapsed)
+
+        logger.debug("'%s' not completed after %.2f seconds, polling again in %.2f seconds",
+                     description, elapsed, delay)
+        slept = timeit.default_timer()
+        sleep(delay)
+        COMMAND_TIMING.add_poll_sleep(timeit.default_timer() - slept)
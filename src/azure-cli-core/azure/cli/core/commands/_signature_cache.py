@@ -0,0 +1,157 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import atexit
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+from six import string_types
+
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+SIGNATURE_CACHE_DIR_NAME = 'signatureCache'
+
+_VERSION_KEY = 'version'
+
+
+def _get_module_version(module_name):
+    '''The version of the package of a module and the modification time and size of its file, or
+    None when the module has no file.'''
+    module = sys.modules.get(module_name)
+    filename = getattr(module, '__file__', None)
+    if not filename:
+        return None
+    version = ''
+    parts = module_name.split('.')
+    for index in range(len(parts), 0, -1):
+        package = sys.modules.get('.'.join(parts[:index]))
+        package_version = getattr(package, '__version__', None) or getattr(package, 'VERSION', None)
+        if isinstance(package_version, string_types):
+            version = package_version
+            break
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return '{} {} {}'.format(version, st.st_mtime, st.st_size)
+
+
+def _get_qualified_name(operation):
+    '''The name of a function, or method, defined at the top level of its module, or None. On
+    Python 2, which has no __qualname__, the function or the class of the method is looked up in
+    its module.'''
+    name = getattr(operation, '__qualname__', None)
+    if name is not None:
+        return None if '<' in name else name
+    module = sys.modules.get(getattr(operation, '__module__', None))
+    name = getattr(operation, '__name__', None)
+    owner = getattr(operation, 'im_class', None)
+    if owner is not None:
+        if getattr(module, owner.__name__, None) is not owner:
+            return None
+        return '{}.{}'.format(owner.__name__, name)
+    return name if name and getattr(module, name, None) is operation else None
+
+
+class SignatureCache(object):
+    '''Values extracted from the signatures and docstrings of operations, persisted in a JSON file
+    per module of the operations. The values of a module are discarded when its version changes.
+    The values extracted are saved when the outermost transaction exits, or at the exit of the
+    process when they are extracted outside of a transaction.
+    '''
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._sessions = {}
+        self._transaction_depth = 0
+        self._pending = set()
+        self._flush_at_exit = False
+
+    def get(self, operation, key, extract):
+        '''Returns the value of `key` for `operation`, calling `extract` to get it when it is not
+        cached. Values are only cached for functions (and methods) defined at the top level of
+        modules, when they are read back equal from JSON.'''
+        module_name = getattr(operation, '__module__', None)
+        name = _get_qualified_name(operation)
+        if not module_name or not name:
+            return extract()
+        session = self._get_session(module_name)
+        if session is None:
+            return extract()
+        cache_key = '{}:{}'.format(name, key)
+        if cache_key in session.data:
+            return session.data[cache_key]
+        value = extract()
+        try:
+            # e.g. tuples would be read back as lists
+            if json.loads(json.dumps(value)) != value:
+                return value
+        except (TypeError, ValueError):
+            return value
+        session.data[cache_key] = value
+        self._save(module_name)
+        return value
+
+    @contextmanager
+    def transaction(self):
+        '''Defer saving the values extracted within the context until it exits.'''
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+        if not self._transaction_depth:
+            self.flush()
+
+    def flush(self):
+        '''Save the values extracted since they were last saved.'''
+        for module_name in self._pending:
+            try:
+                self._sessions[module_name].save()
+            except (OSError, IOError) as ex:
+                logger.debug("Unable to save the signature cache of '%s': %s", module_name, ex)
+        self._pending.clear()
+
+    def _get_session(self, module_name):
+        from azure.cli.core._session import Session
+        if module_name not in self._sessions:
+            version = _get_module_version(module_name)
+            session = None
+            if version:
+                session = Session()
+                try:
+                    if not os.path.isdir(self.folder):
+                        os.makedirs(self.folder)
+                    session.load(os.path.join(self.folder, module_name + '.json'))
+                except (OSError, IOError, ValueError) as ex:
+                    logger.debug("Signature cache of '%s' unavailable: %s", module_name, ex)
+                    session.filename = None
+                    session.data = {}
+                if session.data.get(_VERSION_KEY) != version:
+                    session.data = {_VERSION_KEY: version}
+            self._sessions[module_name] = session
+        return self._sessions[module_name]
+
+    def _save(self, module_name):
+        # saving every value would rewrite the file of the module for each of them
+        self._pending.add(module_name)
+        if not self._transaction_depth and not self._flush_at_exit:
+            self._flush_at_exit = True
+            atexit.register(self.flush)
+
+
+_signature_cache = None
+
+
+def get_signature_cache():
+    global _signature_cache  # pylint: disable=global-statement
+    if _signature_cache is None:
+        from azure.cli.core._environment import get_config_dir
+        _signature_cache = SignatureCache(os.path.join(get_config_dir(), SIGNATURE_CACHE_DIR_NAME))
+    return _signature_cache
@@ -5,6 +5,7 @@
 
 import argparse
 import re
+from collections import OrderedDict
 from six import string_types
 
 from azure.cli.core.commands import (CliCommand,
@@ -19,6 +20,8 @@ from azure.cli.core.util import CLIError, todict, shell_safe_json_parse
 
 logger = azlogging.get_az_logger(__name__)
 
+MAX_CONCURRENT_WAITS = 20
+
 regex = re.compile(
     '/subscriptions/(?P<subscription>[^/]*)(/resource[gG]roups/(?P<resource_group>[^/]*))?'
     '/providers/(?P<namespace>[^/]*)/(?P<type>[^/]*)/(?P<name>[^/]*)'
@@ -92,6 +95,16 @@ class ResourceId(str):
         return str.__new__(cls, val)
 
 
+class ResourceIdList(list):
+    '''One or more whitespace separated resource IDs, e.g. the content of a file or stdin
+    read through @<file> or @-'''
+
+    def __init__(self, val):
+        super(ResourceIdList, self).__init__(ResourceId(rid) for rid in val.split())
+        if not self:
+            raise ValueError()
+
+
 def resource_exists(resource_group, name, namespace, type, **_):  # pylint: disable=redefined-builtin
     '''Checks if the given resource exists.
     '''
@@ -117,28 +130,40 @@ def add_id_parameters(command_table):
                 (dest) fields will also be of type `IterateValue`
                 '''
                 try:
-                    for value in [values] if isinstance(values, str) else values:
+                    for value in _flatten_ids([values] if isinstance(values, str) else values):
                         parts = parse_resource_id(value)
                         for arg in [arg for arg in arguments.values() if arg.id_part]:
+                            # optional parts, e.g. the slot in the id of a web app, may be
+                            # missing from the ids
+                            id_part_value = parts.get(arg.id_part) if arg.id_part_optional \
+                                else parts[arg.id_part]
                             existing_values = getattr(namespace, arg.name, None)
                             if existing_values is None:
                                 existing_values = IterateValue()
-                                existing_values.append(parts[arg.id_part])
+                                existing_values.append(id_part_value)
                             else:
                                 if isinstance(existing_values, str):
                                     if not getattr(arg.type, 'configured_default_applied', None):
                                         logger.warning(
                                             "Property '%s=%s' being overriden by value '%s' from IDs parameter.",  # pylint: disable=line-too-long
-                                            arg.name, existing_values, parts[arg.id_part]
+                                            arg.name, existing_values, id_part_value
                                         )
                                     existing_values = IterateValue()
-                                existing_values.append(parts[arg.id_part])
+                                existing_values.append(id_part_value)
                             setattr(namespace, arg.name, existing_values)
                 except Exception as ex:
                     raise ValueError(ex)
 
         return SplitAction
 
+    def _flatten_ids(values):
+        for value in values:
+            if isinstance(value, list):
+                for rid in value:
+                    yield rid
+            else:
+                yield value
+
     def command_loaded_handler(command):
         if 'name' not in [arg.id_part for arg in command.arguments.values() if arg.id_part]:
             # Only commands with a resource name are candidates for an id parameter
@@ -174,11 +199,12 @@ def add_id_parameters(command_table):
                              '--ids',
                              metavar='RESOURCE_ID',
                              dest=argparse.SUPPRESS,
-                             help="One or more resource IDs (space delimited). If provided, "
+                             help="One or more resource IDs (space delimited), or @<file> or "
+                                  "@- to read them from a file or stdin. If provided, "
                                   "no other 'Resource Id' arguments should be specified.",
                              action=split_action(command.arguments),
                              nargs='+',
-                             type=ResourceId,
+                             type=ResourceIdList,
                              validator=required_values_validator,
                              arg_group=group_name)
 
@@ -373,64 +399,114 @@ def cli_generic_wait_command(module_name, name, getter_op, factory=None):
                 provisioning_state = getattr(properties, 'provisioning_state', None)
         return provisioning_state
 
-    def handler(args):
-        from msrest.exceptions import ClientException
-        import time
+    def get_client():
         try:
-            client = factory() if factory else None
+            return factory() if factory else None
         except TypeError:
-            client = factory(None) if factory else None
+            return factory(None) if factory else None
 
-        getterargs = {key: val for key, val in args.items()
-                      if key in get_arguments_loader()}
-
-        getter = get_op_handler(getter_op)
-
-        timeout = args.pop('timeout')
-        interval = args.pop('interval')
-        wait_for_created = args.pop('created')
-        wait_for_deleted = args.pop('deleted')
-        wait_for_updated = args.pop('updated')
-        wait_for_exists = args.pop('exists')
-        custom_condition = args.pop('custom')
-        if not any([wait_for_created, wait_for_updated, wait_for_deleted,
-                    wait_for_exists, custom_condition]):
+    def pop_wait_conditions(args):
+        conditions = {key: args.pop(key) for key in
+                      ('timeout', 'interval', 'created', 'deleted', 'updated', 'exists', 'custom')}
+        if not any(conditions[key] for key in
+                   ('created', 'updated', 'deleted', 'exists', 'custom')):
             raise CLIError(
                 "incorrect usage: --created | --updated | --deleted | --exists | --custom JMESPATH")  # pylint: disable=line-too-long
+        return conditions
 
-        for _ in range(0, timeout, interval):
-            try:
-                instance = getter(client, **getterargs) if client else getter(**getterargs)
-                if wait_for_exists:
-                    return
-                provisioning_state = get_provisioning_state(instance)
-                # until we have any needs to wait for 'Failed', let us bail out on this
-                if provisioning_state == 'Failed':
-                    raise CLIError('The operation failed')
-                if wait_for_created or wait_for_updated:
-                    if provisioning_state == 'Succeeded':
-                        return
-                if custom_condition and bool(verify_property(instance, custom_condition)):
-                    return
-            except ClientException as ex:
-                if getattr(ex, 'status_code', None) == 404:
-                    if wait_for_deleted:
-                        return
-                    if not any([wait_for_created, wait_for_exists, custom_condition]):
-                        raise
-                else:
-                    raise
+    def get_backoff(conditions):
+        from azure.cli.core.commands._polling import PollingBackoff
+        interval = conditions['interval']
+        return PollingBackoff.fixed(interval) if interval else PollingBackoff()
 
-            time.sleep(interval)
+    def condition_met(client, getterargs, conditions):
+        from msrest.exceptions import ClientException
+        getter = get_op_handler(getter_op)
+        try:
+            instance = getter(client, **getterargs) if client else getter(**getterargs)
+            if conditions['exists']:
+                return True
+            provisioning_state = get_provisioning_state(instance)
+            # until we have any needs to wait for 'Failed', let us bail out on this
+            if provisioning_state == 'Failed':
+                raise CLIError('The operation failed')
+            if conditions['created'] or conditions['updated']:
+                if provisioning_state == 'Succeeded':
+                    return True
+            if conditions['custom'] and bool(verify_property(instance, conditions['custom'])):
+                return True
+        except ClientException as ex:
+            if getattr(ex, 'status_code', None) == 404:
+                if conditions['deleted']:
+                    return True
+                if not any([conditions['created'], conditions['exists'], conditions['custom']]):
+                    raise
+            else:
+                raise
+        return False
 
-        return CLIError('Wait operation timed-out after {} seconds'.format(timeout))
+    def handler(args):
+        from azure.cli.core.commands._polling import poll_until
+        client = get_client()
+        getterargs = {key: val for key, val in args.items()
+                      if key in get_arguments_loader()}
+        conditions = pop_wait_conditions(args)
+
+        if not poll_until(lambda: condition_met(client, getterargs, conditions),
+                          get_backoff(conditions), timeout=conditions['timeout'],
+                          description=name):
+            return CLIError('Wait operation timed-out after {} seconds'.format(conditions['timeout']))  # pylint: disable=line-too-long
+
+    def batch_handler(args_list):
+        """ Wait on several resources at once. In every polling round the conditions of all the
+        resources not yet settled are evaluated concurrently. """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from azure.cli.core.commands._polling import poll_until
+        client = get_client()
+        getter_arg_names = get_arguments_loader()
+        pending = OrderedDict()
+        for args in args_list:
+            getterargs = {key: val for key, val in args.items() if key in getter_arg_names}
+            label = ', '.join('{}={}'.format(key, getterargs[key]) for key in sorted(getterargs)
+                              if getterargs[key] is not None)
+            pending[label] = getterargs
+            conditions = pop_wait_conditions(args)
+        failures = OrderedDict()
+
+        def _poll_round(executor):
+            tasks = {executor.submit(condition_met, client, getterargs, conditions): label
+                     for label, getterargs in pending.items()}
+            for task in as_completed(tasks):
+                label = tasks[task]
+                try:
+                    if not task.result():
+                        continue
+                    logger.warning("Wait condition met for '%s'", label)
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.warning("Wait failed for '%s': %s", label, ex)
+                    failures[label] = str(ex)
+                del pending[label]
+            return not pending
+
+        with ThreadPoolExecutor(max_workers=min(len(pending), MAX_CONCURRENT_WAITS)) as executor:
+            poll_until(lambda: _poll_round(executor), get_backoff(conditions),
+                       timeout=conditions['timeout'], description=name)
+
+        if failures or pending:
+            errors = ["'{}': {}".format(label, error) for label, error in failures.items()]
+            errors.extend("'{}': timed-out after {} seconds".format(label, conditions['timeout'])
+                          for label in pending)
+            raise CLIError('Wait operation did not succeed for {} of {} resources:\n{}'.format(
+                len(errors), len(args_list), '\n'.join(errors)))
 
     cmd = CliCommand(name, handler, arguments_loader=arguments_loader)
+    cmd.batch_handler = batch_handler
     group_name = 'Wait Condition'
     cmd.add_argument('timeout', '--timeout', default=3600, arg_group=group_name, type=int,
                      help='maximum wait in seconds')
-    cmd.add_argument('interval', '--interval', default=30, arg_group=group_name, type=int,
-                     help='polling interval in seconds')
+    cmd.add_argument('interval', '--interval', arg_group=group_name, type=int,
+                     help='polling interval in seconds. If omitted, polls start frequent and back '
+                          'off up to 30 seconds')
     cmd.add_argument('deleted', '--deleted', action='store_true', arg_group=group_name,
                      help='wait till deleted')
     cmd.add_argument('created', '--created', action='store_true', arg_group=group_name,
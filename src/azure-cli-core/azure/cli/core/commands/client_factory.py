@@ -7,9 +7,11 @@ import os
 from azure.cli.core import __version__ as core_version
 from azure.cli.core._profile import Profile, CLOUD
 import azure.cli.core._debug as _debug
+from azure.cli.core._http_cache import get_http_cache, is_http_cache_enabled
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core.util import CLIError
 from azure.cli.core.application import APPLICATION
+from azure.cli.core.extensions.timing import COMMAND_TIMING
 
 logger = azlogging.get_az_logger(__name__)
 
@@ -48,6 +50,9 @@ def configure_common_settings(client):
     client.config.generate_client_request_id = \
         'x-ms-client-request-id' not in APPLICATION.session['headers']
 
+    if COMMAND_TIMING.enabled and getattr(client.config, 'hooks', None) is not None:
+        client.config.hooks.append(COMMAND_TIMING.add_request)
+
 
 def _get_mgmt_service_client(client_type, subscription_bound=True, subscription_id=None,
                              api_version=None, base_url_bound=True, **kwargs):
@@ -69,6 +74,10 @@ def _get_mgmt_service_client(client_type, subscription_bound=True, subscription_
 
     configure_common_settings(client)
 
+    if base_url_bound and is_http_cache_enabled():
+        user = profile.get_subscription(subscription_id)['user']
+        get_http_cache().mount(client.config, '{} {}'.format(user['type'], user['name']))
+
     return (client, subscription_id)
 
 
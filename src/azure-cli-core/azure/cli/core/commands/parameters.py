@@ -10,6 +10,7 @@ import platform
 from azure.cli.core.commands import CliArgumentType, register_cli_argument
 from azure.cli.core.commands.validators import validate_tag, validate_tags
 from azure.cli.core.util import CLIError
+from azure.cli.core._completion_cache import cached_completer
 from azure.cli.core.commands.validators import generate_deployment_name
 
 
@@ -20,6 +21,7 @@ def get_subscription_locations():
     return list(subscription_client.subscriptions.list_locations(subscription_id))
 
 
+@cached_completer()
 def get_location_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
     result = get_subscription_locations()
     return [l.name for l in result]
@@ -53,6 +55,7 @@ def get_resource_groups():
     return list(rcf.resource_groups.list())
 
 
+@cached_completer()
 def get_resource_group_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
     result = get_resource_groups()
     return [l.name for l in result]
@@ -75,6 +78,8 @@ def get_resources_in_subscription(resource_type=None):
 
 
 def get_resource_name_completion_list(resource_type=None):
+    @cached_completer('{}.get_resource_name_completion_list {}'.format(__name__, resource_type),
+                      args=['resource_group_name'])
     def completer(prefix, action, parsed_args, **kwargs):  # pylint: disable=unused-argument
         if getattr(parsed_args, 'resource_group_name', None):
             rg = parsed_args.resource_group_name
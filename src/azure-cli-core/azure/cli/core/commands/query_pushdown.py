@@ -0,0 +1,191 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+EQ = 'eq'
+STARTS_WITH = 'startswith'
+
+# the nodes of a JMESPath expression projecting or filtering the items of the listed result
+_PROJECTIONS = ('projection', 'filter_projection')
+
+# the nodes evaluated on an item whose first child only is evaluated on the item itself,
+# the others on a value of the item
+_NESTING_NODES = ('subexpression', 'index_expression', 'projection', 'filter_projection',
+                  'value_projection', 'flatten', 'pipe')
+
+
+class QueryPushdown(object):
+    '''Describes how a list command can evaluate simple predicates of a --query on the server,
+    so the service returns fewer items. The query is still evaluated on the returned items, so
+    the predicates pushed down only need to select a superset of the items the query selects.
+
+    :param dict arguments: The arguments of the command selecting the items by a field of the
+        item, by field name, as (argument name, EQ or STARTS_WITH), optionally followed by a
+        function telling whether the argument accepts a value. An equality predicate is passed
+        to either kind of argument, a prefix predicate to STARTS_WITH arguments only.
+    :param str filter_arg: The argument of the command taking an OData $filter.
+    :param list filter_fields: The fields the service accepts in a $filter.
+    :param str select_arg: The argument of the command taking an OData $select of fields.
+    :param str select_model: The model of the listed items, as 'module#Class'. Only the fields
+        of the query which are attributes of the model are passed in the $select.
+    :param list unless_args: Nothing is pushed down when any of these arguments is given, e.g.
+        an argument which cannot be combined with the pushed down arguments.
+    '''
+
+    def __init__(self, arguments=None, filter_arg=None, filter_fields=None, select_arg=None,
+                 select_model=None, unless_args=None):
+        self.arguments = arguments or {}
+        self.filter_arg = filter_arg
+        self.filter_fields = filter_fields or []
+        self.select_arg = select_arg
+        self.select_model = select_model
+        self.unless_args = unless_args or []
+        self._model_fields = None
+
+    def apply(self, expression, args):
+        '''Set the arguments of the parsed command line `args` the user did not give from the
+        compiled JMESPath `expression`.'''
+        if any(getattr(args, a, None) is not None for a in self.unless_args):
+            return
+        filters = []
+        for op, field, value in get_predicates(expression.parsed):
+            arg, kind, accepts = _get_argument(self.arguments.get(field))
+            if arg and (op == EQ or kind == STARTS_WITH) and _is_unset(args, arg) \
+                    and accepts(value):
+                logger.debug("Query predicate on '%s' passed to argument '%s'", field, arg)
+                setattr(args, arg, value)
+            elif field in self.filter_fields:
+                filters.append("{}({}, '{}')".format(op, field, _quote(value)) if op == STARTS_WITH
+                               else "{} {} '{}'".format(field, op, _quote(value)))
+        if filters and self.filter_arg and _is_unset(args, self.filter_arg):
+            setattr(args, self.filter_arg, ' and '.join(filters))
+            logger.debug("Query predicates passed as filter: %s", getattr(args, self.filter_arg))
+        fields = get_selected_fields(expression.parsed) if self.select_arg else None
+        if fields and self.select_model:
+            model_fields = self._get_model_fields()
+            fields = {model_fields[f] for f in fields if f in model_fields}
+        if fields and _is_unset(args, self.select_arg):
+            setattr(args, self.select_arg, ','.join(sorted(fields)))
+            logger.debug("Query fields passed as select: %s", getattr(args, self.select_arg))
+
+    def _get_model_fields(self):
+        '''Returns the names of the serialized fields of the select model, by the name of the
+        fields of the items output.'''
+        if self._model_fields is None:
+            from importlib import import_module
+            from azure.cli.core.util import to_camel_case
+            module_name, class_name = self.select_model.split('#')
+            model = getattr(import_module(module_name), class_name)
+            # pylint: disable=protected-access
+            self._model_fields = {to_camel_case(attr): info['key'].split('.')[0]
+                                  for attr, info in model._attribute_map.items()}
+        return self._model_fields
+
+
+def is_unquoted(value):
+    '''Tells whether a value can be passed to an argument the command formats into an OData
+    filter as is, i.e. whether it has no quote to escape.'''
+    return "'" not in value
+
+
+def _get_argument(spec):
+    if not spec:
+        return None, None, None
+    arg, kind = spec[:2]
+    return arg, kind, spec[2] if len(spec) > 2 else lambda _: True
+
+
+def _is_unset(args, arg):
+    return hasattr(args, arg) and getattr(args, arg) is None
+
+
+def _quote(value):
+    return value.replace("'", "''")
+
+
+def _get_items_expression(node):
+    '''Returns the projection of the listed items at the root of the AST of a JMESPath
+    expression, e.g. `[?name=='x'].id` or `[].name | [0]`, or None.'''
+    if node['type'] == 'pipe':
+        node = node['children'][0]
+    if node['type'] not in _PROJECTIONS:
+        return None
+    items = node['children'][0]
+    if items['type'] == 'flatten':
+        items = items['children'][0]
+    return node if items['type'] == 'identity' else None
+
+
+def get_predicates(parsed):
+    '''Returns the (EQ or STARTS_WITH, field, value) predicates on top-level fields that all the
+    items selected by a parsed JMESPath expression satisfy, e.g. [?name=='x' && location=='y'].
+    '''
+    projection = _get_items_expression(parsed)
+    if not projection or projection['type'] != 'filter_projection':
+        return []
+    predicates = []
+    conditions = [projection['children'][2]]
+    while conditions:
+        node = conditions.pop(0)
+        if node['type'] == 'and_expression':
+            conditions[0:0] = node['children']
+        elif node['type'] == 'comparator' and node['value'] == 'eq':
+            operands = sorted(node['children'], key=lambda n: n['type'] != 'field')
+            predicate = _get_predicate(EQ, *operands)
+            if predicate:
+                predicates.append(predicate)
+        elif node['type'] == 'function_expression' and node['value'] == 'starts_with' \
+                and len(node['children']) == 2:
+            predicate = _get_predicate(STARTS_WITH, *node['children'])
+            if predicate:
+                predicates.append(predicate)
+    return predicates
+
+
+def _get_predicate(op, field, literal):
+    from six import string_types
+    if field['type'] == 'field' and literal['type'] == 'literal' \
+            and isinstance(literal['value'], string_types):
+        return op, field['value'], literal['value']
+    return None
+
+
+def get_selected_fields(parsed):
+    '''Returns the top-level fields of the items a parsed JMESPath expression projecting the
+    listed items uses, e.g. {'name', 'tags'} for [?tags.x=='y'].name, or None when it uses the
+    whole items or when they cannot be determined.'''
+    if parsed['type'] not in _PROJECTIONS or _get_items_expression(parsed) is None:
+        return None
+    fields = set()
+    for child in parsed['children'][1:]:
+        child_fields = _get_item_fields(child)
+        if child_fields is None:
+            return None
+        fields.update(child_fields)
+    return fields or None
+
+
+def _get_item_fields(node):
+    node_type = node['type']
+    if node_type == 'field':
+        return {node['value']}
+    if node_type in ('current', 'identity'):
+        return None
+    children = node.get('children', [])
+    if node_type in _NESTING_NODES:
+        children = children[:1]
+    elif node_type == 'expref':
+        # evaluated on the values of a function argument
+        children = []
+    fields = set()
+    for child in children:
+        child_fields = _get_item_fields(child)
+        if child_fields is None:
+            return None
+        fields.update(child_fields)
+    return fields
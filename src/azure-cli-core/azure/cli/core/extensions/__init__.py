@@ -5,8 +5,11 @@
 
 from azure.cli.core.extensions.query import register as register_query
 from azure.cli.core.extensions.transform import register as register_transform
+from azure.cli.core.extensions.timing import register as register_timing
 
 
 def register_extensions(application):
+    # registered first so the result events are timed before the other handlers run
+    register_timing(application)
     register_query(application)
     register_transform(application)
@@ -37,6 +37,11 @@ def register(application):
         query_expression = args._jmespath_query  # pylint: disable=protected-access
         del args._jmespath_query
         if query_expression:
+            command = kwargs.get('command_table', {}).get(args.command)
+            query_pushdown = getattr(command, 'query_pushdown', None)
+            if query_pushdown:
+                query_pushdown.apply(query_expression, args)
+
             def filter_output(**kwargs):
                 from jmespath import search, Options
                 kwargs['event_data']['result'] = query_expression.search(
@@ -0,0 +1,130 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from __future__ import print_function
+
+import json
+import sys
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+
+class CommandTiming(object):
+    '''Times the phases of a command and records the HTTP requests it makes and the time it
+    sleeps polling operations. The phases are always timed, which is cheap; requests and sleeps
+    are only recorded once --timing is parsed.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start()
+        self._mark = None
+
+    def start(self):
+        self.enabled = False
+        self.phases = OrderedDict()
+        self.requests = OrderedDict()
+        self.polls = {'count': 0, 'seconds': 0.0}
+        self._mark = default_timer()
+
+    def lap(self, phase):
+        '''Account the time since the previous lap to `phase`.'''
+        if self._mark is None:
+            return
+        now = default_timer()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def add_request(self, response, **kwargs):
+        '''A requests response hook recording the response of a request.'''
+        if not self.enabled:
+            return
+        request = response.request
+        host, operation = _get_operation(request.method, request.url)
+        size = None
+        if not kwargs.get('stream'):
+            size = len(response.content or b'')
+        elif response.headers.get('Content-Length'):
+            size = int(response.headers['Content-Length'])
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+        with self._lock:
+            stats = self.requests.setdefault((host, operation), {
+                'host': host, 'operation': operation, 'count': 0, 'retries': 0, 'seconds': 0.0,
+                'maxSeconds': 0.0, 'bytes': 0, 'statuses': {}})
+            seconds = response.elapsed.total_seconds()
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['maxSeconds'] = max(stats['maxSeconds'], seconds)
+            stats['bytes'] += size or 0
+            stats['retries'] += len(retries)
+            # the statuses of the attempts retried by the connection pool, e.g. 429 or 503
+            for status in [r.status for r in retries if r.status] + [response.status_code]:
+                stats['statuses'][str(status)] = stats['statuses'].get(str(status), 0) + 1
+
+    def add_poll_sleep(self, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.polls['count'] += 1
+            self.polls['seconds'] += seconds
+
+    def get_summary(self):
+        requests = list(self.requests.values())
+        return OrderedDict([
+            ('phases', OrderedDict((p, round(s, 3)) for p, s in self.phases.items())),
+            ('requests', OrderedDict([
+                ('count', sum(r['count'] for r in requests)),
+                ('seconds', round(sum(r['seconds'] for r in requests), 3)),
+                ('bytes', sum(r['bytes'] for r in requests)),
+                ('byOperation', [dict(r, seconds=round(r['seconds'], 3),
+                                      maxSeconds=round(r['maxSeconds'], 3))
+                                 for r in requests])])),
+            ('pollingSleeps', OrderedDict([('count', self.polls['count']),
+                                           ('seconds', round(self.polls['seconds'], 3))]))])
+
+    def report(self, file=None):
+        if self.enabled:
+            print(json.dumps(self.get_summary(), indent=2), file=file or sys.stderr)
+
+
+def _get_operation(method, url):
+    '''Returns the host and the operation of a request, e.g. ('management.azure.com',
+    'GET Microsoft.Compute/virtualMachines') for the request of a virtual machine.'''
+    from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    lowered = [s.lower() for s in segments]
+    if 'providers' in lowered:
+        segments = segments[len(lowered) - lowered[::-1].index('providers'):]
+        # the namespace, then the types of the resources and the action if any
+        path = '/'.join(segments[:1] + segments[1::2])
+    else:
+        # the collections, e.g. subscriptions/resourcegroups
+        path = '/'.join(segments[::2])
+    return parsed.netloc, '{} {}'.format(method, path)
+
+
+COMMAND_TIMING = CommandTiming()
+
+
+def _register_global_parameter(global_group):
+    global_group.add_argument('--timing', dest='_timing', action='store_true',
+                              help='Write the time of each phase and a summary of the HTTP '
+                                   'requests of the command to stderr, as JSON.')
+
+
+def register(application):
+    def handle_timing_parameter(**kwargs):
+        COMMAND_TIMING.lap('parse')
+        args = kwargs['args']
+        COMMAND_TIMING.enabled = args._timing  # pylint: disable=protected-access
+        del args._timing
+
+    application.register(application.GLOBAL_PARSER_CREATED, _register_global_parameter)
+    application.register(application.COMMAND_TABLE_LOADED,
+                         lambda **_: COMMAND_TIMING.lap('load'))
+    application.register(application.COMMAND_PARSER_PARSED, handle_timing_parameter)
+    application.register(application.TRANSFORM_RESULT, lambda **_: COMMAND_TIMING.lap('execute'))
@@ -8,9 +8,52 @@ import re
 from azure.cli.core.util import b64_to_hex
 
 
+class ResultTransform(object):
+    '''A transform called with every dict of the result of a command that has `key`. The values
+    of the `skip_keys` of a dict, and the dicts they contain, are not transformed.
+    '''
+
+    def __init__(self, key, transform, skip_keys=None):
+        self.key = key
+        self.transform = transform
+        self.skip_keys = frozenset(skip_keys or [])
+
+
 def register(application):
-    application.register(application.TRANSFORM_RESULT, _resource_group_transform)
-    application.register(application.TRANSFORM_RESULT, _x509_from_base64_to_hex_transform)
+    application.register(application.TRANSFORM_RESULT, _transform_result)
+
+
+def register_result_transform(key, transform, skip_keys=None):
+    '''Register a transform of the dicts with `key` of the results of all the commands.'''
+    result_transforms.append(ResultTransform(key, transform, skip_keys))
+
+
+def transform_result(obj, transforms):
+    '''Apply the transforms to the dicts nested in `obj` in one traversal.'''
+    if not transforms:
+        return
+    # the transforms applying under each key skipped by some of them
+    nested = {}
+    for skip_key in set().union(*[t.skip_keys for t in transforms]):
+        nested[skip_key] = [t for t in transforms if skip_key not in t.skip_keys]
+    _transform(obj, [(t.key, t.transform) for t in transforms], nested)
+
+
+def _transform(obj, transforms, nested):
+    if isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                _transform(item, transforms, nested)
+    elif isinstance(obj, dict):
+        for key, transform in transforms:
+            if key in obj:
+                transform(obj)
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                if key in nested:
+                    transform_result(value, nested[key])
+                else:
+                    _transform(value, transforms, nested)
 
 
 def _parse_id(strid):
@@ -24,40 +67,37 @@ def _parse_id(strid):
     return parsed
 
 
-def _add_resource_group(obj):
-    if isinstance(obj, list):
-        for array_item in obj:
-            _add_resource_group(array_item)
-    elif isinstance(obj, dict):
-        try:
-            if 'resourceGroup' not in obj:
-                if obj['id']:
-                    obj['resourceGroup'] = _parse_id(obj['id'])['resource-group']
-        except (KeyError, IndexError, TypeError):
-            pass
-        for item_key in obj:
-            if item_key != 'sourceVault':
-                _add_resource_group(obj[item_key])
+def _add_resource_group_from_id(obj):
+    try:
+        if 'resourceGroup' not in obj and obj['id']:
+            obj['resourceGroup'] = _parse_id(obj['id'])['resource-group']
+    except (KeyError, IndexError, TypeError):
+        pass
 
 
-def _add_x509_hex(obj):
-    if isinstance(obj, list):
-        for array_item in obj:
-            _add_x509_hex(array_item)
-    elif isinstance(obj, dict):
-        try:
-            if 'x509ThumbprintHex' not in obj:
-                if obj['x509Thumbprint']:
-                    obj['x509ThumbprintHex'] = b64_to_hex(obj['x509Thumbprint'])
-        except (KeyError, IndexError, TypeError):
-            pass
-        for item_key in obj:
-            _add_x509_hex(obj[item_key])
+def _add_x509_hex_from_thumbprint(obj):
+    try:
+        if 'x509ThumbprintHex' not in obj and obj['x509Thumbprint']:
+            obj['x509ThumbprintHex'] = b64_to_hex(obj['x509Thumbprint'])
+    except (KeyError, IndexError, TypeError):
+        pass
+
 
+_resource_group_transform = ResultTransform('id', _add_resource_group_from_id,
+                                            skip_keys=['sourceVault'])
+_x509_hex_transform = ResultTransform('x509Thumbprint', _add_x509_hex_from_thumbprint)
 
-def _resource_group_transform(**kwargs):
-    _add_resource_group(kwargs['event_data']['result'])
+# The transforms applied to the results of all the commands, in a single traversal
+result_transforms = [_resource_group_transform, _x509_hex_transform]
+
+
+def _add_resource_group(obj):
+    transform_result(obj, [_resource_group_transform])
+
+
+def _add_x509_hex(obj):
+    transform_result(obj, [_x509_hex_transform])
 
 
-def _x509_from_base64_to_hex_transform(**kwargs):
-    _add_x509_hex(kwargs['event_data']['result'])
+def _transform_result(**kwargs):
+    transform_result(kwargs['event_data']['result'], result_transforms)
@@ -3,14 +3,93 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import marshal
+import os
+import sys
+import tempfile
+
+from azure.cli.core._environment import get_config_dir
+
+HELP_STORE_FILE_NAME = 'helpStore'
 
 # modules should add entries to helps in the form: "group command": "YAML help"
 helps = {}
 
 
+class HelpStore(object):
+    '''Parsed YAML help persisted with marshal and keyed by the YAML text, so that help shown
+    once is not parsed again by the following commands. Entries are unmarshalled only when they
+    are looked up. Each entry records the CLI and Python version which wrote it, the entries of
+    other versions are parsed again and pruned when the store is saved.
+    '''
+
+    def __init__(self, filename, version):
+        self.filename = filename
+        self.version = version
+        self._entries = None
+        self._dirty = False
+
+    def parse(self, text):
+        if self._entries is None:
+            self._entries = self._read()
+
+        version, entry = self._entries.get(text, (None, None))
+        if version == self.version:
+            return marshal.loads(entry)
+
+        import yaml
+        data = yaml.load(text)
+        try:
+            self._entries[text] = (self.version, marshal.dumps(data))
+            self._dirty = True
+        except ValueError:
+            # YAML types such as dates can't be marshalled; parse them every time
+            pass
+        return data
+
+    def save(self):
+        if not self._dirty:
+            return
+        from azure.cli.core._session import replace_file
+        directory, name = os.path.split(os.path.abspath(self.filename))
+        try:
+            fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=name, suffix='.tmp')
+            self._entries = dict((text, entry) for text, entry in self._entries.items()
+                                 if entry[0] == self.version)
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump(self._entries, f)
+            replace_file(temp_filename, self.filename)
+            self._dirty = False
+        except (OSError, IOError):
+            # the store is only a cache
+            pass
+
+    def _read(self):
+        try:
+            with open(self.filename, 'rb') as f:
+                entries = marshal.load(f)
+            if isinstance(entries, dict) and \
+                    all(isinstance(e, tuple) and len(e) == 2 for e in entries.values()):
+                return entries
+        except (OSError, IOError, EOFError, ValueError, TypeError):
+            pass
+        return {}
+
+
+_help_store = None
+
+
+def get_help_store():
+    global _help_store  # pylint: disable=global-statement
+    if _help_store is None:
+        from azure.cli.core import __version__ as core_version
+        _help_store = HelpStore(os.path.join(get_config_dir(), HELP_STORE_FILE_NAME),
+                                '{}-py{}.{}'.format(core_version, *sys.version_info[:2]))
+    return _help_store
+
+
 def _load_help_file(delimiters):
-    import yaml
     if delimiters in helps:
-        return yaml.load(helps[delimiters])
+        return get_help_store().parse(helps[delimiters])
     else:
         return None
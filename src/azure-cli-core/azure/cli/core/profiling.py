@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# This module is imported before the rest of the CLI to measure its startup, so it only imports
+# from the standard library.
+from __future__ import print_function
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from timeit import default_timer
+
+PROFILE_STARTUP_ARG = '--profile-startup'
+ENV_PROFILE_STARTUP = 'AZURE_CLI_PROFILE_STARTUP'
+ENV_PROFILE_STARTUP_FILE = 'AZURE_CLI_PROFILE_STARTUP_FILE'
+
+
+class StartupProfiler(object):
+    '''Records the wall time and the memory allocated by the phases of the startup and by the
+    command modules imported, when enabled by --profile-startup or AZURE_CLI_PROFILE_STARTUP.
+    Memory is traced with tracemalloc when available (Python 3.4+).
+    '''
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._tracemalloc = None
+
+    def start(self, argv, entered_at=None):
+        '''Start profiling if requested by `argv` or the environment. `entered_at` is the time
+        (time.time()) the process entered the CLI, to measure the interpreter boot.'''
+        self.enabled = PROFILE_STARTUP_ARG in argv or bool(os.environ.get(ENV_PROFILE_STARTUP))
+        if not self.enabled:
+            return
+        try:
+            import tracemalloc
+            tracemalloc.start()
+            self._tracemalloc = tracemalloc
+        except ImportError:
+            pass
+        process_start = _get_process_start_time()
+        if entered_at and process_start:
+            self.add('phase', 'interpreter boot', max(entered_at - process_start, 0.0))
+
+    def add(self, kind, name, seconds, allocated=None):
+        self.records.append({'kind': kind, 'name': name, 'seconds': seconds,
+                             'allocated': allocated})
+
+    @contextmanager
+    def measure(self, kind, name):
+        if not self.enabled:
+            yield
+            return
+        allocated = self._get_allocated()
+        start = default_timer()
+        try:
+            yield
+        finally:
+            seconds = default_timer() - start
+            if allocated is not None:
+                allocated = self._get_allocated() - allocated
+            self.add(kind, name, seconds, allocated)
+
+    def report(self, file=None):
+        '''Print the records by decreasing time, and write them as JSON to the file named by
+        AZURE_CLI_PROFILE_STARTUP_FILE.'''
+        if not self.enabled or not self.records:
+            return
+        file = file or sys.stderr
+        records = sorted(self.records, key=lambda r: r['seconds'], reverse=True)
+        print('\nStartup profile (times include the overhead of tracing allocations)', file=file)
+        print('{:<10}{:<50}{:>12}{:>12}'.format('KIND', 'NAME', 'TIME', 'ALLOCATED'), file=file)
+        for r in records:
+            allocated = '-' if r['allocated'] is None else \
+                '{:.1f} MB'.format(r['allocated'] / 1024.0 / 1024.0)
+            print('{:<10}{:<50}{:>9.0f} ms{:>12}'.format(r['kind'], r['name'],
+                                                         r['seconds'] * 1000, allocated),
+                  file=file)
+        filename = os.environ.get(ENV_PROFILE_STARTUP_FILE)
+        if filename:
+            with open(filename, 'w') as f:
+                json.dump(records, f, indent=2)
+
+    def _get_allocated(self):
+        return self._tracemalloc.get_traced_memory()[0] if self._tracemalloc else None
+
+
+def _get_process_start_time():
+    '''Returns the time (time.time()) the process started, when it can be determined.'''
+    try:
+        with open('/proc/self/stat') as f:
+            # the fields after the command name, which is in parentheses
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + float(start_ticks) / os.sysconf('SC_CLK_TCK')
+    except (IOError, OSError, ValueError, IndexError, StopIteration, AttributeError):
+        return None
+
+
+STARTUP_PROFILER = StartupProfiler()
+
+# shortcut of STARTUP_PROFILER.measure
+measure = STARTUP_PROFILER.measure
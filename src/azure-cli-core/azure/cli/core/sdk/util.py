@@ -54,14 +54,16 @@ class CommandGroup(object):
     def __exit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    def command(self, name, method_name, transform=None, table_transformer=None, confirmation=None):
+    def command(self, name, method_name, transform=None, table_transformer=None, confirmation=None,
+                query_pushdown=None):
         cli_command(self._scope,
                     '{} {}'.format(self._group_name, name),
                     self._service_adapter(method_name),
                     client_factory=self._client_factory,
                     transform=transform,
                     table_transformer=table_transformer,
-                    confirmation=confirmation)
+                    confirmation=confirmation,
+                    query_pushdown=query_pushdown)
 
     def custom_command(self, name, custom_func_name, confirmation=None):
         cli_command(self._scope,
@@ -206,8 +206,20 @@ def conclude():
 
     payload = _session.generate_payload()
     if payload:
-        import subprocess
-        subprocess.Popen([sys.executable, os.path.realpath(telemetry_core.__file__), payload])
+        config = _get_azure_cli_config()
+        spool_file = telemetry_core.get_spool_file()
+        records = telemetry_core.spool(payload, spool_file, max_size=config.getint(
+            'core', 'telemetry_spool_max_size', fallback=telemetry_core.SPOOL_MAX_SIZE))
+
+        if telemetry_core.in_diagnostic_mode() or telemetry_core.is_upload_due(
+                spool_file, records,
+                interval=config.getint('core', 'telemetry_upload_interval',
+                                       fallback=telemetry_core.UPLOAD_INTERVAL),
+                threshold=config.getint('core', 'telemetry_upload_threshold',
+                                        fallback=telemetry_core.UPLOAD_THRESHOLD)):
+            import subprocess
+            subprocess.Popen([sys.executable, os.path.realpath(telemetry_core.__file__),
+                              spool_file])
 
 
 @decorators.suppress_all_exceptions(raise_in_diagnostics=True)
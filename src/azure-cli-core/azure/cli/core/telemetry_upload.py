@@ -6,12 +6,20 @@
 import os
 import sys
 import json
+import time
 import six
 import azure.cli.core.decorators as decorators
+from azure.cli.core._environment import get_config_dir
+from azure.cli.core._session import FileLock, replace_file
 
 DIAGNOSTICS_TELEMETRY_ENV_NAME = 'AZURE_CLI_DIAGNOSTICS_TELEMETRY'
 INSTRUMENTATION_KEY = 'c4395b75-49cc-422c-bc95-c7d51aef5d46'
 
+SPOOL_MAX_SIZE = 1024 * 1024
+UPLOAD_INTERVAL = 600
+UPLOAD_THRESHOLD = 100
+UPLOAD_BATCH_SIZE = 100
+
 
 def in_diagnostic_mode():
     """
@@ -21,8 +29,88 @@ def in_diagnostic_mode():
     return bool(os.environ.get(DIAGNOSTICS_TELEMETRY_ENV_NAME, False))
 
 
+def get_spool_file():
+    return os.path.join(get_config_dir(), 'telemetry', 'spool')
+
+
+def spool(payload, spool_file, max_size=SPOOL_MAX_SIZE):
+    """
+    Append the payload of a command to the spool file, unless it would grow the file beyond
+    max_size bytes. Return the number of payloads in the spool.
+    """
+    directory = os.path.dirname(spool_file)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    line = payload + '\n'
+    with FileLock(spool_file + '.lock'):
+        with open(spool_file, 'a+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() + len(line) <= max_size:
+                f.write(line)
+            f.seek(0)
+            return sum(1 for _ in f)
+
+
+def is_upload_due(spool_file, records, interval=UPLOAD_INTERVAL, threshold=UPLOAD_THRESHOLD):
+    """
+    Return True once the spool holds threshold payloads or interval seconds passed since the last
+    upload started. The start of the upload is recorded, so only one caller starts an uploader.
+    """
+    stamp_file = spool_file + '.uploaded'
+    with FileLock(spool_file + '.lock'):
+        try:
+            elapsed = time.time() - os.path.getmtime(stamp_file)
+        except OSError:
+            elapsed = None
+        if records < threshold and elapsed is not None and 0 <= elapsed < interval:
+            return False
+        with open(stamp_file, 'a'):
+            os.utime(stamp_file, None)
+        return True
+
+
+def drain(spool_file, batch_size=UPLOAD_BATCH_SIZE):
+    """
+    Upload the payloads in the spool file in batches. Payloads which could not be uploaded are
+    retried by the next uploader. Return immediately if another uploader is running.
+    """
+    uploading_file = spool_file + '.uploading'
+    upload_lock = FileLock(spool_file + '.upload.lock', timeout=0)
+    try:
+        upload_lock.acquire()
+    except (OSError, IOError):
+        return
+
+    try:
+        with FileLock(spool_file + '.lock'):
+            if not os.path.isfile(uploading_file) and os.path.isfile(spool_file):
+                replace_file(spool_file, uploading_file)
+        if not os.path.isfile(uploading_file):
+            return
+
+        events = []
+        with open(uploading_file, 'r') as f:
+            for line in f:
+                events.extend(_parse_payload(line))
+        if upload(events, batch_size=batch_size):
+            os.remove(uploading_file)
+    finally:
+        upload_lock.release()
+
+
+def _parse_payload(payload):
+    try:
+        return json.loads(payload.replace("'", '"'))
+    except Exception as err:  # pylint: disable=broad-except
+        if in_diagnostic_mode():
+            sys.stdout.write('{}/n'.format(str(err)))
+            sys.stdout.write('Raw [{}]/n'.format(payload))
+        return []
+
+
 @decorators.suppress_all_exceptions(raise_in_diagnostics=True)
-def upload(data_to_save):
+def upload(data_to_save, batch_size=UPLOAD_BATCH_SIZE):
     from applicationinsights import TelemetryClient
     from applicationinsights.exceptions import enable
 
@@ -32,14 +120,10 @@ def upload(data_to_save):
     if in_diagnostic_mode():
         sys.stdout.write('Telemetry upload begins\n')
 
-    try:
-        data_to_save = json.loads(data_to_save.replace("'", '"'))
-    except Exception as err:  # pylint: disable=broad-except
-        if in_diagnostic_mode():
-            sys.stdout.write('{}/n'.format(str(err)))
-            sys.stdout.write('Raw [{}]/n'.format(data_to_save))
+    if isinstance(data_to_save, six.string_types):
+        data_to_save = _parse_payload(data_to_save)
 
-    for record in data_to_save:
+    for index, record in enumerate(data_to_save):
         name = record['name']
         raw_properties = record['properties']
         properties = {}
@@ -56,14 +140,19 @@ def upload(data_to_save):
             sys.stdout.write('\nTrack Event: {}\nProperties: {}\nMeasurements: {}'.format(
                 name, json.dumps(properties), json.dumps(measurements)))
 
+        if (index + 1) % batch_size == 0:
+            client.flush()
+
     client.flush()
 
     if in_diagnostic_mode():
         sys.stdout.write('\nTelemetry upload completes\n')
 
+    return True
+
 
 if __name__ == '__main__':
     # If user doesn't agree to upload telemetry, this scripts won't be executed. The caller should
     # control.
     decorators.is_diagnostics_mode = in_diagnostic_mode
-    upload(sys.argv[1])
+    drain(sys.argv[1])
@@ -112,7 +112,7 @@ def _mock_user_access_token(_, _1, _2, _3):  # pylint: disable=unused-argument
     return ('Bearer', 'top-secret-token-for-you')
 
 
-def _mock_operation_delay(_):
+def _mock_operation_delay(*args):  # pylint: disable=unused-argument
     # don't run time.sleep()
     return
 
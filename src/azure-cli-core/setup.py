@@ -62,6 +62,9 @@ DEPENDENCIES = [
     'tabulate',
 ]
 
+if sys.version_info < (3, 2):
+    DEPENDENCIES.append('futures')
+
 if sys.version_info < (3, 4):
     DEPENDENCIES.append('enum34')
 
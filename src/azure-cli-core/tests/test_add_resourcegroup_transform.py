@@ -5,7 +5,9 @@
 
 import unittest
 from six import StringIO
-from azure.cli.core.extensions.transform import _parse_id, _add_resource_group
+from azure.cli.core.util import b64_to_hex
+from azure.cli.core.extensions.transform import (_parse_id, _add_resource_group, transform_result,
+                                                 result_transforms)
 
 
 class TestResourceGroupTransform(unittest.TestCase):
@@ -84,6 +86,24 @@ class TestResourceGroupTransform(unittest.TestCase):
             'name': 'A name'
         })
 
+    def test_transforms_in_one_traversal(self):
+        vault_id = TestResourceGroupTransform.CORRECT_ID.replace('vMName', 'vault')
+        thumbprint_hex = b64_to_hex('AAEC')
+        instance = [{
+            'id': TestResourceGroupTransform.CORRECT_ID,
+            'secrets': [{'sourceVault': {'id': vault_id},
+                         'vaultCertificates': [{'x509Thumbprint': 'AAEC'}]}],
+            'sourceVault': {'id': vault_id, 'x509Thumbprint': 'AAEC'}
+        }]
+        transform_result(instance, result_transforms)
+        self.assertEqual(instance[0]['resourceGroup'], 'REsourceGROUPname')
+        # the values of sourceVault are not given a resource group, but are otherwise transformed
+        self.assertNotIn('resourceGroup', instance[0]['secrets'][0]['sourceVault'])
+        self.assertEqual(instance[0]['sourceVault'],
+                         {'id': vault_id, 'x509Thumbprint': 'AAEC', 'x509ThumbprintHex': thumbprint_hex})
+        self.assertEqual(instance[0]['secrets'][0]['vaultCertificates'][0]['x509ThumbprintHex'],
+                         thumbprint_hex)
+
 
 if __name__ == '__main__':
     unittest.main()
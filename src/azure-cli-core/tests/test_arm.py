@@ -3,9 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import argparse
 import unittest
 
-from azure.cli.core.commands.arm import parse_resource_id
+from azure.cli.core.commands import CliCommand
+from azure.cli.core.commands.arm import parse_resource_id, add_id_parameters
 
 
 class TestARM(unittest.TestCase):
@@ -93,6 +95,27 @@ class TestARM(unittest.TestCase):
             resource = parse_resource_id(test['resource_id'])
             self.assertDictEqual(resource, test['expected'])
 
+    def _split_ids(self, ids):
+        command = CliCommand('web show', lambda resource_group_name, name, slot: None)
+        command.add_argument('resource_group_name', '--resource-group', id_part='resource_group')
+        command.add_argument('name', '--name', id_part='name')
+        command.add_argument('slot', '--slot', id_part='child_name', id_part_optional=True)
+        add_id_parameters({'web show': command})
+        action = command.arguments['ids'].options['action']('--ids', argparse.SUPPRESS)
+        namespace = argparse.Namespace()
+        action(None, namespace, ids)
+        return namespace
+
+    def test_ids_without_optional_id_part(self):
+        namespace = self._split_ids([
+            '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Web/sites/web1',
+            '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Web/sites/web2/slots/s1'])
+        self.assertEqual(namespace.name, ['web1', 'web2'])
+        self.assertEqual(namespace.slot, [None, 's1'])
+
+        with self.assertRaises(ValueError):
+            self._split_ids(['/subscriptions/sub/providers/Microsoft.Web/sites/web1'])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._completion_cache import (CompletionCache, cached_completer,
+                                              MAX_COMPLETION_AGE)
+from azure.cli.core._session import Session
+
+
+class TestCompletionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.filename = os.path.join(self.folder, 'completionCache.json')
+        self.now = 1000.0
+        self.refreshes = []
+        self.cache = self._load()
+        for patcher in [
+                mock.patch('azure.cli.core._completion_cache._completion_cache', self.cache),
+                mock.patch('azure.cli.core._completion_cache._get_current_subscription',
+                           return_value='sub')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.calls = []
+
+    def _load(self):
+        session = Session()
+        session.load(self.filename)
+        return CompletionCache(session, ttl=60, clock=lambda: self.now,
+                               refresh=self.refreshes.append)
+
+    def _completer(self, values):
+        @cached_completer(args=['location'])
+        def get_sizes_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
+            self.calls.append(kwargs['parsed_args'].location)
+            return values
+        return get_sizes_completion_list
+
+    def test_values_cached_by_parsed_args_and_persisted(self):
+        completer = self._completer(['small', 'large'])
+        for location in ['westus', 'eastus', 'westus']:
+            self.assertEqual(completer('', parsed_args=argparse.Namespace(location=location)),
+                             ['small', 'large'])
+        self.assertEqual(self.calls, ['westus', 'eastus'])
+
+        self.cache = self._load()
+        with mock.patch('azure.cli.core._completion_cache._completion_cache', self.cache):
+            completer('', parsed_args=argparse.Namespace(location='eastus'))
+        self.assertEqual(self.calls, ['westus', 'eastus'])
+
+    def test_stale_values_served_and_refreshed(self):
+        self._completer(['small'])('', parsed_args=argparse.Namespace(location='westus'))
+        self.now += 61
+        completer = self._completer(['small', 'large'])
+        self.assertEqual(completer('', parsed_args=argparse.Namespace(location='westus')),
+                         ['small'])
+        # the refresh started is not started again by the next completions
+        self.assertEqual(completer('', parsed_args=argparse.Namespace(location='westus')),
+                         ['small'])
+        self.assertEqual(len(self.refreshes), 1)
+        self.assertEqual(self.calls, ['westus'])
+
+        self.refreshes[0]()
+        self.assertEqual(completer('', parsed_args=argparse.Namespace(location='westus')),
+                         ['small', 'large'])
+        self.assertEqual(len(self.refreshes), 1)
+
+    def test_expired_values_not_served(self):
+        self._completer(['small'])('', parsed_args=argparse.Namespace(location='westus'))
+        self.now += MAX_COMPLETION_AGE
+        self.assertEqual(self._completer(['large'])('', parsed_args=argparse.Namespace(
+            location='westus')), ['large'])
+        self.assertEqual(self.refreshes, [])
+
+    def test_values_not_cached_without_ttl(self):
+        self.cache.ttl = 0
+        completer = self._completer(['small'])
+        completer('', parsed_args=argparse.Namespace(location='westus'))
+        completer('', parsed_args=argparse.Namespace(location='westus'))
+        self.assertEqual(self.calls, ['westus', 'westus'])
+
+
+if __name__ == '__main__':
+    unittest.main()
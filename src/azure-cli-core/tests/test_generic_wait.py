@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+from msrest.exceptions import ClientException
+
+from azure.cli.core.application import Application, Configuration
+from azure.cli.core.commands import command_table
+from azure.cli.core.commands.arm import (cli_generic_wait_command, ResourceIdList,
+                                         add_id_parameters)
+from azure.cli.core.util import CLIError
+
+_POLLS = {}
+_SETTLE_AFTER = {'vm1': 1, 'vm2': 3, 'gone1': 1, 'gone2': 2}
+
+
+class _Instance(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, provisioning_state):
+        self.provisioning_state = provisioning_state
+
+
+def get_resource(resource_group_name, name):  # pylint: disable=unused-argument
+    _POLLS[name] = _POLLS.get(name, 0) + 1
+    if name == 'broken':
+        return _Instance('Failed')
+    if name.startswith('gone') and _POLLS[name] >= _SETTLE_AFTER[name]:
+        ex = ClientException('not found')
+        ex.status_code = 404
+        raise ex
+    settled = _POLLS[name] >= _SETTLE_AFTER.get(name, float('inf'))
+    return _Instance('Succeeded' if settled else 'Creating')
+
+
+def _wait_args(name, **conditions):
+    args = {'resource_group_name': 'rg', 'name': name, 'timeout': 100, 'interval': None,
+            'created': False, 'deleted': False, 'updated': False, 'exists': False,
+            'custom': None}
+    args.update(conditions)
+    return args
+
+
+@mock.patch('time.sleep', lambda _: None)
+class TestGenericWait(unittest.TestCase):
+
+    def setUp(self):
+        _POLLS.clear()
+        cli_generic_wait_command(__name__, 'test wait', __name__ + '#get_resource')
+        self.command = command_table['test wait']
+        self.command.load_arguments()
+
+    def tearDown(self):
+        del command_table['test wait']
+
+    def test_wait_single_resource(self):
+        self.assertIsNone(self.command.handler(_wait_args('vm2', created=True)))
+        self.assertEqual(_POLLS['vm2'], 3)
+
+    def test_wait_many_resources(self):
+        self.command.batch_handler([_wait_args('vm1', created=True),
+                                    _wait_args('vm2', created=True)])
+        # a settled resource isn't polled again
+        self.assertEqual(_POLLS, {'vm1': 1, 'vm2': 3})
+
+    def test_wait_many_resources_through_ids(self):
+        ids = ['/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/'
+               'virtualMachines/{}'.format(name) for name in ['vm1', 'vm2']]
+        argv = ['test', 'wait', '--ids'] + ids + ['--created']
+        config = Configuration(argv)
+        config.get_command_table = lambda: {'test wait': self.command}
+        config.load_params = lambda _: None
+        self.command.arguments['resource_group_name'].id_part = 'resource_group'
+        self.command.arguments['name'].id_part = 'name'
+        application = Application(config)
+        application.register(application.COMMAND_TABLE_PARAMS_LOADED, add_id_parameters)
+        result = application.execute(argv)
+        self.assertEqual(result.result, [])
+        self.assertEqual(_POLLS, {'vm1': 1, 'vm2': 3})
+
+    def test_wait_many_resources_deleted(self):
+        self.command.batch_handler([_wait_args('gone1', deleted=True),
+                                    _wait_args('gone2', deleted=True)])
+        self.assertEqual(_POLLS, {'gone1': 1, 'gone2': 2})
+
+    def test_wait_many_resources_aggregates_failures(self):
+        with self.assertRaises(CLIError) as cm:
+            self.command.batch_handler([_wait_args('vm1', created=True),
+                                        _wait_args('broken', created=True),
+                                        _wait_args('never', created=True, timeout=0)])
+        message = str(cm.exception)
+        self.assertIn('2 of 3', message)
+        self.assertIn('name=broken', message)
+        self.assertIn('The operation failed', message)
+        self.assertIn('name=never', message)
+        self.assertNotIn('name=vm1', message)
+
+    def test_resource_id_list(self):
+        rid = '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/{}'
+        ids = ResourceIdList('{}\n{}  {}\n'.format(rid.format('a'), rid.format('b'),
+                                                   rid.format('c')))
+        self.assertEqual(ids, [rid.format('a'), rid.format('b'), rid.format('c')])
+        with self.assertRaises(ValueError):
+            ResourceIdList('{} not-an-id'.format(rid.format('a')))
+        with self.assertRaises(ValueError):
+            ResourceIdList(' ')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import marshal
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import yaml
+
+from azure.cli.core.help_files import HelpStore
+
+_HELP = """
+    type: command
+    short-summary: Create a virtual machine.
+    parameters:
+        - name: --name -n
+          short-summary: Name of the virtual machine.
+    examples:
+        - name: Create a VM.
+          text: az vm create -n MyVm -g MyResourceGroup
+"""
+
+_yaml_load = yaml.load
+
+
+def _safe_load(text):
+    return _yaml_load(text, Loader=yaml.SafeLoader)
+
+
+@mock.patch('yaml.load', side_effect=_safe_load)
+class TestHelpStore(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'helpStore')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_parsed_help_is_reused(self, mock_load):
+        store = HelpStore(self.filename, '2.0.3')
+        data = store.parse(_HELP)
+        self.assertEqual(data['short-summary'], 'Create a virtual machine.')
+        self.assertEqual(store.parse(_HELP), data)
+        store.save()
+
+        self.assertEqual(HelpStore(self.filename, '2.0.3').parse(_HELP), data)
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_version_change_discards_store(self, mock_load):
+        store = HelpStore(self.filename, '2.0.3')
+        store.parse(_HELP)
+        store.save()
+
+        HelpStore(self.filename, '2.0.4').parse(_HELP)
+        self.assertEqual(mock_load.call_count, 2)
+
+    def test_entries_of_other_versions_pruned(self, mock_load):
+        store = HelpStore(self.filename, '2.0.3')
+        store.parse(_HELP)
+        store.save()
+
+        store = HelpStore(self.filename, '2.0.4')
+        store.parse(_HELP.replace('Create', 'Build'))
+        store.save()
+        with open(self.filename, 'rb') as f:
+            entries = marshal.load(f)
+        self.assertEqual([(text, version) for text, (version, _) in entries.items()],
+                         [(_HELP.replace('Create', 'Build'), '2.0.4')])
+        self.assertEqual(mock_load.call_count, 2)
+
+    def test_edited_help_is_parsed_again(self, mock_load):
+        store = HelpStore(self.filename, '2.0.3')
+        store.parse(_HELP)
+        store.save()
+
+        data = HelpStore(self.filename, '2.0.3').parse(_HELP.replace('Create', 'Build'))
+        self.assertEqual(data['short-summary'], 'Build a virtual machine.')
+        self.assertEqual(mock_load.call_count, 2)
+
+    def test_unmarshallable_help_is_not_stored(self, mock_load):
+        store = HelpStore(self.filename, '2.0.3')
+        self.assertEqual(store.parse('released: 2017-04-03'),
+                         {'released': datetime.date(2017, 4, 3)})
+        store.save()
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_corrupted_store_is_ignored(self, mock_load):
+        with open(self.filename, 'wb') as f:
+            f.write(b'not marshalled')
+        store = HelpStore(self.filename, '2.0.3')
+        self.assertEqual(store.parse(_HELP)['type'], 'command')
+        store.save()
+        self.assertEqual(HelpStore(self.filename, '2.0.3').parse(_HELP)['type'], 'command')
+        self.assertEqual(mock_load.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer  # pylint: disable=import-error
+from msrest import Configuration, ServiceClient
+from msrest.authentication import Authentication
+
+from azure.cli.core._http_cache import HttpCache
+
+_LOCATIONS = '/subscriptions/sub/locations'
+_GROUPS = '/subscriptions/sub/resourcegroups'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    '''Serves the body of a path of the server with an ETag, or 304 when it matches.'''
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        server.requests.append((self.path, self.headers.get('If-None-Match')))
+        path = self.path.split('?')[0]
+        body = json.dumps(server.bodies[path]).encode('utf-8')
+        etag = '"{}"'.format(len(server.requests) if server.etag is None else server.etag)
+        if server.etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if server.etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.server.requests.append((self.path, None))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _StubHandler)
+        self.server.requests = []
+        self.server.etag = 'v1'
+        self.server.bodies = {_LOCATIONS: {'value': [{'name': 'westus'}]},
+                              _GROUPS: {'value': [{'name': 'group'}]}}
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.now = 1000.0
+        self.cache = HttpCache(self.folder, clock=lambda: self.now)
+        config = Configuration('http://127.0.0.1:{}/'.format(self.server.server_port))
+        self.cache.mount(config, 'user')
+        self.client = ServiceClient(Authentication(), config)
+        patcher = mock.patch('azure.cli.core._config.az_config.getint',
+                             side_effect=lambda section, option, fallback: fallback)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, path):
+        response = self.client.send(self.client.get(path, {'api-version': '2016-06-01'}))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _cached_paths(self):
+        return [urlparse(e['url']).path for e in self.cache.list()]
+
+    def test_fresh_responses_served_from_cache(self):
+        self.server.etag = None
+        self.assertEqual(self._get(_LOCATIONS), {'value': [{'name': 'westus'}]})
+        self.assertEqual(self._get(_LOCATIONS), {'value': [{'name': 'westus'}]})
+        self.assertEqual(len(self.server.requests), 1)
+
+        # the responses of the requests without a cache policy are not cached
+        self._get(_GROUPS)
+        self._get(_GROUPS)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self._cached_paths(), [_LOCATIONS])
+
+    def test_stale_responses_revalidated_with_etag(self):
+        self._get(_LOCATIONS)
+        self.now += 24 * 3600
+        self.server.bodies[_LOCATIONS] = {'value': []}
+        # not modified according to the ETag, served from the cache
+        self.assertEqual(self._get(_LOCATIONS), {'value': [{'name': 'westus'}]})
+        self.assertEqual(self.server.requests[1][1], '"v1"')
+        self.assertEqual(self._get(_LOCATIONS), {'value': [{'name': 'westus'}]})
+        self.assertEqual(len(self.server.requests), 2)
+
+        self.now += 24 * 3600
+        self.server.etag = 'v2'
+        self.assertEqual(self._get(_LOCATIONS), {'value': []})
+        self.now += 24 * 3600
+        self.assertEqual(self._get(_LOCATIONS), {'value': []})
+        self.assertEqual(self.server.requests[3][1], '"v2"')
+
+    def test_responses_removed_by_writes(self):
+        self.server.bodies['/subscriptions/sub/providers/Microsoft.Compute'] = {'value': []}
+        for path in [_LOCATIONS, '/subscriptions/sub/providers/Microsoft.Compute']:
+            self._get(path)
+        for path in ['/subscriptions/sub/resourcegroups/group',
+                     '/subscriptions/sub/providers/Microsoft.Compute/register']:
+            self.client.send(self.client.post(path, {'api-version': '2016-06-01'}))
+        # the registration of the provider removed its response, not the locations
+        self.assertEqual(self._cached_paths(), [_LOCATIONS])
+
+    def test_responses_without_etag_cached_for_their_max_age(self):
+        providers = '/subscriptions/sub/providers/Microsoft.Compute'
+        self.server.etag = None
+        self.server.bodies[providers] = {'registrationState': 'Registered'}
+        self._get(providers)
+        self.now += 3000
+        self._get(providers)
+        self.assertEqual(len(self.server.requests), 1)
+
+        self.now += 1000
+        self.server.bodies[providers] = {'registrationState': 'Unregistered'}
+        self.assertEqual(self._get(providers), {'registrationState': 'Unregistered'})
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_least_recently_used_responses_evicted(self):
+        # the bodies take 12 bytes
+        self.cache.max_size = 30
+        self.server.bodies.update({'/subscriptions/sub{}/locations'.format(i): {'value': i}
+                                   for i in range(4)})
+        for i in [0, 1, 2, 0, 3]:
+            self.now += 1
+            self._get('/subscriptions/sub{}/locations'.format(i))
+        self.assertEqual(self._cached_paths(),
+                         ['/subscriptions/sub3/locations', '/subscriptions/sub0/locations'])
+        self.assertLessEqual(self.cache.get_summary()['size'], 30)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.list(), [])
+        self.assertEqual(self.cache.get_summary()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
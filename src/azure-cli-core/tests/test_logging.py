@@ -3,7 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import logging
 import unittest
+
+import mock
+
 import azure.cli.core.azlogging as azlogging
 
 
@@ -65,6 +69,23 @@ class TestLogging(unittest.TestCase):
         az_module_logger = azlogging.get_az_logger('azure.cli.module')
         self.assertEqual(az_module_logger.name, 'az.azure.cli.module')
 
+    @mock.patch('azure.cli.core.azlogging.ENABLE_LOG_FILE', False)
+    def test_is_logged(self):
+        az_logger = logging.getLogger('az')
+        root_logger = logging.getLogger()
+        for logger in [az_logger, root_logger]:
+            for attr in ['handlers', 'level', 'propagate']:
+                self.addCleanup(setattr, logger, attr, getattr(logger, attr))
+        module_logger = azlogging.get_az_logger('azure.cli.module')
+        for argv, debug_logged, info_logged in [([], False, False), (['--verbose'], False, True),
+                                                (['--debug'], True, True)]:
+            az_logger.handlers = []
+            root_logger.handlers = []
+            azlogging.configure_logging(argv)
+            self.assertEqual(azlogging.is_logged(module_logger, logging.DEBUG), debug_logged)
+            self.assertEqual(azlogging.is_logged(module_logger, logging.INFO), info_logged)
+            self.assertTrue(azlogging.is_logged(module_logger, logging.WARNING))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -9,8 +9,9 @@ import unittest
 from collections import OrderedDict
 from six import StringIO
 
+import mock
 from azure.cli.core._output import (OutputProducer, format_json, format_table,
-                                    format_tsv, CommandResultItem)
+                                    format_tsv, CommandResultItem, TableOutput)
 import azure.cli.core.util as util
 
 
@@ -144,6 +145,34 @@ qwerty  0b1f6472qwerty
 qwerty  0b1f6472qwerty         1  0b1f6472
 """))
 
+    def test_out_table_streamed(self):
+        output_producer = OutputProducer(formatter=format_table, file=self.io)
+        obj = [OrderedDict([('name', 'qwerty'), ('size', 5)]),
+               OrderedDict([('name', 'asdf'), ('size', 12), ('extra', 'not shown')])]
+        with mock.patch('azure.cli.core._config.az_config.getint',
+                        lambda section, option, fallback: 1 if option == 'table_sample_rows'
+                        else fallback):
+            output_producer.out(CommandResultItem(obj, is_query_active=True))
+        self.assertEqual(util.normalize_newlines(self.io.getvalue()), util.normalize_newlines(
+            """Name      Size
+------  ------
+qwerty       5
+asdf        12
+"""))
+
+    def test_table_stream_same_as_dump(self):
+        obj = [OrderedDict([('name', 'qwerty'), ('size', 5), ('location', None)]),
+               OrderedDict([('name', 'a'), ('size', 1250), ('location', 'westus')])]
+        table = TableOutput()
+        self.assertEqual(''.join(table.stream(obj, 10)), table.dump(obj))
+
+    def test_table_stream_column_width(self):
+        obj = [OrderedDict([('name', 'abcdefghij'), ('description', 'short')]),
+               OrderedDict([('name', 'abc'), ('description', 'a longer description')])]
+        lines = list(''.join(TableOutput().stream(obj, 1, max_width=8)).splitlines())
+        self.assertEqual(lines, ['Name      Descr...', '--------  --------',
+                                 'abcde...  short', 'abc       a lon...'])
+
     # TSV output tests
     def test_output_format_dict(self):
         obj = {}
@@ -0,0 +1,149 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+from msrestazure.azure_exceptions import CloudError
+
+from azure.cli.core.commands import LongRunningOperation
+from azure.cli.core.util import CLIError
+from azure.cli.core.commands._polling import PollingBackoff, get_retry_after, poll_until
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+        self._content = b'{}'
+
+
+class FakePoller(object):
+    """ Completes once the fake clock reaches `duration` seconds. """
+
+    def __init__(self, clock, duration, result='done'):
+        self._clock = clock
+        self._duration = duration
+        self._result = result
+        self._response = FakeResponse()
+        self.waits = []
+
+    def done(self):
+        return self._clock() >= self._duration
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        self._clock.sleep(min(timeout, self._duration - self._clock()))
+
+    def result(self):
+        return self._result
+
+
+class FailedPoller(FakePoller):
+    """ Fails once the fake clock reaches `duration` seconds, raising `error` like msrestazure
+    from wait() and result(). """
+
+    def __init__(self, clock, duration, error):
+        super(FailedPoller, self).__init__(clock, duration)
+        self._error = error
+
+    def wait(self, timeout=None):
+        super(FailedPoller, self).wait(timeout)
+        if self.done():
+            raise self._error
+
+    def result(self):
+        raise self._error
+
+
+class TestPolling(unittest.TestCase):
+
+    def test_backoff_grows_up_to_maximum(self):
+        backoff = PollingBackoff(initial=1, maximum=10, factor=2, jitter=0)
+        self.assertEqual([backoff.next_delay() for _ in range(6)], [1, 2, 4, 8, 10, 10])
+
+    def test_backoff_jitter_shortens_delay(self):
+        backoff = PollingBackoff(initial=4, maximum=4, jitter=0.5, rand=lambda: 1.0)
+        self.assertEqual(backoff.next_delay(), 2.0)
+
+    def test_backoff_honors_retry_after(self):
+        backoff = PollingBackoff(initial=1, maximum=10, jitter=0)
+        self.assertEqual(backoff.next_delay(retry_after=45), 45)
+        self.assertEqual(backoff.next_delay(), 1)
+
+    def test_fixed_backoff(self):
+        backoff = PollingBackoff.fixed(30)
+        self.assertEqual([backoff.next_delay() for _ in range(3)], [30, 30, 30])
+
+    def test_get_retry_after(self):
+        self.assertEqual(get_retry_after(FakeResponse({'Retry-After': '7'})), 7)
+        past = FakeResponse({'Retry-After': 'Sun, 01 Jan 2017 00:00:00 GMT'})
+        self.assertEqual(get_retry_after(past), 0)
+        self.assertIsNone(get_retry_after(FakeResponse({'Retry-After': 'soon'})))
+        self.assertIsNone(get_retry_after(FakeResponse()))
+        self.assertIsNone(get_retry_after(None))
+
+    def test_poll_until_completes(self):
+        clock = FakeClock()
+        result = poll_until(lambda: clock() >= 20 and 'ok',
+                            PollingBackoff(initial=1, maximum=8, jitter=0),
+                            clock=clock, sleep=clock.sleep)
+        self.assertEqual(result, 'ok')
+        self.assertEqual(clock.sleeps, [1, 2, 4, 8, 8])
+
+    def test_poll_until_times_out(self):
+        clock = FakeClock()
+        result = poll_until(lambda: False, PollingBackoff.fixed(30), timeout=100,
+                            clock=clock, sleep=clock.sleep)
+        self.assertIsNone(result)
+        self.assertEqual(clock.sleeps, [30, 30, 30, 10])
+        self.assertEqual(clock(), 100)
+
+    def test_long_running_operation_returns_when_operation_completes(self):
+        clock = FakeClock()
+        poller = FakePoller(clock, duration=3.5)
+        self.assertEqual(LongRunningOperation()(poller), 'done')
+        self.assertEqual(poller.waits, [1, 1, 1, 1])
+        self.assertEqual(clock(), 3.5)
+
+    def test_long_running_operation_done(self):
+        clock = FakeClock()
+        poller = FakePoller(clock, duration=0)
+        self.assertEqual(LongRunningOperation()(poller), 'done')
+        self.assertEqual(poller.waits, [])
+
+    @mock.patch('time.sleep')
+    def test_long_running_operation_sleeps_without_wait(self, mock_sleep):
+        clock = FakeClock()
+        mock_sleep.side_effect = clock.sleep
+        poller = mock.Mock(spec=['done', 'result', '_response'], _response=FakeResponse())
+        poller.done.side_effect = lambda: clock() >= 2
+        poller.result.return_value = 'done'
+        self.assertEqual(LongRunningOperation()(poller), 'done')
+        self.assertEqual(clock.sleeps, [1, 1])
+
+    def test_long_running_operation_failed(self):
+        error = CloudError(mock.MagicMock(status_code=400, text='{}'), error='Deployment failed.')
+        poller = FailedPoller(FakeClock(), duration=2, error=error)
+        with self.assertRaises(CLIError) as context:
+            LongRunningOperation()(poller)
+        self.assertIn('Deployment failed.', str(context.exception))
+        self.assertEqual(poller.waits, [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
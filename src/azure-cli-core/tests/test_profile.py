@@ -6,6 +6,7 @@
 # pylint: disable=protected-access, unsubscriptable-object
 import json
 import os
+import threading
 import unittest
 import mock
 
@@ -357,7 +358,7 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         self.assertEqual(mock_read_cred_file.call_count, 1)
         self.assertEqual(mock_persist_creds.call_count, 1)
 
-    @mock.patch('azure.cli.core._profile._delete_file', autospec=True)
+    @mock.patch('azure.cli.core._token_store.TokenStore.clear', autospec=True)
     def test_logout_all(self, mock_delete_cred_file):
         # setup
         storage_mock = {'subscriptions': None}
@@ -418,6 +419,47 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         self.assertEqual([], subs)
         mock_logger.warning.assert_called_once_with(mock.ANY, mock.ANY, mock.ANY)
 
+    @mock.patch('azure.cli.core._profile.logger', autospec=True)
+    def test_find_subscriptions_thru_username_password_across_tenants(self, mock_logger):
+        tenants = ['tenant{}'.format(i) for i in range(25)]
+        release_slow_tenant = threading.Event()
+
+        def _acquire_token(authority, resource, user_id, client_id):  # pylint: disable=unused-argument
+            tenant = authority.split('/')[-1]
+            if tenant == 'tenant3':
+                raise AdalError('Account is disabled')
+            if tenant == 'tenant7':
+                release_slow_tenant.wait(5)
+            return {'accessToken': tenant}
+
+        def _create_auth_context(authority, _):
+            context = mock.MagicMock()
+            context.acquire_token_with_username_password.return_value = self.token_entry1
+            context.acquire_token.side_effect = lambda *args: _acquire_token(authority, *args)
+            return context
+
+        def _create_arm_client(credentials):
+            client = mock.MagicMock()
+            tenant = credentials.token['access_token']
+            client.tenants.list.return_value = [TenantStub(t) for t in tenants]
+            client.subscriptions.list.return_value = [SubscriptionStub(
+                '/subscriptions/{}'.format(tenant), tenant, self.state1, tenant)]
+            return client
+
+        finder = SubscriptionFinder(_create_auth_context, None, _create_arm_client)
+        finder.TENANT_TIMEOUT = 0.5
+
+        # action
+        subs = finder.find_from_user_account(self.user1, 'bar', None,
+                                             'https://management.core.windows.net/')
+        release_slow_tenant.set()
+
+        # assert
+        expected = [t for t in tenants if t not in ('tenant3', 'tenant7')]
+        self.assertEqual([s.display_name for s in subs], expected)
+        self.assertEqual([s.tenant_id for s in subs], expected)
+        self.assertEqual(mock_logger.warning.call_count, 2)
+
     @mock.patch('adal.AuthenticationContext', autospec=True)
     def test_find_subscriptions_from_particular_tenent(self, mock_auth_context):
         def just_raise(ex):
@@ -555,9 +597,8 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._token_store.TokenStore.append', autospec=True)
+    def test_credscache_add_new_sp_creds(self, mock_append, mock_read_file):
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
@@ -568,7 +609,6 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
             "servicePrincipalTenant": "mytenant2",
             "accessToken": "Secret2"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache()
 
@@ -579,18 +619,17 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         token_entries = [e for _, e in creds_cache.adal_token_cache.read_items()]  # noqa: F812
         self.assertEqual(token_entries, [self.token_entry1])
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        # only the new credential is persisted
+        mock_append.assert_called_once_with(mock.ANY, [('add', test_sp2)], compact=False)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._token_store.TokenStore.append', autospec=True)
+    def test_credscache_remove_creds(self, mock_append, mock_read_file):
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache()
 
@@ -607,22 +646,21 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         # assert #2
         self.assertEqual(creds_cache._service_principal_creds, [])
 
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
-        self.assertEqual(mock_open_for_write.call_count, 2)
+        # removals are compacted away from the token file right away
+        self.assertEqual(mock_append.call_args_list, [
+            mock.call(mock.ANY, [('remove', self.token_entry1)], compact=True),
+            mock.call(mock.ANY, [('remove', test_sp)], compact=True)])
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
+    @mock.patch('azure.cli.core._token_store.TokenStore.append', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
-        token_entry2 = {
-            "accessToken": "new token",
-            "tokenType": "Bearer",
-            "userId": self.user1
-        }
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, mock_append, mock_read_file):  # pylint: disable=line-too-long
+        token_entry2 = dict(self.token_entry1, accessToken='new token', tenantId='excluded')
 
         def acquire_token_side_effect(*args):  # pylint: disable=unused-argument
-            creds_cache.adal_token_cache.has_state_changed = True
+            # adal replaces an expired entry by removing it and adding the refreshed one
+            creds_cache.adal_token_cache.remove([self.token_entry1])
+            creds_cache.adal_token_cache.add([token_entry2])
             return token_entry2
 
         def get_auth_context(authority, **kwargs):  # pylint: disable=unused-argument
@@ -630,7 +668,6 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
             return mock_adal_auth_context
 
         mock_adal_auth_context.acquire_token.side_effect = acquire_token_side_effect
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1]
         creds_cache = CredsCache(auth_ctx_factory=get_auth_context)
 
@@ -644,10 +681,45 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
             mock.ANY)
 
         # assert
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        persisted_entry2 = dict(self.token_entry1, accessToken='new token')
+        mock_append.assert_called_once_with(
+            mock.ANY, [('remove', self.token_entry1), ('add', persisted_entry2)], compact=False)
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    @mock.patch('azure.cli.core._token_store.TokenStore.append', autospec=True)
+    @mock.patch('adal.AuthenticationContext', autospec=True)
+    def test_credscache_refresh_tokens_updated_by_adal(self, mock_adal_auth_context, mock_append, mock_read_file):  # pylint: disable=line-too-long
+        from adal.cache_driver import CacheDriver
+        graph_resource = 'https://graph.windows.net/'
+        token_entry2 = dict(self.token_entry1, resource=graph_resource, accessToken='graph token',
+                            refreshToken='faked456')
+
+        def acquire_token_side_effect(resource, *args):  # pylint: disable=unused-argument
+            # a new MRRT updates the refresh token of the other MRRT entries of the user
+            driver = CacheDriver({'log_context': mock.MagicMock()}, self.token_entry1['_authority'],
+                                 resource, self.token_entry1['_clientId'],
+                                 creds_cache.adal_token_cache, None)
+            driver.add(dict(token_entry2))
+            return token_entry2
+
+        def get_auth_context(authority, **kwargs):  # pylint: disable=unused-argument
+            return mock_adal_auth_context
+
+        mock_adal_auth_context.acquire_token.side_effect = acquire_token_side_effect
+        mock_read_file.return_value = [self.token_entry1]
+        creds_cache = CredsCache(auth_ctx_factory=get_auth_context)
+
+        # action
+        creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, graph_resource)
+
+        # assert
+        mock_append.assert_called_once_with(mock.ANY, [
+            ('remove', self.token_entry1),
+            ('add', dict(self.token_entry1, refreshToken='faked456')),
+            ('add', token_entry2)], compact=False)
+
     def test_service_principal_auth_client_secret(self):
         sp_auth = ServicePrincipalAuth('verySecret!')
         result = sp_auth.get_entry_to_persist('sp_id1', 'tenant1')
@@ -671,18 +743,6 @@ class Test_Profile(unittest.TestCase):  # pylint: disable=too-many-public-method
         })
 
 
-class FileHandleStub(object):  # pylint: disable=too-few-public-methods
-
-    def write(self, content):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _2, _3, _4):
-        pass
-
-
 class SubscriptionStub(Subscription):  # pylint: disable=too-few-public-methods
 
     def __init__(self, id, display_name, state, tenant_id):  # pylint: disable=redefined-builtin,
@@ -0,0 +1,53 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+from six import StringIO
+
+from azure.cli.core.profiling import StartupProfiler, ENV_PROFILE_STARTUP_FILE
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        profiler = StartupProfiler()
+        with mock.patch.dict('os.environ', clear=True):
+            profiler.start(['vm', 'list'])
+        with profiler.measure('phase', 'parse'):
+            pass
+        self.assertEqual(profiler.records, [])
+
+    def test_report_sorted_by_time(self):
+        profiler = StartupProfiler()
+        profiler.start(['vm', 'list', '--profile-startup'])
+        self.addCleanup(lambda: profiler._tracemalloc and profiler._tracemalloc.stop())  # pylint: disable=protected-access
+        with profiler.measure('module', 'vm import'):
+            data = [bytearray(1024) for _ in range(100)]
+        profiler.add('phase', 'parse', 5.0)
+        vm_import = next(r for r in profiler.records if r['name'] == 'vm import')
+        if profiler._tracemalloc:  # pylint: disable=protected-access
+            self.assertGreaterEqual(vm_import['allocated'], 100 * 1024)
+        del data
+
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        output = StringIO()
+        with mock.patch.dict('os.environ', {ENV_PROFILE_STARTUP_FILE: filename}):
+            profiler.report(output)
+        lines = output.getvalue().splitlines()
+        self.assertIn('parse', lines[3])
+        self.assertIn('vm import', output.getvalue())
+        with open(filename) as f:
+            self.assertEqual([r['name'] for r in json.load(f)][:2], ['parse', 'vm import'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import unittest
+
+import jmespath
+
+from azure.cli.core.commands.query_pushdown import (
+    QueryPushdown, EQ, STARTS_WITH, get_predicates, get_selected_fields, is_unquoted)
+
+
+class _Pool(object):  # pylint: disable=too-few-public-methods
+    _attribute_map = {
+        'id': {'key': 'id', 'type': 'str'},
+        'vm_size': {'key': 'vmSize', 'type': 'str'},
+        'e_tag': {'key': 'eTag', 'type': 'str'},
+    }
+
+
+class TestQueryPushdown(unittest.TestCase):
+
+    def test_predicates(self):
+        def _predicates(query):
+            return get_predicates(jmespath.compile(query).parsed)
+
+        self.assertEqual(
+            _predicates("[?name=='vm1' && 'westus'==location && starts_with(type, 'Microsoft.')]"),
+            [(EQ, 'name', 'vm1'), (EQ, 'location', 'westus'),
+             (STARTS_WITH, 'type', 'Microsoft.')])
+        self.assertEqual(_predicates("[?name=='vm1' && tags.env=='test'].id | [0]"),
+                         [(EQ, 'name', 'vm1')])
+        # predicates which do not hold for all the selected items, or not on the listed items
+        self.assertEqual(_predicates("[?name=='vm1' || location=='westus']"), [])
+        self.assertEqual(_predicates("[?name!='vm1']"), [])
+        self.assertEqual(_predicates("[?count==`1`]"), [])
+        self.assertEqual(_predicates("value[?name=='vm1']"), [])
+        self.assertEqual(_predicates("[0]"), [])
+
+    def test_selected_fields(self):
+        def _fields(query):
+            return get_selected_fields(jmespath.compile(query).parsed)
+
+        self.assertEqual(_fields("[?tags.env=='test'].{name:name, size:hardwareProfile.vmSize}"),
+                         {'tags', 'name', 'hardwareProfile'})
+        self.assertEqual(_fields("[].[id, sort_by(nodes, &name)[0]]"), {'id', 'nodes'})
+        self.assertIsNone(_fields("[?state=='active']"))
+        self.assertIsNone(_fields("[].{id:id, all:@}"))
+        self.assertIsNone(_fields("[].id | [0]"))
+        self.assertIsNone(_fields("length(@)"))
+
+    def test_apply_to_arguments(self):
+        pushdown = QueryPushdown({'name': ('name', EQ),
+                                  'displayName': ('display_name', STARTS_WITH)},
+                                 unless_args=['tag'])
+        args = argparse.Namespace(name=None, display_name=None, tag=None)
+        pushdown.apply(jmespath.compile("[?name=='a' && displayName=='b'].id"), args)
+        self.assertEqual((args.name, args.display_name), ('a', 'b'))
+
+        # a prefix is not passed to an argument selecting equal values, nor any given argument
+        args = argparse.Namespace(name=None, display_name='given', tag=None)
+        pushdown.apply(jmespath.compile("[?starts_with(name, 'a') && displayName=='b']"), args)
+        self.assertEqual((args.name, args.display_name), (None, 'given'))
+
+        args = argparse.Namespace(name=None, display_name=None, tag='env=test')
+        pushdown.apply(jmespath.compile("[?name=='a']"), args)
+        self.assertIsNone(args.name)
+
+    def test_apply_to_arguments_accepting_the_value(self):
+        pushdown = QueryPushdown({'name': ('name', EQ, is_unquoted),
+                                  'type': ('resource_type', EQ, lambda value: '/' in value)})
+        args = argparse.Namespace(name=None, resource_type=None)
+        pushdown.apply(jmespath.compile("[?name=='it\\'s' && type=='vm']"), args)
+        self.assertEqual((args.name, args.resource_type), (None, None))
+
+        pushdown.apply(jmespath.compile("[?name=='a' && type=='Microsoft.Compute/vm']"), args)
+        self.assertEqual((args.name, args.resource_type), ('a', 'Microsoft.Compute/vm'))
+
+    def test_apply_to_odata_filter_and_select(self):
+        pushdown = QueryPushdown(filter_arg='filter', filter_fields=['id', 'state'],
+                                 select_arg='select')
+        args = argparse.Namespace(filter=None, select=None)
+        query = "[?starts_with(id, 'pool') && state=='active' && vmSize=='small'].{id:id, size:vmSize}"
+        pushdown.apply(jmespath.compile(query), args)
+        self.assertEqual(args.filter, "startswith(id, 'pool') and state eq 'active'")
+        self.assertEqual(args.select, 'id,state,vmSize')
+
+        args = argparse.Namespace(filter="state eq 'deleting'", select=None)
+        pushdown.apply(jmespath.compile("[?id=='pool1'].id"), args)
+        self.assertEqual(args.filter, "state eq 'deleting'")
+        self.assertEqual(args.select, 'id')
+
+        args = argparse.Namespace(filter=None, select=None)
+        pushdown.apply(jmespath.compile("[?id=='it\\'s']"), args)
+        self.assertEqual(args.filter, "id eq 'it''s'")
+        self.assertIsNone(args.select)
+
+    def test_apply_to_odata_select_of_model(self):
+        pushdown = QueryPushdown(select_arg='select', select_model=__name__ + '#_Pool')
+        args = argparse.Namespace(select=None)
+        pushdown.apply(jmespath.compile("[].{id:id, size:vmSize, tag:eTag, other:resourceGroup}"), args)
+        self.assertEqual(args.select, 'eTag,id,vmSize')
+
+        args = argparse.Namespace(select=None)
+        pushdown.apply(jmespath.compile("[].resourceGroup"), args)
+        self.assertIsNone(args.select)
+
+
+if __name__ == '__main__':
+    unittest.main()
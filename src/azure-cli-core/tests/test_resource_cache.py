@@ -0,0 +1,116 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._resource_cache import (ResourceIdCache, find_resource_ids,
+                                            call_with_resource_ids)
+from azure.cli.core._session import Session
+
+_TYPE = 'Microsoft.Storage/storageAccounts'
+
+
+def _id(group, name, subscription='sub'):
+    return '/subscriptions/{}/resourceGroups/{}/providers/{}/{}'.format(subscription, group,
+                                                                        _TYPE, name)
+
+
+class _Resource(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, resource_id):
+        self.id = resource_id
+
+
+class _NotFound(Exception):
+    status_code = 404
+
+    def __init__(self, code=None, message=None):
+        super(_NotFound, self).__init__(message)
+        self.response = mock.MagicMock(status_code=404)
+        self.response.json.return_value = {'error': {'code': code, 'message': message}}
+
+
+class TestResourceIdCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'resourceCache.json')
+        self.now = 1000.0
+        self.cache = self._load()
+        patcher = mock.patch('azure.cli.core._resource_cache._resource_id_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_resources = mock.MagicMock(return_value=[
+            _Resource(_id('rg1', 'account1')), _Resource(_id('rg2', 'account2')),
+            _Resource(_id('rg3', 'dup')), _Resource(_id('rg4', 'dup'))])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _load(self):
+        session = Session()
+        session.load(self.filename)
+        return ResourceIdCache(session, ttl=60, clock=lambda: self.now)
+
+    def test_listing_is_cached_and_persisted(self):
+        self.assertEqual(find_resource_ids('sub', _TYPE, 'Account2', self.list_resources),
+                         [_id('rg2', 'account2')])
+        self.assertEqual(find_resource_ids('sub', _TYPE, 'account1', self.list_resources),
+                         [_id('rg1', 'account1')])
+        self.assertEqual(self.list_resources.call_count, 1)
+        self.assertEqual(self._load().get('SUB', _TYPE.lower(), 'account1'), _id('rg1', 'account1'))
+        self.assertIsNone(self.cache.get('other', _TYPE, 'account1'))
+
+    def test_entries_expire(self):
+        find_resource_ids('sub', _TYPE, 'account1', self.list_resources)
+        self.now += 61
+        find_resource_ids('sub', _TYPE, 'account1', self.list_resources)
+        self.assertEqual(self.list_resources.call_count, 2)
+
+    def test_ambiguous_names_are_not_cached(self):
+        for _ in range(2):
+            self.assertEqual(len(find_resource_ids('sub', _TYPE, 'dup', self.list_resources)), 2)
+        self.assertEqual(self.list_resources.call_count, 2)
+
+    def test_not_found_lists_again(self):
+        self.cache.add([_id('old', 'account1')])
+        operation = mock.MagicMock(side_effect=[_NotFound(), 'properties'])
+        self.assertEqual(call_with_resource_ids('sub', _TYPE, 'account1', self.list_resources,
+                                                operation), 'properties')
+        self.assertEqual([c[0][0] for c in operation.call_args_list],
+                         [[_id('old', 'account1')], [_id('rg1', 'account1')]])
+        self.assertEqual(self.cache.get('sub', _TYPE, 'account1'), _id('rg1', 'account1'))
+
+    def test_not_found_child_is_raised(self):
+        self.cache.add([_id('old', 'account1')])
+        moved = _NotFound('ResourceNotFound', "The Resource '{}/account1' under resource group "
+                                              "'old' was not found.".format(_TYPE))
+        operation = mock.MagicMock(side_effect=[moved, 'container'])
+        self.assertEqual(call_with_resource_ids('sub', _TYPE, 'account1', self.list_resources,
+                                                operation, child_operation=True), 'container')
+        self.assertEqual(self.list_resources.call_count, 1)
+
+        missing_child = _NotFound('NotFound', "The container 'c' of 'account1' was not found.")
+        operation = mock.MagicMock(side_effect=missing_child)
+        with self.assertRaises(_NotFound):
+            call_with_resource_ids('sub', _TYPE, 'account1', self.list_resources, operation,
+                                   child_operation=True)
+        self.assertEqual(operation.call_count, 1)
+        self.assertEqual(self.list_resources.call_count, 1)
+
+    def test_other_errors_are_raised(self):
+        self.cache.add([_id('rg1', 'account1')])
+        operation = mock.MagicMock(side_effect=ValueError())
+        with self.assertRaises(ValueError):
+            call_with_resource_ids('sub', _TYPE, 'account1', self.list_resources, operation)
+        self.list_resources.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
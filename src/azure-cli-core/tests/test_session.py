@@ -0,0 +1,123 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import codecs
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'azureProfile.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _read_file(self):
+        with codecs.open(self.filename, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    def test_load_creates_file(self):
+        session = Session()
+        session.load(self.filename)
+        self.assertEqual(self._read_file(), {})
+
+    def test_set_item_saves(self):
+        session = Session()
+        session.load(self.filename)
+        session['key'] = 'value'
+        self.assertEqual(self._read_file(), {'key': 'value'})
+        self.assertFalse([f for f in os.listdir(self.folder) if f.endswith('.tmp')])
+
+    def test_transaction_coalesces_writes(self):
+        session = Session()
+        session.load(self.filename)
+        with mock.patch.object(session, '_write', wraps=session._write) as write:
+            with session.transaction():
+                session['a'] = 1
+                session['b'] = 2
+                del session['a']
+            self.assertEqual(write.call_count, 1)
+            session.update({'c': 3, 'd': 4})
+            self.assertEqual(write.call_count, 2)
+        self.assertEqual(self._read_file(), {'b': 2, 'c': 3, 'd': 4})
+
+    def test_failed_transaction_not_saved(self):
+        session = Session()
+        session.load(self.filename)
+        with mock.patch.object(session, '_write', wraps=session._write) as write:
+            with self.assertRaises(ValueError):
+                with session.transaction():
+                    session['a'] = 1
+                    raise ValueError()
+            with session.transaction():
+                pass
+            self.assertEqual(write.call_count, 0)
+        self.assertEqual(self._read_file(), {})
+
+    def test_concurrent_sessions_merge(self):
+        first = Session()
+        first.load(self.filename)
+        second = Session()
+        second.load(self.filename)
+
+        first['subscriptions'] = ['sub1']
+        second['installationId'] = 'id'
+        self.assertEqual(self._read_file(), {'subscriptions': ['sub1'], 'installationId': 'id'})
+
+        # indirect modification followed by an explicit save
+        first['subscriptions'].append('sub2')
+        first.save()
+        self.assertEqual(self._read_file(), {'subscriptions': ['sub1', 'sub2'],
+                                             'installationId': 'id'})
+        self.assertEqual(first.data, self._read_file())
+
+        del second['installationId']
+        self.assertEqual(self._read_file(), {'subscriptions': ['sub1', 'sub2']})
+
+    def test_parallel_writers_dont_lose_updates(self):
+        Session().load(self.filename)
+
+        def _writer(index):
+            session = Session()
+            session.load(self.filename)
+            for i in range(10):
+                session['writer{}'.format(index)] = i
+
+        threads = [threading.Thread(target=_writer, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self._read_file(), {'writer{}'.format(i): 9 for i in range(8)})
+
+    def test_max_age_uses_wall_clock(self):
+        session = Session()
+        session.load(self.filename)
+        session['key'] = 'value'
+
+        stale = time.time() - 7200
+        os.utime(self.filename, (stale, stale))
+        session.load(self.filename, max_age=3600)
+        self.assertEqual(session.data, {})
+
+        session['key'] = 'value'
+        session.load(self.filename, max_age=3600)
+        self.assertEqual(session.data, {'key': 'value'})
+
+
+if __name__ == '__main__':
+    unittest.main()
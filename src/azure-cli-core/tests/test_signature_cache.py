@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core.commands._signature_cache import SignatureCache, _get_qualified_name
+
+
+def sample_operation(name, count=1):
+    '''Sample operation.
+    :param str name: The name.
+    '''
+    return name, count
+
+
+class TestSignatureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.extracted = []
+
+    def _extract(self, value):
+        def _extract():
+            self.extracted.append(value)
+            return value
+        return _extract
+
+    def test_values_persisted_by_module(self):
+        cache = SignatureCache(self.folder)
+        with cache.transaction():
+            self.assertEqual(cache.get(sample_operation, 'args', self._extract([['name', {}]])),
+                             [['name', {}]])
+            self.assertEqual(cache.get(sample_operation, 'summary', self._extract('summary')),
+                             'summary')
+        self.assertTrue(os.path.exists(os.path.join(self.folder, __name__ + '.json')))
+
+        cache = SignatureCache(self.folder)
+        self.assertEqual(cache.get(sample_operation, 'args', self._extract(None)), [['name', {}]])
+        self.assertEqual(self.extracted, [[['name', {}]], 'summary'])
+
+    def test_values_discarded_when_version_changes(self):
+        SignatureCache(self.folder).get(sample_operation, 'summary', self._extract('old'))
+        with mock.patch('azure.cli.core.commands._signature_cache._get_module_version',
+                        return_value='2.0.0 0 0'):
+            cache = SignatureCache(self.folder)
+            self.assertEqual(cache.get(sample_operation, 'summary', self._extract('new')), 'new')
+        self.assertEqual(self.extracted, ['old', 'new'])
+
+    def test_values_not_cached(self):
+        cache = SignatureCache(self.folder)
+        # values which would not be read back equal from JSON, and functions without a name
+        cache.get(sample_operation, 'args', self._extract([('name', {})]))
+        cache.get(sample_operation, 'args', self._extract([['name', {}]]))
+        for operation in [lambda name: name] * 2:
+            cache.get(operation, 'args', self._extract('lambda'))
+        self.assertEqual(self.extracted, [[('name', {})], [['name', {}]], 'lambda', 'lambda'])
+
+    def test_values_saved_at_exit_outside_transaction(self):
+        cache = SignatureCache(self.folder)
+        with mock.patch('atexit.register') as register:
+            cache.get(sample_operation, 'args', self._extract([['name', {}]]))
+            cache.get(sample_operation, 'summary', self._extract('summary'))
+        register.assert_called_once_with(cache.flush)
+        self.assertEqual(SignatureCache(self.folder).get(sample_operation, 'summary',
+                                                         self._extract('not saved')), 'not saved')
+
+        cache.flush()
+        self.assertEqual(SignatureCache(self.folder).get(sample_operation, 'summary',
+                                                         self._extract(None)), 'summary')
+
+    def test_qualified_names_without_qualname(self):
+        # a function of Python 2 is found in its module, a nested one is not cached
+        function = mock.NonCallableMock(spec=['__module__', '__name__'])
+        function.__module__ = __name__
+        function.__name__ = 'sample_operation'
+        with mock.patch('{}.sample_operation'.format(__name__), function):
+            self.assertEqual(_get_qualified_name(function), 'sample_operation')
+        self.assertIsNone(_get_qualified_name(function))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+import azure.cli.core.telemetry_upload as telemetry_upload
+from azure.cli.core._session import FileLock
+
+
+def _payload(name):
+    return json.dumps([{'name': name, 'properties': {'Reserved.DataModel.Severity': 0}}])
+
+
+class TestTelemetrySpool(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.spool_file = os.path.join(self.folder, 'telemetry', 'spool')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_spool_is_bounded(self):
+        max_size = 2 * len(_payload('az/commands/vm-list') + '\n')
+        self.assertEqual(telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file,
+                                                max_size=max_size), 1)
+        self.assertEqual(telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file,
+                                                max_size=max_size), 2)
+        self.assertEqual(telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file,
+                                                max_size=max_size), 2)
+
+    def test_upload_due_after_interval_or_threshold(self):
+        telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file)
+        # the first command starts an uploader, the following ones wait for the interval
+        self.assertTrue(telemetry_upload.is_upload_due(self.spool_file, 1, interval=600))
+        self.assertFalse(telemetry_upload.is_upload_due(self.spool_file, 2, interval=600))
+        self.assertTrue(telemetry_upload.is_upload_due(self.spool_file, 100, interval=600,
+                                                       threshold=100))
+
+        stale = time.time() - 601
+        os.utime(self.spool_file + '.uploaded', (stale, stale))
+        self.assertTrue(telemetry_upload.is_upload_due(self.spool_file, 1, interval=600))
+        self.assertFalse(telemetry_upload.is_upload_due(self.spool_file, 1, interval=600))
+
+    @mock.patch('azure.cli.core.telemetry_upload.upload', return_value=True)
+    def test_drain_uploads_all_payloads(self, mock_upload):
+        telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file)
+        telemetry_upload.spool(_payload('az/commands/vm-show'), self.spool_file)
+        telemetry_upload.drain(self.spool_file, batch_size=10)
+
+        events, = mock_upload.call_args[0]
+        self.assertEqual([e['name'] for e in events], ['az/commands/vm-list', 'az/commands/vm-show'])
+        self.assertEqual(mock_upload.call_args[1], {'batch_size': 10})
+        self.assertFalse(os.path.exists(self.spool_file))
+        self.assertFalse(os.path.exists(self.spool_file + '.uploading'))
+
+    @mock.patch('azure.cli.core.telemetry_upload.upload', return_value=None)
+    def test_drain_keeps_payloads_when_upload_fails(self, mock_upload):
+        telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file)
+        telemetry_upload.drain(self.spool_file)
+        # payloads spooled meanwhile are left for the next uploader
+        telemetry_upload.spool(_payload('az/commands/vm-show'), self.spool_file)
+
+        mock_upload.return_value = True
+        telemetry_upload.drain(self.spool_file)
+        events, = mock_upload.call_args[0]
+        self.assertEqual([e['name'] for e in events], ['az/commands/vm-list'])
+        self.assertEqual(telemetry_upload.spool(_payload('az/commands/vm-create'),
+                                                self.spool_file), 2)
+
+    @mock.patch('azure.cli.core.telemetry_upload.upload', return_value=True)
+    def test_drain_runs_one_uploader(self, mock_upload):
+        telemetry_upload.spool(_payload('az/commands/vm-list'), self.spool_file)
+        with FileLock(self.spool_file + '.upload.lock'):
+            telemetry_upload.drain(self.spool_file)
+        self.assertFalse(mock_upload.called)
+        self.assertTrue(os.path.exists(self.spool_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
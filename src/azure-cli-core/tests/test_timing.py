@@ -0,0 +1,81 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import json
+import unittest
+
+import mock
+import requests
+from six import StringIO
+
+from azure.cli.core.commands._polling import poll_until, PollingBackoff
+from azure.cli.core.extensions.timing import CommandTiming, COMMAND_TIMING, _get_operation
+
+_VM_URL = 'https://management.azure.com/subscriptions/sub/resourceGroups/rg/providers/' \
+          'Microsoft.Compute/virtualMachines/{}?api-version=2016-04-30-preview'
+
+
+def _response(url, status_code=200, content=b'{}', retried_statuses=()):
+    response = requests.Response()
+    response.request = requests.Request('GET', url).prepare()
+    response.status_code = status_code
+    response._content = content  # pylint: disable=protected-access
+    response.elapsed = datetime.timedelta(milliseconds=100)
+    response.raw = mock.MagicMock()
+    response.raw.retries.history = [mock.MagicMock(status=s) for s in retried_statuses]
+    return response
+
+
+class TestCommandTiming(unittest.TestCase):
+
+    def test_operations(self):
+        self.assertEqual(_get_operation('GET', _VM_URL.format('vm1')),
+                         ('management.azure.com', 'GET Microsoft.Compute/virtualMachines'))
+        self.assertEqual(
+            _get_operation('POST', _VM_URL.format('vm1/extensions/ext1/start')),
+            ('management.azure.com', 'POST Microsoft.Compute/virtualMachines/extensions/start'))
+        self.assertEqual(
+            _get_operation('GET', 'https://management.azure.com/subscriptions/sub/resourcegroups'),
+            ('management.azure.com', 'GET subscriptions/resourcegroups'))
+
+    def test_requests_are_grouped_by_operation(self):
+        timing = CommandTiming()
+        timing.add_request(_response(_VM_URL.format('vm1')))
+        self.assertEqual(timing.requests, {})
+
+        timing.enabled = True
+        timing.add_request(_response(_VM_URL.format('vm1'), content=b'0123456789'))
+        timing.add_request(_response(_VM_URL.format('vm2'), retried_statuses=[429, 503]))
+        timing.add_request(_response('https://login.microsoftonline.com/tenant/oauth2/token'),
+                           stream=True)
+        output = StringIO()
+        timing.report(output)
+        summary = json.loads(output.getvalue())
+        self.assertEqual(summary['requests']['count'], 3)
+        vm_requests = summary['requests']['byOperation'][0]
+        self.assertEqual(vm_requests['operation'], 'GET Microsoft.Compute/virtualMachines')
+        self.assertEqual((vm_requests['count'], vm_requests['retries'], vm_requests['bytes']),
+                         (2, 2, 12))
+        self.assertEqual(vm_requests['statuses'], {'200': 2, '429': 1, '503': 1})
+        self.assertEqual(vm_requests['seconds'], 0.2)
+        self.assertEqual(summary['requests']['byOperation'][1]['host'], 'login.microsoftonline.com')
+
+    def test_phases_and_polling_sleeps(self):
+        self.addCleanup(COMMAND_TIMING.start)
+        COMMAND_TIMING.start()
+        COMMAND_TIMING.enabled = True
+        COMMAND_TIMING.lap('load')
+        results = iter([False, False, True])
+        poll_until(lambda: next(results), backoff=PollingBackoff.fixed(0.01))
+        COMMAND_TIMING.lap('execute')
+        summary = COMMAND_TIMING.get_summary()
+        self.assertEqual(list(summary['phases']), ['load', 'execute'])
+        self.assertEqual(summary['pollingSleeps']['count'], 2)
+        self.assertGreaterEqual(summary['phases']['execute'], summary['pollingSleeps']['seconds'])
+
+
+if __name__ == '__main__':
+    unittest.main()
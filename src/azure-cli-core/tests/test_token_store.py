@@ -0,0 +1,129 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from azure.cli.core._token_store import IndexedTokenCache, TokenStore, ADD, REMOVE
+
+
+def _token(user, resource='https://management.core.windows.net/', client='04b07795'):
+    return {
+        'tokenType': 'Bearer',
+        'expiresOn': '2017-04-01 12:00:00.000000',
+        'resource': resource,
+        'accessToken': 'token for ' + user,
+        'refreshToken': 'refresh token',
+        'userId': user,
+        'isMRRT': True,
+        '_clientId': client,
+        '_authority': 'https://login.microsoftonline.com/common'
+    }
+
+
+_SP = {'servicePrincipalId': 'sp1', 'servicePrincipalTenant': 'tenant1', 'accessToken': 'secret'}
+
+
+class TestIndexedTokenCache(unittest.TestCase):
+
+    def test_find_uses_index(self):
+        cache = IndexedTokenCache(json.dumps([_token('user{}@foo.com'.format(i))
+                                              for i in range(100)]))
+        found = cache.find({'userId': 'USER42@foo.com', '_clientId': '04b07795'})
+        self.assertEqual([e['accessToken'] for e in found], ['token for user42@foo.com'])
+        self.assertEqual(cache.find({'userId': 'nobody@foo.com', '_clientId': '04b07795'}), [])
+        self.assertEqual(len(cache.find({'_clientId': '04b07795'})), 100)
+
+    def test_tracks_changes(self):
+        cache = IndexedTokenCache(json.dumps([_token('a@foo.com')]))
+        self.assertEqual(cache.pending_changes, [])
+
+        new_token = _token('b@foo.com')
+        cache.add([new_token])
+        cache.remove([_token('a@foo.com'), _token('missing@foo.com')])
+        self.assertEqual(cache.pending_changes, [(ADD, new_token), (REMOVE, _token('a@foo.com'))])
+        self.assertEqual(cache.find({'userId': 'a@foo.com', '_clientId': '04b07795'}), [])
+        self.assertEqual(len(cache.find({'userId': 'b@foo.com', '_clientId': '04b07795'})), 1)
+
+
+class TestTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'accessTokens.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _read_file(self):
+        with open(self.filename) as f:
+            return json.load(f)
+
+    def test_load_replays_journal(self):
+        with open(self.filename, 'w') as f:
+            json.dump([_token('a@foo.com'), _SP], f)
+        store = TokenStore(self.filename)
+
+        refreshed = dict(_token('a@foo.com'), accessToken='refreshed')
+        store.append([(ADD, refreshed), (ADD, _token('b@foo.com')), (REMOVE, _SP)])
+        # the file shared with other tools is left untouched until compaction
+        self.assertEqual(self._read_file(), [_token('a@foo.com'), _SP])
+        self.assertEqual(store.load(), [refreshed, _token('b@foo.com')])
+
+    def test_load_skips_torn_record(self):
+        store = TokenStore(self.filename)
+        store.append([(ADD, _token('a@foo.com'))])
+        with open(store.journal_filename, 'a') as f:
+            f.write('{"op": "add", "entry": {"userId"')
+        self.assertEqual(store.load(), [_token('a@foo.com')])
+
+    def test_compacts_at_threshold(self):
+        store = TokenStore(self.filename, compaction_threshold=3)
+        store.append([(ADD, _token('a@foo.com')), (ADD, _token('b@foo.com'))])
+        self.assertFalse(os.path.exists(self.filename))
+
+        store.append([(ADD, _token('c@foo.com'))])
+        self.assertFalse(os.path.exists(store.journal_filename))
+        self.assertEqual([e['userId'] for e in self._read_file()],
+                         ['a@foo.com', 'b@foo.com', 'c@foo.com'])
+
+    def test_removal_compacts(self):
+        store = TokenStore(self.filename)
+        store.append([(ADD, _token('a@foo.com')), (ADD, _SP)])
+        store.append([(REMOVE, _SP)], compact=True)
+        # a removed secret doesn't linger in the journal
+        self.assertFalse(os.path.exists(store.journal_filename))
+        self.assertEqual(self._read_file(), [_token('a@foo.com')])
+
+    def test_clear(self):
+        store = TokenStore(self.filename, compaction_threshold=2)
+        store.append([(ADD, _token('a@foo.com')), (ADD, _token('b@foo.com'))])
+        store.append([(ADD, _token('c@foo.com'))])
+        store.clear()
+        self.assertEqual(store.load(), [])
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_parallel_appends_dont_lose_updates(self):
+        store = TokenStore(self.filename, compaction_threshold=7)
+
+        def _writer(index):
+            for i in range(10):
+                TokenStore(self.filename, compaction_threshold=7).append(
+                    [(ADD, _token('user{}-{}@foo.com'.format(index, i)))])
+
+        threads = [threading.Thread(target=_writer, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(store.load()), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -59,6 +59,9 @@ def patch_long_run_operation_delay(unit_test):
     _mock_in_unit_test(unit_test,
                        'azure.cli.core.commands.LongRunningOperation._delay',
                        _shortcut_long_run_operation)
+    _mock_in_unit_test(unit_test,
+                       'azure.cli.core.commands._polling.PollingBackoff.next_delay',
+                       lambda *args, **kwargs: 0)
 
 
 def _mock_in_unit_test(unit_test, target, replacement):
@@ -3,11 +3,19 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import time
+ENTERED_AT = time.time()
+
+# pylint: disable=wrong-import-position
 import sys
 import os
 
-import azure.cli.main
-import azure.cli.core.telemetry as telemetry
+from azure.cli.core.profiling import STARTUP_PROFILER, measure
+
+STARTUP_PROFILER.start(sys.argv[1:], ENTERED_AT)
+with measure('phase', 'core imports'):
+    import azure.cli.main
+    import azure.cli.core.telemetry as telemetry
 
 try:
     telemetry.start()
@@ -31,4 +39,5 @@ except KeyboardInterrupt:
     telemetry.set_user_fault('keyboard interrupt')
     sys.exit(1)
 finally:
+    STARTUP_PROFILER.report()
     telemetry.conclude()
@@ -11,6 +11,8 @@ import azure.cli.core.azlogging as azlogging
 from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
 from azure.cli.core.util import (show_version_info_exit, handle_exception)
 from azure.cli.core._environment import get_config_dir
+from azure.cli.core.profiling import measure
+from azure.cli.core.extensions.timing import COMMAND_TIMING
 import azure.cli.core.telemetry as telemetry
 
 logger = azlogging.get_az_logger(__name__)
@@ -26,15 +28,18 @@ def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
     azure_folder = get_config_dir()
     if not os.path.exists(azure_folder):
         os.makedirs(azure_folder)
-    ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
-    CONFIG.load(os.path.join(azure_folder, 'az.json'))
-    SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+    with measure('phase', 'session load'):
+        ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
+        CONFIG.load(os.path.join(azure_folder, 'az.json'))
+        SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
 
     config = Configuration(args)
     APPLICATION.initialize(config)
 
+    COMMAND_TIMING.start()
     try:
         cmd_result = APPLICATION.execute(args)
+        COMMAND_TIMING.lap('transform')
 
         # Commands can return a dictionary/list of results
         # If they do, we print the results.
@@ -42,6 +47,7 @@ def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
             from azure.cli.core._output import OutputProducer
             formatter = OutputProducer.get_formatter(APPLICATION.configuration.output_format)
             OutputProducer(formatter=formatter, file=file).out(cmd_result)
+            COMMAND_TIMING.lap('output')
 
     except Exception as ex:  # pylint: disable=broad-except
 
@@ -52,3 +58,6 @@ def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
 
         error_code = handle_exception(ex)
         return error_code
+
+    finally:
+        COMMAND_TIMING.report()
@@ -120,9 +120,13 @@ helps['acr repository list'] = """
 
 helps['acr repository show-tags'] = """
     type: command
-    short-summary: Shows tags of a given repository in the specified container registry.
+    short-summary: Shows tags of the given repositories in the specified container registry.
+    long-summary: When several repositories or --all are given, the tags of the repositories are obtained concurrently and listed by repository.
     examples:
         - name: Show tags of a given repository in a given container registry. Enter login credentials in the prompt if admin user is disabled.
           text:
             az acr repository show-tags -n MyRegistry --repository MyRepository
+        - name: Show tags of all the repositories in a given container registry.
+          text:
+            az acr repository show-tags -n MyRegistry --all
 """
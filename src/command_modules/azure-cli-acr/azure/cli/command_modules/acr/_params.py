@@ -33,6 +33,8 @@ register_cli_argument('acr update', 'admin_enabled', nargs=1, help='Indicates wh
 
 register_cli_argument('acr', 'username', options_list=('--username', '-u'), help='The username used to log into a container registry')
 register_cli_argument('acr', 'password', options_list=('--password', '-p'), help='The password used to log into a container registry')
+register_cli_argument('acr repository show-tags', 'repository', nargs='+', help='Space separated names of the repositories to show the tags of')
+register_cli_argument('acr repository show-tags', 'all_repositories', options_list=('--all',), action='store_true', help='Show the tags of all the repositories in the registry')
 
 register_cli_argument('acr create', 'registry_name', completer=None, validator=validate_registry_name)
 register_cli_argument('acr create', 'deployment_name', deployment_name_type, validator=None)
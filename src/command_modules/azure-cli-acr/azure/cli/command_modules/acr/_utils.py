@@ -4,6 +4,8 @@
 # --------------------------------------------------------------------------------------------
 
 from azure.cli.core.util import CLIError
+from azure.cli.core._resource_cache import call_with_resource_ids
+from azure.cli.core.commands.client_factory import get_subscription_id
 from azure.cli.core.commands.parameters import get_resources_in_subscription
 
 from ._constants import (
@@ -18,24 +20,28 @@ from ._factory import (
     get_acr_api_version
 )
 
-def _arm_get_resource_by_name(resource_name, resource_type):
-    '''Returns the ARM resource in the current subscription with resource_name.
+def _call_with_resource_group(resource_name, resource_type, operation):
+    '''Returns the result of operation called with the resource group of the ARM resource in the
+    current subscription with resource_name. The resource group is remembered across commands and
+    located again when the operation does not find the resource in it anymore.
     :param str resource_name: The name of resource
     :param str resource_type: The type of resource
+    :param func operation: The operation taking the name of resource group
     '''
-    result = get_resources_in_subscription(resource_type)
-    elements = [item for item in result if item.name.lower() == resource_name.lower()]
-
-    if len(elements) == 0:
-        raise CLIError(
-            'No resource with type {} can be found with name: {}'.format(
-                resource_type, resource_name))
-    elif len(elements) == 1:
-        return elements[0]
-    else:
-        raise CLIError(
-            'More than one resources with type {} are found with name: {}'.format(
-                resource_type, resource_name))
+    def _call(resource_ids):
+        if len(resource_ids) == 0:
+            raise CLIError(
+                'No resource with type {} can be found with name: {}'.format(
+                    resource_type, resource_name))
+        elif len(resource_ids) > 1:
+            raise CLIError(
+                'More than one resources with type {} are found with name: {}'.format(
+                    resource_type, resource_name))
+        return operation(get_resource_group_name_by_resource_id(resource_ids[0]))
+
+    return call_with_resource_ids(get_subscription_id(), resource_type, resource_name,
+                                  lambda: get_resources_in_subscription(resource_type), _call,
+                                  child_operation=True)
 
 def get_resource_group_name_by_resource_id(resource_id):
     '''Returns the resource group name from parsing the resource id.
@@ -50,39 +56,49 @@ def get_resource_group_name_by_registry_name(registry_name):
     '''Returns the resource group name for the container registry.
     :param str registry_name: The name of container registry
     '''
-    arm_resource = _arm_get_resource_by_name(registry_name, ACR_RESOURCE_TYPE)
-    return get_resource_group_name_by_resource_id(arm_resource.id)
+    return _call_with_resource_group(registry_name, ACR_RESOURCE_TYPE, lambda group: group)
 
 def get_resource_group_name_by_storage_account_name(storage_account_name):
     '''Returns the resource group name for the storage account.
     :param str storage_account_name: The name of storage account
     '''
-    arm_resource = _arm_get_resource_by_name(storage_account_name, STORAGE_RESOURCE_TYPE)
-    return get_resource_group_name_by_resource_id(arm_resource.id)
+    return _call_with_resource_group(storage_account_name, STORAGE_RESOURCE_TYPE,
+                                     lambda group: group)
+
+def call_with_registry_resource_group(registry_name, resource_group_name, operation):
+    '''Returns the result of operation called with the resource group of the container registry.
+    :param str registry_name: The name of container registry
+    :param str resource_group_name: The name of resource group, located when None
+    :param func operation: The operation taking the name of resource group
+    '''
+    if resource_group_name is None:
+        return _call_with_resource_group(registry_name, ACR_RESOURCE_TYPE, operation)
+    return operation(resource_group_name)
 
 def get_registry_by_name(registry_name, resource_group_name=None):
     '''Returns a tuple of Registry object and resource group name.
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     '''
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_registry_name(registry_name)
-
     client = get_acr_service_client().registries
 
-    return client.get(resource_group_name, registry_name), resource_group_name
+    return call_with_registry_resource_group(
+        registry_name, resource_group_name,
+        lambda group: (client.get(group, registry_name), group))
 
 def get_access_key_by_storage_account_name(storage_account_name, resource_group_name=None):
     '''Returns access key for the storage account.
     :param str storage_account_name: The name of storage account
     :param str resource_group_name: The name of resource group
     '''
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_storage_account_name(storage_account_name)
-
     client = get_storage_service_client().storage_accounts
 
-    return client.list_keys(resource_group_name, storage_account_name).keys[0].value #pylint: disable=no-member
+    def _list_keys(group):
+        return client.list_keys(group, storage_account_name).keys[0].value #pylint: disable=no-member
+
+    if resource_group_name is None:
+        return _call_with_resource_group(storage_account_name, STORAGE_RESOURCE_TYPE, _list_keys)
+    return _list_keys(resource_group_name)
 
 def arm_deploy_template_new_storage(resource_group_name, #pylint: disable=too-many-arguments
                                     registry_name,
@@ -12,7 +12,7 @@ from azure.mgmt.containerregistry.models import (
 
 from ._factory import get_acr_service_client
 from ._utils import (
-    get_resource_group_name_by_registry_name,
+    call_with_registry_resource_group,
     get_access_key_by_storage_account_name,
     arm_deploy_template_new_storage,
     arm_deploy_template_existing_storage,
@@ -104,32 +104,33 @@ def acr_delete(registry_name, resource_group_name=None):
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     '''
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_registry_name(registry_name)
-
     client = get_acr_service_client().registries
 
-    return client.delete(resource_group_name, registry_name)
+    def _delete(group):
+        if resource_group_name is None:
+            # deleting a missing registry succeeds, so a registry no longer in the resource group
+            # located for it is found again before deleting
+            client.get(group, registry_name)
+        return client.delete(group, registry_name)
+
+    return call_with_registry_resource_group(registry_name, resource_group_name, _delete)
 
 def acr_show(registry_name, resource_group_name=None):
     '''Gets the properties of the specified container registry.
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     '''
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_registry_name(registry_name)
-
     client = get_acr_service_client().registries
 
-    return client.get(resource_group_name, registry_name)
+    return call_with_registry_resource_group(
+        registry_name, resource_group_name,
+        lambda group: client.get(group, registry_name))
 
 def acr_update_get(client,
                    registry_name,
                    resource_group_name=None):
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_registry_name(registry_name)
-
-    props = client.get(resource_group_name, registry_name)
+    props = call_with_registry_resource_group(
+        registry_name, resource_group_name, lambda group: client.get(group, registry_name))
 
     return RegistryUpdateParameters(
         tags=props.tags,
@@ -162,7 +163,6 @@ def acr_update_set(client,
                    registry_name,
                    resource_group_name=None,
                    parameters=None):
-    if resource_group_name is None:
-        resource_group_name = get_resource_group_name_by_registry_name(registry_name)
-
-    return client.update(resource_group_name, registry_name, parameters)
+    return call_with_registry_resource_group(
+        registry_name, resource_group_name,
+        lambda group: client.update(group, registry_name, parameters))
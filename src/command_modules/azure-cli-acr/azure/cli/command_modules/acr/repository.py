@@ -4,7 +4,10 @@
 # --------------------------------------------------------------------------------------------
 
 import json
+from functools import partial
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from azure.cli.core.prompting import prompt, prompt_pass, NoTTYException
 from azure.cli.core.util import CLIError
@@ -14,14 +17,31 @@ from ._utils import (
 )
 from .credential import acr_credential_show
 
+# The number of items requested in each page of a registry listing
+REGISTRY_PAGE_SIZE = 1000
+# The maximum number of concurrent requests to a registry
+MAX_CONCURRENT_REQUESTS = 20
+
+_session = None
+
+def _get_session():
+    '''Returns the HTTP session shared by the registry calls, which keeps connections alive.'''
+    global _session #pylint: disable=global-statement
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+        _session.mount('https://', adapter)
+    return _session
+
 def _obtain_data_from_registry(login_server, path, resultIndex, username, password):
     registryEndpoint = 'https://' + login_server
     resultList = []
     executeNextHttpCall = True
+    path += '{}n={}'.format('&' if '?' in path else '?', REGISTRY_PAGE_SIZE)
 
     while executeNextHttpCall:
         executeNextHttpCall = False
-        response = requests.get(
+        response = _get_session().get(
             registryEndpoint + path,
             auth=requests.auth.HTTPBasicAuth(
                 username,
@@ -46,8 +66,11 @@ def _obtain_data_from_registry(login_server, path, resultIndex, username, passwo
 
     return resultList
 
-def _validate_user_credentials(registry_name, path, resultIndex, username=None, password=None):
-    registry, _ = get_registry_by_name(registry_name)
+def _validate_user_credentials(registry_name, resource_group_name, fetch,
+                               username=None, password=None):
+    '''Calls fetch(login_server, username, password) with the given credentials, the admin
+    credentials of the registry or the credentials entered in the prompt.'''
+    registry, resource_group_name = get_registry_by_name(registry_name, resource_group_name)
     login_server = registry.login_server #pylint: disable=no-member
 
     if username:
@@ -56,13 +79,13 @@ def _validate_user_credentials(registry_name, path, resultIndex, username=None,
                 password = prompt_pass(msg='Password: ')
             except NoTTYException:
                 raise CLIError('Please specify both username and password in non-interactive mode.')
-        return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+        return fetch(login_server, username, password)
 
     try:
-        cred = acr_credential_show(registry_name)
+        cred = acr_credential_show(registry_name, resource_group_name)
         username = cred.username
         password = cred.passwords[0].value
-        return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+        return fetch(login_server, username, password)
     except: #pylint: disable=bare-except
         pass
 
@@ -73,23 +96,59 @@ def _validate_user_credentials(registry_name, path, resultIndex, username=None,
         raise CLIError(
             'Unable to authenticate using admin login credentials or admin is not enabled. ' +
             'Please specify both username and password in non-interactive mode.')
-    return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+    return fetch(login_server, username, password)
+
+def _get_repositories(login_server, username, password):
+    return _obtain_data_from_registry(login_server, '/v2/_catalog', 'repositories',
+                                      username, password)
 
-def acr_repository_list(registry_name, username=None, password=None):
+def _get_tags(repository, login_server, username, password):
+    return _obtain_data_from_registry(login_server, '/v2/' + repository + '/tags/list', 'tags',
+                                      username, password)
+
+def _get_tags_of_repositories(repositories, login_server, username, password):
+    '''Returns the tags of the repositories, fetched concurrently.'''
+    from concurrent.futures import ThreadPoolExecutor
+
+    if repositories is None:
+        repositories = _get_repositories(login_server, username, password)
+    if not repositories:
+        return []
+
+    max_workers = min(MAX_CONCURRENT_REQUESTS, len(repositories))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tags = executor.map(lambda repository: _get_tags(repository, login_server,
+                                                         username, password),
+                            repositories)
+        return [{'repository': repository, 'tags': repository_tags}
+                for repository, repository_tags in zip(repositories, tags)]
+
+def acr_repository_list(registry_name, resource_group_name=None, username=None, password=None):
     '''Lists repositories in the specified container registry.
     :param str registry_name: The name of container registry
+    :param str resource_group_name: The name of resource group
     :param str username: The username used to log into the container registry
     :param str password: The password used to log into the container registry
     '''
-    path = '/v2/_catalog'
-    return _validate_user_credentials(registry_name, path, 'repositories', username, password)
+    return _validate_user_credentials(registry_name, resource_group_name, _get_repositories,
+                                      username, password)
 
-def acr_repository_show_tags(registry_name, repository, username=None, password=None):
-    '''Shows tags of a given repository in the specified container registry.
+def acr_repository_show_tags(registry_name, repository=None, all_repositories=False,
+                             resource_group_name=None, username=None, password=None):
+    '''Shows tags of the given repositories in the specified container registry.
     :param str registry_name: The name of container registry
-    :param str repository: The repository to obtain tags from
+    :param list repository: The repositories to obtain tags from
+    :param bool all_repositories: Obtain the tags of all the repositories in the registry
+    :param str resource_group_name: The name of resource group
     :param str username: The username used to log into the container registry
     :param str password: The password used to log into the container registry
     '''
-    path = '/v2/' + repository + '/tags/list'
-    return _validate_user_credentials(registry_name, path, 'tags', username, password)
+    if bool(repository) == bool(all_repositories):
+        raise CLIError('usage error: --repository NAME [NAME ...] | --all')
+
+    if repository and len(repository) == 1:
+        fetch = partial(_get_tags, repository[0])
+    else:
+        fetch = partial(_get_tags_of_repositories, repository)
+    return _validate_user_credentials(registry_name, resource_group_name, fetch,
+                                      username, password)
@@ -0,0 +1,96 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+
+from azure.cli.core.util import CLIError
+from azure.cli.command_modules.acr.repository import (
+    acr_repository_list, acr_repository_show_tags, REGISTRY_PAGE_SIZE)
+
+_LOGIN_SERVER = 'myregistry.azurecr.io'
+
+
+class _Response(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, body, link=None):
+        self.status_code = 200
+        self.headers = {'link': link} if link else {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class _Registry(object):  # pylint: disable=too-few-public-methods
+    login_server = _LOGIN_SERVER
+    admin_user_enabled = True
+
+
+class _Credentials(object):  # pylint: disable=too-few-public-methods
+    username = 'myregistry'
+    passwords = [mock.MagicMock(value='secret')]
+
+
+_PAGES = {
+    '/v2/_catalog?n={}'.format(REGISTRY_PAGE_SIZE):
+        _Response({'repositories': ['hello', 'world']},
+                  link='</v2/_catalog?last=world&n={}>; rel="next"'.format(REGISTRY_PAGE_SIZE)),
+    '/v2/_catalog?last=world&n={}'.format(REGISTRY_PAGE_SIZE):
+        _Response({'repositories': ['nginx']}),
+    '/v2/hello/tags/list?n={}'.format(REGISTRY_PAGE_SIZE): _Response({'tags': ['v1', 'v2']}),
+    '/v2/world/tags/list?n={}'.format(REGISTRY_PAGE_SIZE): _Response({'tags': ['latest']}),
+    '/v2/nginx/tags/list?n={}'.format(REGISTRY_PAGE_SIZE): _Response({'tags': ['1.11']})
+}
+
+
+def _get(url, auth):
+    assert auth.username == 'myregistry' and auth.password == 'secret'
+    return _PAGES[url[len('https://' + _LOGIN_SERVER):]]
+
+
+@mock.patch('azure.cli.command_modules.acr.repository.acr_credential_show',
+            return_value=_Credentials())
+@mock.patch('azure.cli.command_modules.acr.repository.get_registry_by_name',
+            return_value=(_Registry(), 'myResourceGroup'))
+@mock.patch('azure.cli.command_modules.acr.repository._get_session')
+class TestAcrRepository(unittest.TestCase):
+
+    def test_repository_list_follows_links(self, get_session, get_registry, credential_show):
+        get_session.return_value.get.side_effect = _get
+        self.assertEqual(acr_repository_list('myregistry'), ['hello', 'world', 'nginx'])
+        get_registry.assert_called_once_with('myregistry', None)
+        # the registry is located once
+        credential_show.assert_called_once_with('myregistry', 'myResourceGroup')
+
+    def test_show_tags_of_one_repository(self, get_session, get_registry, _):
+        get_session.return_value.get.side_effect = _get
+        self.assertEqual(acr_repository_show_tags('myregistry', ['hello'],
+                                                  resource_group_name='myResourceGroup'),
+                         ['v1', 'v2'])
+        get_registry.assert_called_once_with('myregistry', 'myResourceGroup')
+
+    def test_show_tags_of_many_repositories(self, get_session, *_):
+        get_session.return_value.get.side_effect = _get
+        self.assertEqual(acr_repository_show_tags('myregistry', ['world', 'hello']), [
+            {'repository': 'world', 'tags': ['latest']},
+            {'repository': 'hello', 'tags': ['v1', 'v2']}])
+
+    def test_show_tags_of_all_repositories(self, get_session, *_):
+        get_session.return_value.get.side_effect = _get
+        self.assertEqual(acr_repository_show_tags('myregistry', all_repositories=True), [
+            {'repository': 'hello', 'tags': ['v1', 'v2']},
+            {'repository': 'world', 'tags': ['latest']},
+            {'repository': 'nginx', 'tags': ['1.11']}])
+
+    def test_show_tags_usage_error(self, *_):
+        with self.assertRaises(CLIError):
+            acr_repository_show_tags('myregistry')
+        with self.assertRaises(CLIError):
+            acr_repository_show_tags('myregistry', ['hello'], all_repositories=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
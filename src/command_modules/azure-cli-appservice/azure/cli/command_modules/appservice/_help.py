@@ -45,6 +45,7 @@ helps['appservice web config appsettings show'] = """
 helps['appservice web config appsettings update'] = """
     type: command
     short-summary: Create or update web app settings.
+    long-summary: When several web apps are given, they are updated concurrently and the outcome of every web app is returned. Web apps whose settings already have the given values are not updated.
     examples:
         - name: Set the default node version for a specified web app.
           text: >
@@ -52,11 +53,17 @@ helps['appservice web config appsettings update'] = """
             -g MyResourceGroup
             -n MyUniqueApp
             --settings WEBSITE_NODE_DEFAULT_VERSION=6.9.1
+        - name: Set the default node version for several web apps at once.
+          text: >
+            az appservice web config appsettings update
+            --ids $(az appservice web list -g MyResourceGroup --query [].id -o tsv)
+            --settings WEBSITE_NODE_DEFAULT_VERSION=6.9.1
 """
 
 helps['appservice web config appsettings delete'] = """
     type: command
     short-summary: Delete web app settings.
+    long-summary: When several web apps are given, they are updated concurrently and the outcome of every web app is returned.
 """
 
 helps['appservice web config container'] = """
@@ -139,6 +146,19 @@ helps['appservice web log config'] = """
     short-summary: Configure web app logs.
 """
 
+helps['appservice web log tail'] = """
+    type: command
+    short-summary: Start live log tracing for one or more web apps.
+    long-summary: The logs of several web apps or slots are streamed together, each line prefixed with its web app and the UTC time it was received.
+    examples:
+        - name: Stream the logs of two web apps to a file.
+          text: >
+            az appservice web log tail -g MyResourceGroup -n MyWebApp1 MyWebApp2 --log-file incident.log
+        - name: Stream the logs of every web app and slot in a resource group.
+          text: >
+            az appservice web log tail --ids $(az resource list -g MyResourceGroup --query "[?type=='Microsoft.Web/sites' || type=='Microsoft.Web/sites/slots'].id" -o tsv)
+"""
+
 helps['appservice web deployment'] = """
     type: group
     short-summary: Manage web application deployments.
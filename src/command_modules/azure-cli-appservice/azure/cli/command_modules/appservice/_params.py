@@ -5,6 +5,7 @@
 
 from argcomplete.completers import FilesCompleter
 
+from azure.cli.core.application import IterateAction
 from azure.cli.core.commands import register_cli_argument
 from azure.cli.core.commands.parameters import (resource_group_name_type, location_type,
                                                 get_resource_name_completion_list, file_type,
@@ -87,12 +88,19 @@ register_cli_argument('appservice web log config', 'level', help='logging level'
 server_log_switch_options = ['off', 'storage', 'filesystem']
 register_cli_argument('appservice web log config', 'web_server_logging', help='configure Web server logging', **enum_choice_list(server_log_switch_options))
 
+register_cli_argument('appservice web log tail', 'name', nargs='+', action=IterateAction,
+                      help="space separated names of the webs. The logs of several webs, or of webs and slots given through --ids, are streamed together with each line prefixed by its web and the time received. You can configure the default using 'az configure --defaults web=<name>'")
+register_cli_argument('appservice web log tail', 'slot', id_part='child_name', id_part_optional=True)
+register_cli_argument('appservice web log tail', 'log_file', type=file_type, completer=FilesCompleter(), help='append the streamed logs to this file instead of writing them to stdout')
 register_cli_argument('appservice web log tail', 'provider', help="scope the live traces to certain providers/folders, for example:'application', 'http' for server log, 'kudu/trace', etc")
 register_cli_argument('appservice web log download', 'log_file', default='webapp_logs.zip', type=file_type, completer=FilesCompleter(), help='the downloaded zipped log file path')
 
 register_cli_argument('appservice web config appsettings', 'settings', nargs='+', help="space separated app settings in a format of <name>=<value>")
 register_cli_argument('appservice web config appsettings', 'slot_settings', nargs='+', help="space separated slot app settings in a format of <name>=<value>")
 register_cli_argument('appservice web config appsettings', 'setting_names', nargs='+', help="space separated app setting names")
+for scope in ['appservice web config appsettings update', 'appservice web config appsettings delete']:
+    register_cli_argument(scope, 'name', nargs='+', action=IterateAction,
+                          help="space separated names of the webs. Several webs, or webs given through --ids, are updated concurrently. You can configure the default using 'az configure --defaults web=<name>'")
 
 register_cli_argument('appservice web config container', 'docker_registry_server_url', options_list=('--docker-registry-server-url', '-r'), help='the container registry server url')
 register_cli_argument('appservice web config container', 'docker_custom_image_name', options_list=('--docker-custom-image-name', '-c'), help='the container custom image name and optionally the tag name')
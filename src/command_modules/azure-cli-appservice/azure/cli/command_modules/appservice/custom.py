@@ -7,6 +7,7 @@
 from __future__ import print_function
 import json
 import threading
+from collections import OrderedDict
 try:
     from urllib.parse import urlparse
 except ImportError:
@@ -31,6 +32,10 @@ from ._params import web_client_factory, _generic_site_operation
 
 logger = azlogging.get_az_logger(__name__)
 
+MAX_CONCURRENT_APP_REQUESTS = 10
+# log lines buffered between the log streams and the writer before the streams are paused
+LOG_QUEUE_SIZE = 1000
+
 # pylint:disable=no-member,superfluous-parens
 
 
@@ -157,50 +162,109 @@ def update_site_configs(resource_group_name, name, slot=None,
 
 
 def update_app_settings(resource_group_name, name, settings=None, slot=None, slot_settings=None):
+    return _update_app_settings(resource_group_name, name, settings, slot, slot_settings)[0]
+
+
+def _update_app_settings(resource_group_name, name, settings=None, slot=None,  # pylint: disable=too-many-arguments
+                         slot_settings=None, client=None):
     if not settings and not slot_settings:
         raise CLIError('Usage Error: --settings |--slot-settings')
 
     settings = settings or []
     slot_settings = slot_settings or []
 
+    client = client or web_client_factory()
     app_settings = _generic_site_operation(resource_group_name, name,
-                                           'list_application_settings', slot)
+                                           'list_application_settings', slot, client=client)
+    new_properties = dict(app_settings.properties or {})
     for name_value in settings + slot_settings:
         # split at the first '=', appsetting should not have '=' in the name
         settings_name, value = name_value.split('=', 1)
-        app_settings.properties[settings_name] = value
+        new_properties[settings_name] = value
 
-    result = _generic_site_operation(resource_group_name, name, 'update_application_settings',
-                                     slot, app_settings)
+    changed = new_properties != app_settings.properties
+    if changed:
+        app_settings.properties = new_properties
+        app_settings = _generic_site_operation(resource_group_name, name,
+                                               'update_application_settings',
+                                               slot, app_settings, client=client)
 
     if slot_settings:
-        client = web_client_factory()
         new_slot_setting_names = [n.split('=', 1)[0] for n in slot_settings]
         slot_cfg_names = client.web_apps.list_slot_configuration_names(resource_group_name, name)
         slot_cfg_names.app_setting_names = slot_cfg_names.app_setting_names or []
-        slot_cfg_names.app_setting_names += new_slot_setting_names
-        client.web_apps.update_slot_configuration_names(resource_group_name, name, slot_cfg_names)
+        missing_names = [n for n in new_slot_setting_names
+                         if n not in slot_cfg_names.app_setting_names]
+        if missing_names:
+            slot_cfg_names.app_setting_names += missing_names
+            client.web_apps.update_slot_configuration_names(resource_group_name, name,
+                                                            slot_cfg_names)
+            changed = True
 
-    return result.properties
+    return app_settings.properties, changed
+
+
+def update_app_settings_batch(args_list):
+    return _update_apps_concurrently(_update_app_settings, args_list)
 
 
 def delete_app_settings(resource_group_name, name, setting_names, slot=None):
+    return _delete_app_settings(resource_group_name, name, setting_names, slot)[0]
+
+
+def _delete_app_settings(resource_group_name, name, setting_names, slot=None, client=None):
+    client = client or web_client_factory()
     app_settings = _generic_site_operation(resource_group_name, name,
-                                           'list_application_settings', slot)
-    client = web_client_factory()
+                                           'list_application_settings', slot, client=client)
 
     slot_cfg_names = client.web_apps.list_slot_configuration_names(resource_group_name, name)
     is_slot_settings = False
+    changed = False
     for setting_name in setting_names:
-        app_settings.properties.pop(setting_name, None)
+        if setting_name in app_settings.properties:
+            del app_settings.properties[setting_name]
+            changed = True
         if setting_name in (slot_cfg_names.app_setting_names or []):
             slot_cfg_names.app_setting_names.remove(setting_name)
             is_slot_settings = True
 
     if is_slot_settings:
         client.web_apps.update_slot_configuration_names(resource_group_name, name, slot_cfg_names)
-    return _generic_site_operation(resource_group_name, name, 'update_application_settings',
-                                   slot, app_settings)
+    if changed:
+        app_settings = _generic_site_operation(resource_group_name, name,
+                                               'update_application_settings',
+                                               slot, app_settings, client=client)
+    return app_settings, changed or is_slot_settings
+
+
+def delete_app_settings_batch(args_list):
+    return _update_apps_concurrently(_delete_app_settings, args_list)
+
+
+def _update_apps_concurrently(operation, args_list):
+    '''Apply `operation` to the web apps (or slots) given by `args_list` concurrently through a
+    bounded pool sharing one client, and return the outcome of every app in the given order.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+    client = web_client_factory()
+
+    def _update(kwargs):
+        app_result = OrderedDict([('name', kwargs['name']),
+                                  ('resourceGroup', kwargs['resource_group_name']),
+                                  ('slot', kwargs.get('slot'))])
+        try:
+            settings, changed = operation(client=client, **kwargs)
+            app_result['status'] = 'Updated' if changed else 'Unchanged'
+            app_result['appSettings'] = getattr(settings, 'properties', settings)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Failed to update the app settings of '%s': %s", kwargs['name'], ex)
+            app_result['status'] = 'Failed'
+            app_result['error'] = str(ex)
+        return app_result
+
+    max_workers = min(MAX_CONCURRENT_APP_REQUESTS, len(args_list))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_update, args_list))
 
 
 CONTAINER_APPSETTING_NAMES = ['DOCKER_REGISTRY_SERVER_URL', 'DOCKER_REGISTRY_SERVER_USERNAME',
@@ -782,21 +846,14 @@ def delete_slot(resource_group_name, webapp, slot):
     client.web_apps.delete_slot(resource_group_name, webapp, slot)
 
 
-def get_streaming_log(resource_group_name, name, provider=None, slot=None):
-    scm_url = _get_scm_url(resource_group_name, name, slot)
-    streaming_url = scm_url + '/logstream'
-    import time
-    if provider:
-        streaming_url += ('/' + provider.lstrip('/'))
+def get_streaming_log(resource_group_name, name, provider=None, slot=None, log_file=None):
+    _stream_logs([(resource_group_name, name, slot)], provider, log_file)
 
-    client = web_client_factory()
-    user, password = _get_site_credential(client, resource_group_name, name)
-    t = threading.Thread(target=_stream_trace, args=(streaming_url, user, password))
-    t.daemon = True
-    t.start()
 
-    while True:
-        time.sleep(100)  # so that ctrl+c can stop the command
+def get_streaming_log_batch(args_list):
+    args = args_list[0]
+    _stream_logs([(a['resource_group_name'], a['name'], a['slot']) for a in args_list],
+                 args['provider'], args['log_file'])
 
 
 def download_historical_logs(resource_group_name, name, log_file=None, slot=None):
@@ -814,14 +871,54 @@ def download_historical_logs(resource_group_name, name, log_file=None, slot=None
     logger.warning('Downloaded logs to %s', log_file)
 
 
-def _get_site_credential(client, resource_group_name, name):
-    creds = client.web_apps.list_publishing_credentials(resource_group_name, name)
+def _get_site_credential(client, resource_group_name, name, slot=None):
+    creds = _generic_site_operation(resource_group_name, name, 'list_publishing_credentials', slot,
+                                    client=client)
     creds = creds.result()
     return (creds.publishing_user_name, creds.publishing_password)
 
 
-def _stream_trace(streaming_url, user_name, password):
+def _stream_logs(webs, provider=None, log_file=None):
+    '''Stream the logs of the webs (or slots) given as (resource group, name, slot) tuples.
+    Every stream is read by its own thread through one connection pool manager and the lines are
+    handed to the writer through a bounded queue, so that a slow writer pauses the streams.
+    When several webs are streamed, each line is prefixed with its web and the time received.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+    from six.moves import queue  # pylint: disable=import-error
+    client = web_client_factory()
+
+    def _get_stream(web):
+        resource_group_name, name, slot = web
+        streaming_url = _get_scm_url(resource_group_name, name, slot) + '/logstream'
+        if provider:
+            streaming_url += ('/' + provider.lstrip('/'))
+        user, password = _get_site_credential(client, resource_group_name, name, slot)
+        label = name if slot is None else '{}/{}'.format(name, slot)
+        return label, streaming_url, user, password
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_APP_REQUESTS, len(webs))) as executor:
+        streams = list(executor.map(_get_stream, webs))
+
+    http = _get_log_pool_manager(len(streams))
+    lines = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    for label, streaming_url, user, password in streams:
+        t = threading.Thread(target=_stream_trace,
+                             args=(http, label, streaming_url, user, password, lines))
+        t.daemon = True
+        t.start()
+
+    import io
     import sys
+    if log_file:
+        with io.open(log_file, 'a', encoding='utf-8', newline='') as f:
+            _write_log_lines(lines, len(streams), f, prefix=len(streams) > 1)
+    else:
+        _write_log_lines(lines, len(streams), sys.stdout, prefix=len(streams) > 1,
+                         encoding=sys.stdout.encoding)
+
+
+def _get_log_pool_manager(num_streams):
     import certifi
     import urllib3
     try:
@@ -829,23 +926,62 @@ def _stream_trace(streaming_url, user_name, password):
         urllib3.contrib.pyopenssl.inject_into_urllib3()
     except ImportError:
         pass
+    # every web has its own scm host, keep a pool for each of them
+    return urllib3.PoolManager(num_pools=max(num_streams, 10), cert_reqs='CERT_REQUIRED',
+                               ca_certs=certifi.where())
+
 
-    std_encoding = sys.stdout.encoding
-    http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
+def _stream_trace(http, label, streaming_url, user_name, password, lines):
+    import urllib3
     headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(user_name, password))
-    r = http.request(
-        'GET',
-        streaming_url,
-        headers=headers,
-        preload_content=False
-    )
-    for chunk in r.stream():
-        if chunk:
+    try:
+        r = http.request(
+            'GET',
+            streaming_url,
+            headers=headers,
+            preload_content=False
+        )
+        if r.status != 200:
+            raise CLIError('{} {}'.format(r.status, r.reason))
+        pending = b''
+        for chunk in r.stream():
+            # each line of log has CRLF, but the chunks are not aligned with the lines
+            complete_lines = (pending + chunk).split(b'\n')
+            pending = complete_lines.pop()
+            for line in complete_lines:
+                lines.put((label, line + b'\n'))
+        if pending:
+            lines.put((label, pending))
+        r.release_conn()
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Failed to stream the logs of '%s': %s", label, ex)
+    finally:
+        lines.put((label, None))
+
+
+def _write_log_lines(lines, num_streams, output, prefix=False, encoding=None):
+    import datetime
+    from six.moves import queue  # pylint: disable=import-error
+    ended = 0
+    while ended < num_streams:
+        try:
+            # wait with a timeout so that ctrl+c can stop the command
+            label, line = lines.get(timeout=1)
+        except queue.Empty:
+            continue
+        if line is None:
+            ended += 1
+            logger.warning("The log stream of '%s' ended", label)
+            continue
+        line = line.decode(encoding='utf-8', errors='replace')
+        if prefix:
+            line = '[{}] {} {}'.format(label, datetime.datetime.utcnow().isoformat(), line)
+        if encoding:
             # Extra encode() and decode for stdout which does not surpport 'utf-8'
-            print(chunk.decode(encoding='utf-8', errors='replace')
-                  .encode(std_encoding, errors='replace')
-                  .decode(std_encoding, errors='replace'), end='')  # each line of log has CRLF.
-    r.release_conn()
+            line = line.encode(encoding, errors='replace').decode(encoding, errors='replace')
+        output.write(line)
+        if lines.empty():
+            output.flush()
 
 
 def upload_ssl_cert(resource_group_name, name, certificate_password, certificate_file):
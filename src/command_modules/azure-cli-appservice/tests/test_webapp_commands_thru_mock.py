@@ -2,13 +2,17 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
 import unittest
 import mock
 
 from msrestazure.azure_exceptions import CloudError
 from azure.mgmt.web.models import (SourceControl, HostNameBinding, Site, SiteConfig,
                                    HostNameSslState, SslState, Certificate,
-                                   AddressResponse, HostingEnvironmentProfile)
+                                   AddressResponse, HostingEnvironmentProfile,
+                                   StringDictionary, SlotConfigNamesResource)
 from azure.mgmt.web import WebSiteManagementClient
 from azure.cli.core.adal_authentication import AdalAuthentication
 from azure.cli.core.util import CLIError
@@ -20,7 +24,12 @@ from azure.cli.command_modules.appservice.custom import (set_deployment_user,
                                                          sync_site_repo,
                                                          _match_host_names_from_cert,
                                                          bind_ssl_cert,
-                                                         list_publish_profiles)
+                                                         list_publish_profiles,
+                                                         update_app_settings,
+                                                         update_app_settings_batch,
+                                                         delete_app_settings_batch,
+                                                         get_streaming_log,
+                                                         get_streaming_log_batch)
 
 # pylint: disable=line-too-long
 
@@ -227,6 +236,135 @@ class Test_Webapp_Mocked(unittest.TestCase):
         host_names_updated = set([x[0][3] for x in host_ssl_update_mock.call_args_list])
         self.assertEqual(host_names_updated, set(['logs.foo.com', 'admin.foo.com']))
 
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_update_app_settings_skips_unchanged(self, client_factory_mock):
+        faked_web_client = mock.MagicMock()
+        client_factory_mock.return_value = faked_web_client
+        faked_web_client.web_apps.list_application_settings.return_value = StringDictionary(
+            'antarctica', properties={'s1': 'v1'})
+
+        # action
+        result = update_app_settings('myRG', 'myweb', settings=['s1=v1'])
+
+        # assert
+        self.assertEqual(result, {'s1': 'v1'})
+        self.assertFalse(faked_web_client.web_apps.update_application_settings.called)
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_update_app_settings_of_many_webs(self, client_factory_mock):
+        faked_web_client = mock.MagicMock()
+        client_factory_mock.return_value = faked_web_client
+        app_settings = {
+            'web1': {'s1': 'v0'},
+            'web2': {'s1': 'v1'},
+            'web3': {'s1': 'v0', 's2': 'v2'}
+        }
+        faked_web_client.web_apps.list_application_settings.side_effect = \
+            lambda _, name: StringDictionary('antarctica', properties=dict(app_settings[name]))
+        faked_web_client.web_apps.update_application_settings.side_effect = lambda _, _1, settings: settings
+        faked_web_client.web_apps.list_slot_configuration_names.return_value = SlotConfigNamesResource('antarctica')
+
+        # action
+        result = update_app_settings_batch([
+            {'resource_group_name': 'myRG', 'name': name, 'settings': ['s1=v1'], 'slot': None, 'slot_settings': None}
+            for name in ['web1', 'web2', 'web3']] + [
+                {'resource_group_name': 'myRG', 'name': 'web4', 'settings': None, 'slot': None, 'slot_settings': None}])
+
+        # assert
+        self.assertEqual([(r['name'], r['status']) for r in result],
+                         [('web1', 'Updated'), ('web2', 'Unchanged'), ('web3', 'Updated'), ('web4', 'Failed')])
+        self.assertEqual(result[2]['appSettings'], {'s1': 'v1', 's2': 'v2'})
+        self.assertEqual(sorted(c[0][1] for c in faked_web_client.web_apps.update_application_settings.call_args_list),
+                         ['web1', 'web3'])
+        # the webs share one client
+        self.assertEqual(client_factory_mock.call_count, 1)
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_delete_app_settings_of_many_webs(self, client_factory_mock):
+        faked_web_client = mock.MagicMock()
+        client_factory_mock.return_value = faked_web_client
+        app_settings = {
+            'web1': {'s1': 'v1'},
+            'web2': {'s2': 'v2'}
+        }
+        faked_web_client.web_apps.list_application_settings_slot.side_effect = \
+            lambda _, name, _1: StringDictionary('antarctica', properties=dict(app_settings[name]))
+        faked_web_client.web_apps.update_application_settings_slot.side_effect = lambda _, _1, settings, _2: settings
+        faked_web_client.web_apps.list_slot_configuration_names.return_value = SlotConfigNamesResource('antarctica')
+
+        # action
+        result = delete_app_settings_batch([
+            {'resource_group_name': 'myRG', 'name': name, 'setting_names': ['s1'], 'slot': 'staging'}
+            for name in ['web1', 'web2']])
+
+        # assert
+        self.assertEqual([(r['name'], r['slot'], r['status'], r['appSettings']) for r in result],
+                         [('web1', 'staging', 'Updated', {}), ('web2', 'staging', 'Unchanged', {'s2': 'v2'})])
+        faked_web_client.web_apps.update_application_settings_slot.assert_called_once_with(
+            'myRG', 'web1', mock.ANY, 'staging')
+
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_log_pool_manager', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_site_credential', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_scm_url', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_stream_logs_of_many_webs(self, _, scm_url_mock, credential_mock, pool_manager_mock):
+        scm_url_mock.side_effect = lambda _, name, slot: 'https://{}.scm.azurewebsites.net'.format(name if slot is None else name + '-' + slot)
+        credential_mock.return_value = ('user', 'password')
+        chunks = {
+            'https://web1.scm.azurewebsites.net/logstream/http': [b'line1\r\nli', b'ne2\r\n'],
+            'https://web2-staging.scm.azurewebsites.net/logstream/http': [b'line3\r\n']
+        }
+        pool_manager_mock.return_value.request.side_effect = \
+            lambda _, url, **kwargs: FakedStreamingResponse(chunks[url])
+        log_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_folder)
+        log_file = os.path.join(log_folder, 'webs.log')
+
+        # action
+        get_streaming_log_batch([
+            {'resource_group_name': 'myRG', 'name': 'web1', 'slot': None, 'provider': 'http', 'log_file': log_file},
+            {'resource_group_name': 'myRG', 'name': 'web2', 'slot': 'staging', 'provider': 'http', 'log_file': log_file}])
+
+        # assert, all streams go through one pool manager and every line is tagged with its web
+        pool_manager_mock.assert_called_once_with(2)
+        with open(log_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(sorted(l.split(' ')[0] + ' ' + l.split(' ')[2] for l in lines),
+                         ['[web1] line1', '[web1] line2', '[web2/staging] line3'])
+        self.assertEqual([l.split(' ')[2] for l in lines if l.startswith('[web1]')], ['line1', 'line2'])
+
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_log_pool_manager', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_site_credential', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_scm_url', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_stream_logs_of_one_web(self, _, scm_url_mock, credential_mock, pool_manager_mock):
+        scm_url_mock.return_value = 'https://web1.scm.azurewebsites.net'
+        credential_mock.return_value = ('user', 'password')
+        pool_manager_mock.return_value.request.return_value = FakedStreamingResponse([b'line1\r\n', b'partial'])
+        log_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_folder)
+        log_file = os.path.join(log_folder, 'web.log')
+
+        # action
+        get_streaming_log('myRG', 'web1', log_file=log_file)
+
+        # assert, the lines of a single web are written as they are
+        with open(log_file, 'rb') as f:
+            self.assertEqual(f.read(), b'line1\r\npartial')
+
+
+class FakedStreamingResponse(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, chunks):
+        self.status = 200
+        self.reason = 'OK'
+        self.chunks = chunks
+
+    def stream(self):
+        return iter(self.chunks)
+
+    def release_conn(self):
+        pass
+
 
 class FakedResponse(object):  # pylint: disable=too-few-public-methods
     def __init__(self, status_code):
@@ -853,11 +853,13 @@ class AzureBatchDataPlaneCommand(object):
 
 
 def cli_batch_data_plane_command(name, operation, client_factory, transform=None,  # pylint:disable=too-many-arguments
-                                 flatten=FLATTEN, ignore=None, validator=None, silent=None):
+                                 flatten=FLATTEN, ignore=None, validator=None, silent=None,
+                                 query_pushdown=None):
     """ Registers an Azure CLI Batch Data Plane command. These commands must respond to a
     challenge from the service when they make requests. """
     command = AzureBatchDataPlaneCommand(__name__, name, operation, client_factory, transform,
                                          flatten, ignore, validator, silent)
+    command.cmd.query_pushdown = query_pushdown
 
     # add parameters required to create a batch client
     group_name = 'Batch Account'
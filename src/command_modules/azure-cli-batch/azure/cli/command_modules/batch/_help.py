@@ -285,6 +285,7 @@ helps['batch job-schedule reset'] = """
 helps['batch task create'] = """
     type: command
     short-summary: Create a single Batch task or multiple Batch tasks.
+    long-summary: Any number of tasks can be given in the JSON file. They are added in collections within the service limits, submitted concurrently, and the add result of every task is returned.
 """
 
 helps['batch task reset'] = """
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 from azure.cli.core.commands import cli_command
+from azure.cli.core.commands.query_pushdown import QueryPushdown
 
 from azure.cli.command_modules.batch._command_type import cli_batch_data_plane_command
 from azure.cli.command_modules.batch._validators import (
@@ -35,6 +36,15 @@ data_path = 'azure.batch.operations.{}_operations#{}'
 custom_path = 'azure.cli.command_modules.batch.custom#{}'
 mgmt_path = 'azure.mgmt.batch.operations.{}_operations#{}'
 
+
+def _query_pushdown(model, filter_fields=None):
+    """ The predicates of --query on the properties the service can filter the listed items by
+    are passed as the OData filter, and the properties of the model the query uses as the OData
+    select clause. """
+    return QueryPushdown(filter_arg='filter', filter_fields=filter_fields or ['id', 'state'],
+                         select_arg='select', select_model='azure.batch.models#' + model)
+
+
 # pylint: disable=line-too-long
 # Mgmt Account Operations
 
@@ -81,7 +91,8 @@ cli_batch_data_plane_command('batch pool create', data_path.format('pool', 'Pool
                                      'pool.cloud_service_configuration.target_os_version', 'pool.task_scheduling_policy', 'pool.virtual_machine_configuration.os_disk',
                                      'pool.start_task.max_task_retry_count', 'pool.start_task.environment_settings', 'pool.start_task.user_identity'],
                              silent=['pool.virtual_machine_configuration.image_reference'])
-cli_batch_data_plane_command('batch pool list', data_path.format('pool', 'PoolOperations.list'), pool_client_factory)
+cli_batch_data_plane_command('batch pool list', data_path.format('pool', 'PoolOperations.list'), pool_client_factory,
+                             query_pushdown=_query_pushdown('CloudPool'))
 cli_batch_data_plane_command('batch pool delete', data_path.format('pool', 'PoolOperations.delete'), pool_client_factory)
 cli_batch_data_plane_command('batch pool show', data_path.format('pool', 'PoolOperations.get'), pool_client_factory)
 cli_batch_data_plane_command('batch pool set', data_path.format('pool', 'PoolOperations.patch'), pool_client_factory,
@@ -104,7 +115,8 @@ cli_batch_data_plane_command('batch job delete', data_path.format('job', 'JobOpe
 cli_batch_data_plane_command('batch job show', data_path.format('job', 'JobOperations.get'), job_client_factory)
 cli_batch_data_plane_command('batch job set', data_path.format('job', 'JobOperations.patch'), job_client_factory, flatten=2)
 cli_batch_data_plane_command('batch job reset', data_path.format('job', 'JobOperations.update'), job_client_factory, flatten=2)
-cli_command(__name__, 'batch job list', custom_path.format('list_job'), job_client_factory, table_transformer=job_list_table_format)
+cli_command(__name__, 'batch job list', custom_path.format('list_job'), job_client_factory, table_transformer=job_list_table_format,
+            query_pushdown=_query_pushdown('CloudJob'))
 cli_batch_data_plane_command('batch job disable', data_path.format('job', 'JobOperations.disable'), job_client_factory)
 cli_batch_data_plane_command('batch job enable', data_path.format('job', 'JobOperations.enable'), job_client_factory)
 cli_batch_data_plane_command('batch job stop', data_path.format('job', 'JobOperations.terminate'), job_client_factory)
@@ -138,10 +150,12 @@ cli_batch_data_plane_command('batch job-schedule reset', data_path.format('job_s
 cli_batch_data_plane_command('batch job-schedule disable', data_path.format('job_schedule', 'JobScheduleOperations.disable'), job_schedule_client_factory)
 cli_batch_data_plane_command('batch job-schedule enable', data_path.format('job_schedule', 'JobScheduleOperations.enable'), job_schedule_client_factory)
 cli_batch_data_plane_command('batch job-schedule stop', data_path.format('job_schedule', 'JobScheduleOperations.terminate'), job_schedule_client_factory)
-cli_batch_data_plane_command('batch job-schedule list', data_path.format('job_schedule', 'JobScheduleOperations.list'), job_schedule_client_factory)
+cli_batch_data_plane_command('batch job-schedule list', data_path.format('job_schedule', 'JobScheduleOperations.list'), job_schedule_client_factory,
+                             query_pushdown=_query_pushdown('CloudJobSchedule'))
 
 cli_command(__name__, 'batch task create', custom_path.format('create_task'), task_client_factory, table_transformer=task_create_table_format)
-cli_batch_data_plane_command('batch task list', data_path.format('task', 'TaskOperations.list'), task_client_factory)
+cli_batch_data_plane_command('batch task list', data_path.format('task', 'TaskOperations.list'), task_client_factory,
+                             query_pushdown=_query_pushdown('CloudTask'))
 cli_batch_data_plane_command('batch task delete', data_path.format('task', 'TaskOperations.delete'), task_client_factory)
 cli_batch_data_plane_command('batch task show', data_path.format('task', 'TaskOperations.get'), task_client_factory)
 cli_batch_data_plane_command('batch task reset', data_path.format('task', 'TaskOperations.update'), task_client_factory)
@@ -158,7 +172,8 @@ cli_batch_data_plane_command('batch node user create', data_path.format('compute
 cli_batch_data_plane_command('batch node user delete', data_path.format('compute_node', 'ComputeNodeOperations.delete_user'), compute_node_client_factory)
 cli_batch_data_plane_command('batch node user reset', data_path.format('compute_node', 'ComputeNodeOperations.update_user'), compute_node_client_factory)
 cli_batch_data_plane_command('batch node show', data_path.format('compute_node', 'ComputeNodeOperations.get'), compute_node_client_factory)
-cli_batch_data_plane_command('batch node list', data_path.format('compute_node', 'ComputeNodeOperations.list'), compute_node_client_factory)
+cli_batch_data_plane_command('batch node list', data_path.format('compute_node', 'ComputeNodeOperations.list'), compute_node_client_factory,
+                             query_pushdown=_query_pushdown('ComputeNode', filter_fields=['state']))
 cli_batch_data_plane_command('batch node reboot', data_path.format('compute_node', 'ComputeNodeOperations.reboot'), compute_node_client_factory)
 cli_batch_data_plane_command('batch node reimage', data_path.format('compute_node', 'ComputeNodeOperations.reimage'), compute_node_client_factory)
 cli_batch_data_plane_command('batch node scheduling disable', data_path.format('compute_node', 'ComputeNodeOperations.disable_scheduling'), compute_node_client_factory)
@@ -17,7 +17,8 @@ from azure.mgmt.batch.operations import (ApplicationPackageOperations)
 from azure.batch.models import (CertificateAddParameter, PoolStopResizeOptions, PoolResizeParameter,
                                 PoolResizeOptions, JobListOptions, JobListFromJobScheduleOptions,
                                 TaskAddParameter, TaskConstraints, PoolUpdatePropertiesParameter,
-                                StartTask, BatchErrorException)
+                                StartTask, TaskAddResult, TaskAddStatus,
+                                BatchErrorException)
 
 from azure.storage.blob import BlockBlobService
 
@@ -27,6 +28,12 @@ import azure.cli.core.azlogging as azlogging
 
 logger = azlogging.get_az_logger(__name__)
 
+# service limits of a task collection
+MAX_TASKS_PER_REQUEST = 100
+MAX_TASK_COLLECTION_SIZE = 1024 * 1024
+MAX_CONCURRENT_TASK_REQUESTS = 10
+MAX_TASK_ADD_ATTEMPTS = 5
+
 
 def transfer_doc(source_func, *additional_source_funcs):
     def _decorator(func):
@@ -157,6 +164,86 @@ def create_application_package(client, resource_group_name, account_name,  # pyl
 
 # Data plane custom commands
 
+def _get_task_chunks(tasks):
+    """ Split tasks into collections within the service limits on the number of tasks and the
+    size of the request body. A task too large on its own is sent alone. """
+    chunk, chunk_size = [], 0
+    for task in tasks:
+        task_size = len(json.dumps(task.serialize())) + 1
+        if chunk and (len(chunk) == MAX_TASKS_PER_REQUEST or
+                      chunk_size + task_size > MAX_TASK_COLLECTION_SIZE):
+            yield chunk
+            chunk, chunk_size = [], 0
+        chunk.append(task)
+        chunk_size += task_size
+    if chunk:
+        yield chunk
+
+
+def _add_task_chunk(client, job_id, tasks, sleep=None):
+    """ Add a collection of tasks, retrying the whole request when it is throttled and the
+    tasks which failed with a server error. Returns the add result of every task. """
+    import time
+    from azure.cli.core.commands._polling import PollingBackoff, get_retry_after
+    sleep = sleep or time.sleep
+    backoff = PollingBackoff()
+    results = {}
+    pending = tasks
+    for attempt in range(1, MAX_TASK_ADD_ATTEMPTS + 1):
+        retry_after = None
+        try:
+            task_results = client.add_collection(job_id=job_id, value=pending).value
+        except BatchErrorException as ex:
+            if getattr(ex.error, 'code', None) == 'RequestBodyTooLarge' and len(pending) > 1:
+                half = len(pending) // 2
+                for task_result in (_add_task_chunk(client, job_id, pending[:half], sleep) +
+                                    _add_task_chunk(client, job_id, pending[half:], sleep)):
+                    results[task_result.task_id] = task_result
+                break
+            if getattr(ex.response, 'status_code', None) not in (429, 500, 503):
+                raise
+            if attempt == MAX_TASK_ADD_ATTEMPTS:
+                # report the tasks as failed rather than the whole submission
+                for task in pending:
+                    results[task.id] = TaskAddResult(TaskAddStatus.server_error, task.id,
+                                                     error=ex.error)
+                break
+            retry_after = get_retry_after(ex.response)
+        else:
+            for task_result in task_results:
+                results[task_result.task_id] = task_result
+            retry_ids = set(r.task_id for r in task_results
+                            if r.status in (TaskAddStatus.server_error,
+                                            TaskAddStatus.server_error.value))
+            pending = [t for t in pending if t.id in retry_ids]
+            if not pending or attempt == MAX_TASK_ADD_ATTEMPTS:
+                break
+        logger.info("Retrying to add %d tasks to job '%s'", len(pending), job_id)
+        sleep(backoff.next_delay(retry_after))
+    return [results[task.id] for task in tasks if task.id in results]
+
+
+def _add_task_collection(client, job_id, tasks):
+    """ Add any number of tasks to a job, in collections within the service limits which are
+    submitted concurrently. Returns the add result of every task in the given order. """
+    from concurrent.futures import ThreadPoolExecutor
+    # the ids of the tasks of a job are case-insensitive, and the results are matched by id
+    task_ids = set()
+    for task in tasks:
+        if task.id.lower() in task_ids:
+            raise CLIError("Task id '{}' is used by more than one task.".format(task.id))
+        task_ids.add(task.id.lower())
+    chunks = list(_get_task_chunks(tasks))
+    if len(chunks) == 1:
+        return _add_task_chunk(client, job_id, chunks[0])
+    logger.info("Adding %d tasks to job '%s' in %d collections", len(tasks), job_id, len(chunks))
+    max_workers = min(MAX_CONCURRENT_TASK_REQUESTS, len(chunks))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [task_result for chunk_results in
+                executor.map(lambda chunk: _add_task_chunk(client, job_id, chunk), chunks)
+                for task_result in chunk_results]
+
+
 def _handle_batch_exception(action):
     try:
         return action()
@@ -300,8 +387,7 @@ def create_task(client, job_id, json_file=None, task_id=None, command_line=None,
             client.add(job_id=job_id, task=task)
             return client.get(job_id=job_id, task_id=task.id)
         else:
-            result = client.add_collection(job_id=job_id, value=tasks)
-            return result.value
+            return _add_task_collection(client, job_id, tasks)
 
     task = None
     if json_file:
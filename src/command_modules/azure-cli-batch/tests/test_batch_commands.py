@@ -16,6 +16,7 @@ from azure.cli.core.util import CLIError
 
 from azure.cli.command_modules.batch import _validators
 from azure.cli.command_modules.batch import _command_type
+from azure.cli.command_modules.batch import custom
 
 
 class TestObj(object):
@@ -683,3 +684,93 @@ class TestBatchLoader(unittest.TestCase):
         with mock.patch.object(_command_type, 'get_op_handler', get_op_handler):
             result = self.command_pool.cmd.execute(kwargs=kwargs)
             self.assertEqual(result, "Pool Created")
+
+
+class TestBatchTaskCollection(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        creds = SharedKeyCredentials('test1', 'ZmFrZV9hY29jdW50X2tleQ==')
+        self.client = BatchServiceClient(creds, 'https://test1.westus.batch.azure.com/').task
+        self.added = []
+        self.client.add_collection = mock.MagicMock(side_effect=self._add_collection)
+        self.server_errors = set()
+        self.busy_responses = 0
+
+    def _add_collection(self, job_id, value):
+        self.assertEqual(job_id, 'job1')
+        if self.busy_responses:
+            self.busy_responses -= 1
+            raise self._error(503, 'ServerBusy')
+        results = []
+        for task in value:
+            if task.id in self.server_errors:
+                self.server_errors.remove(task.id)
+                results.append(models.TaskAddResult(models.TaskAddStatus.server_error, task.id))
+            else:
+                self.added.append(task.id)
+                results.append(models.TaskAddResult(models.TaskAddStatus.success, task.id))
+        return models.TaskAddCollectionResult(value=results)
+
+    def _error(self, status_code, code):
+        import requests
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = ('{{"code": "{}", "message": {{"value": "error"}}}}'.format(code)).encode('utf-8')
+        response.headers['Retry-After'] = '0'
+        return models.BatchErrorException(self.client._deserialize, response)
+
+    @staticmethod
+    def _tasks(count, command_line='cmd'):
+        return [models.TaskAddParameter('task{}'.format(i), command_line) for i in range(count)]
+
+    def test_batch_task_chunks_by_count_and_size(self):
+        chunks = list(custom._get_task_chunks(self._tasks(250)))
+        self.assertEqual([len(c) for c in chunks], [100, 100, 50])
+
+        with mock.patch.object(custom, 'MAX_TASK_COLLECTION_SIZE', 1000):
+            chunks = list(custom._get_task_chunks(self._tasks(10, 'x' * 300)))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 2, 2, 2])
+
+    def test_batch_add_task_collection(self):
+        tasks = self._tasks(250)
+        self.server_errors = {'task3', 'task120'}
+        with mock.patch('time.sleep'):
+            results = custom._add_task_collection(self.client, 'job1', tasks)
+        self.assertEqual([r.task_id for r in results], [t.id for t in tasks])
+        self.assertTrue(all(r.status == models.TaskAddStatus.success for r in results))
+        self.assertEqual(sorted(self.added), sorted(t.id for t in tasks))
+        # 3 collections, and 2 retries of the failed tasks
+        self.assertEqual(self.client.add_collection.call_count, 5)
+
+    def test_batch_add_task_collection_duplicate_ids(self):
+        tasks = self._tasks(3) + [models.TaskAddParameter('TASK1', 'cmd')]
+        with self.assertRaises(CLIError):
+            custom._add_task_collection(self.client, 'job1', tasks)
+        self.client.add_collection.assert_not_called()
+
+    def test_batch_add_task_chunk_throttled(self):
+        self.busy_responses = 2
+        sleep = mock.MagicMock()
+        results = custom._add_task_chunk(self.client, 'job1', self._tasks(3), sleep=sleep)
+        self.assertEqual([r.task_id for r in results], ['task0', 'task1', 'task2'])
+        self.assertEqual(sleep.call_args_list, [mock.call(0.0), mock.call(0.0)])
+
+        self.busy_responses = custom.MAX_TASK_ADD_ATTEMPTS
+        results = custom._add_task_chunk(self.client, 'job1', self._tasks(2), sleep=sleep)
+        self.assertEqual([(r.task_id, r.status, r.error.code) for r in results],
+                         [('task0', models.TaskAddStatus.server_error, 'ServerBusy'),
+                          ('task1', models.TaskAddStatus.server_error, 'ServerBusy')])
+
+    def test_batch_add_task_chunk_too_large(self):
+        def add_collection(job_id, value):
+            if len(value) > 1:
+                raise self._error(413, 'RequestBodyTooLarge')
+            return self._add_collection(job_id, value)
+        self.client.add_collection.side_effect = add_collection
+        results = custom._add_task_chunk(self.client, 'job1', self._tasks(3), sleep=mock.MagicMock())
+        self.assertEqual([r.task_id for r in results], ['task0', 'task1', 'task2'])
+
+        self.client.add_collection.side_effect = self._error(404, 'JobNotFound')
+        with self.assertRaises(models.BatchErrorException):
+            custom._add_task_chunk(self.client, 'job1', self._tasks(3))
@@ -11,3 +11,24 @@ helps['configure'] = """
             type: command
             short-summary: Configure Azure CLI 2.0 Preview or view your configuration. The command is interactive, so just type `az configure` and respond to the prompts.
 """
+
+helps['http-cache'] = """
+            type: group
+            short-summary: Inspect or clear the cache of the responses of read-only requests.
+            long-summary: "The cache is enabled by 'http_cache = yes' in the [core] section of the configuration, or AZURE_CORE_HTTP_CACHE=yes. Its size is bounded by 'http_cache_max_size' in MB, 50 by default. The maximum age of the responses of each operation, e.g. vm_sizes, can be set in seconds in the [http_cache] section."
+"""
+
+helps['http-cache show'] = """
+            type: command
+            short-summary: Show the number and size of the cached responses.
+"""
+
+helps['http-cache list'] = """
+            type: command
+            short-summary: List the cached responses, most recently used first.
+"""
+
+helps['http-cache clear'] = """
+            type: command
+            short-summary: Remove all the cached responses.
+"""
@@ -8,3 +8,6 @@
 from azure.cli.core.commands import cli_command
 
 cli_command(__name__, 'configure', 'azure.cli.command_modules.configure.custom#handle_configure')
+cli_command(__name__, 'http-cache show', 'azure.cli.command_modules.configure.custom#show_http_cache')
+cli_command(__name__, 'http-cache list', 'azure.cli.command_modules.configure.custom#list_http_cache')
+cli_command(__name__, 'http-cache clear', 'azure.cli.command_modules.configure.custom#clear_http_cache')
@@ -157,3 +157,19 @@ def _normalize_config_value(value):
         value = '' if value in ["''", '""'] else value
     return value
 
+
+def show_http_cache():
+    from azure.cli.core._http_cache import get_http_cache, is_http_cache_enabled
+    summary = get_http_cache().get_summary()
+    summary['enabled'] = is_http_cache_enabled()
+    return summary
+
+
+def list_http_cache():
+    from azure.cli.core._http_cache import get_http_cache
+    return get_http_cache().list()
+
+
+def clear_http_cache():
+    from azure.cli.core._http_cache import get_http_cache
+    get_http_cache().clear()
@@ -3,22 +3,65 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import yaml
+from importlib import import_module
 
 from azure.cli.core.commands import _update_command_definitions
-from azure.cli.core.help_files import helps
+from azure.cli.core.help_files import helps, get_help_store
+import azure.cli.core.azlogging as azlogging
 
+logger = azlogging.get_az_logger(__name__)
 
-def build_command_table():
+COMMAND_MODULE_PREFIX = 'azure.cli.command_modules.'
+
+
+def _get_module_name(module_path):
+    if module_path and module_path.startswith(COMMAND_MODULE_PREFIX):
+        return module_path[len(COMMAND_MODULE_PREFIX):].split('.')[0]
+    return None
+
+
+def _get_help_modules(cmd_modules):
+    """ Map the commands and groups to their command module. A group belongs to the module of
+    its commands. """
+    help_modules = {}
+    for cmd in sorted(cmd_modules):
+        parts = cmd.split()
+        for i in range(1, len(parts)):
+            help_modules.setdefault(' '.join(parts[:i]), cmd_modules[cmd])
+    help_modules.update(cmd_modules)
+    return help_modules
+
+
+def _load_command_table(modules):
     import azure.cli.core.commands as commands
-    cmd_table = commands.get_command_table()
+    if modules is None:
+        return commands.get_command_table()
+
+    for mod in modules:
+        try:
+            import_module(COMMAND_MODULE_PREFIX + mod).load_commands()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to index command module '%s'", mod)
+    return dict((cmd, command) for cmd, command in commands.command_table.items()
+                if _get_module_name(commands.command_module_map.get(cmd)) in modules)
+
+
+def build_command_table(modules=None):
+    """ Gather the help of the commands of the given command modules, or of all of them. Each
+    entry records the name of the module it belongs to. """
+    import azure.cli.core.commands as commands
+    cmd_table = _load_command_table(modules)
     for cmd in cmd_table:
         cmd_table[cmd].load_arguments()
     _update_command_definitions(cmd_table)
 
+    cmd_modules = dict((cmd, _get_module_name(commands.command_module_map.get(cmd)))
+                       for cmd in commands.command_table)
+    help_modules = _get_help_modules(cmd_modules)
+
     data = {}
     for cmd in cmd_table:
-        com_descip = {}
+        com_descip = {'module': cmd_modules.get(cmd)}
         param_descrip = {}
         com_descip['short-summary'] = cmd_table[cmd].description() \
             if callable(cmd_table[cmd].description) \
@@ -48,9 +91,13 @@ def build_command_table():
         data[cmd] = com_descip
 
     for cmd in helps:
-        diction_help = yaml.load(helps[cmd])
+        module = help_modules.get(cmd)
+        if modules is not None and module not in modules:
+            continue
+        diction_help = get_help_store().parse(helps[cmd])
         if cmd not in data:
             data[cmd] = {
+                'module': module,
                 'short-summary': diction_help.get(
                     'short-summary', ''),
                 'long-summary': diction_help.get('long-summary', ''),
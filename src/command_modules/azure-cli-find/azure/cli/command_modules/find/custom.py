@@ -5,44 +5,81 @@
 
 from __future__ import print_function
 
+import json
 import os
+import pkgutil
 import textwrap
 import shutil
+from importlib import import_module
 
 import six
 from whoosh.highlight import UppercaseFormatter, ContextFragmenter
 from whoosh.qparser import MultifieldParser
 from whoosh import index
-from whoosh.fields import TEXT, Schema
+from whoosh.fields import ID, TEXT, Schema
 
 from azure.cli.command_modules.find._gather_commands import build_command_table
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core._environment import get_config_dir
+from azure.cli.core.commands import BLACKLISTED_MODS
+from azure.cli.core.util import COMPONENT_PREFIX
 
 logger = azlogging.get_az_logger(__name__)
 
 INDEX_PATH = os.path.join(get_config_dir(), 'search_index')
+MODULE_VERSIONS_PATH = os.path.join(INDEX_PATH, 'module_versions.json')
 
 schema = Schema(
     cmd_name=TEXT(stored=True),
     short_summary=TEXT(stored=True),
     long_summary=TEXT(stored=True),
-    examples=TEXT(stored=True))
+    examples=TEXT(stored=True),
+    module=ID(stored=True))
 
 
-def _cli_index_corpus():
-    return build_command_table()
+def _cli_index_corpus(modules=None):
+    return build_command_table(modules)
 
 
-def _index_help():
+def _get_installed_module_versions():
+    import pkg_resources
+    dist_versions = dict((d.key, d.version) for d in pkg_resources.working_set)
+    try:
+        mods_ns_pkg = import_module('azure.cli.command_modules')
+        installed_command_modules = [modname for _, modname, _ in
+                                     pkgutil.iter_modules(mods_ns_pkg.__path__)
+                                     if modname not in BLACKLISTED_MODS]
+    except ImportError:
+        installed_command_modules = []
+    return dict((mod, dist_versions.get(COMPONENT_PREFIX + mod.replace('_', '-'), 'unknown'))
+                for mod in installed_command_modules)
+
+
+def _get_indexed_module_versions():
+    try:
+        with open(MODULE_VERSIONS_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, IOError, ValueError):
+        return None
+
+
+def _set_indexed_module_versions(versions):
+    with open(MODULE_VERSIONS_PATH, 'w') as f:
+        json.dump(versions, f)
+
+
+def _index_help(modules=None, removed_modules=None):
     ix = index.open_dir(INDEX_PATH)
     writer = ix.writer()
-    for cmd, document in list(_cli_index_corpus().items()):
+    for module in (modules or []) + (removed_modules or []):
+        writer.delete_by_term('module', six.u(module))
+    for cmd, document in list(_cli_index_corpus(modules).items()):
         writer.add_document(
             cmd_name=six.u(cmd),
             short_summary=six.u(document.get('short-summary', '')),
             long_summary=six.u(document.get('long-summary', '')),
-            examples=six.u(document.get('examples', ''))
+            examples=six.u(document.get('examples', '')),
+            module=six.u(document.get('module') or '')
         )
     writer.commit()
 
@@ -56,12 +93,33 @@ def _create_index():
     _remove_index()
     os.mkdir(INDEX_PATH)
     index.create_in(INDEX_PATH, schema)
+    versions = _get_installed_module_versions()
     _index_help()
+    _set_indexed_module_versions(versions)
+
+
+def _update_index():
+    """ Re-index the command modules installed, updated or removed since the index was built. """
+    indexed = _get_indexed_module_versions()
+    if indexed is None:
+        _create_index()
+        return
+
+    installed = _get_installed_module_versions()
+    changed = sorted(mod for mod in installed if installed[mod] != indexed.get(mod))
+    removed = sorted(mod for mod in indexed if mod not in installed)
+    if changed or removed:
+        logger.info("Updating the search index for the command modules: %s",
+                    ', '.join(changed + removed))
+        _index_help(changed, removed)
+        _set_indexed_module_versions(installed)
 
 
 def _ensure_index():
     if not os.path.exists(INDEX_PATH):
         _create_index()
+    else:
+        _update_index()
 
 
 def _get_index():
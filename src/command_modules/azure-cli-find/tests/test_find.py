@@ -5,16 +5,21 @@
 
 import contextlib
 import json
+import os
 import shlex
+import shutil
+import tempfile
 import unittest
 
 import sys
 
+import mock
 import six
 from nose import with_setup
 from six import StringIO
 
 from azure.cli.main import main as cli_main
+import azure.cli.command_modules.find.custom as find_custom
 from azure.cli.command_modules.find.custom import _remove_index
 
 
@@ -59,3 +64,59 @@ class SearchIndexTest(unittest.TestCase):
             self,
             execute('find -q keyvault list --reindex'),
             'az keyvault certificate list-versions')
+
+
+_CORPUS = {
+    'vm': {'vm': {'module': 'vm', 'short-summary': 'Provision Linux or Windows virtual machines.'},
+           'vm create': {'module': 'vm', 'short-summary': 'Create a virtual machine.'}},
+    'redis': {'redis create': {'module': 'redis', 'short-summary': 'Create a Redis cache.'}}
+}
+
+
+class IncrementalSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        index_path = os.path.join(self.folder, 'search_index')
+        self.patches = [
+            mock.patch.object(find_custom, 'INDEX_PATH', index_path),
+            mock.patch.object(find_custom, 'MODULE_VERSIONS_PATH',
+                              os.path.join(index_path, 'module_versions.json')),
+            mock.patch.object(find_custom, '_get_installed_module_versions',
+                              return_value={'vm': '2.0.2', 'redis': '0.1.1'}),
+            mock.patch.object(find_custom, '_cli_index_corpus', side_effect=self._corpus)]
+        for p in self.patches:
+            p.start()
+        self.indexed_modules = []
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.folder)
+
+    def _corpus(self, modules=None):
+        self.indexed_modules.append(modules)
+        corpus = {}
+        for module in modules if modules is not None else sorted(_CORPUS):
+            corpus.update(_CORPUS.get(module, {}))
+        return corpus
+
+    def _indexed_commands(self):
+        with find_custom._get_index().searcher() as searcher:  # pylint: disable=protected-access
+            return sorted(doc['cmd_name'] for doc in searcher.all_stored_fields())
+
+    def test_index_is_updated_for_changed_modules(self):
+        self.assertEqual(self._indexed_commands(), ['redis create', 'vm', 'vm create'])
+        self.assertEqual(self.indexed_modules, [None])
+
+        # nothing changed
+        self._indexed_commands()
+        self.assertEqual(self.indexed_modules, [None])
+
+        _CORPUS['vm']['vm delete'] = {'module': 'vm', 'short-summary': 'Delete a VM.'}
+        find_custom._get_installed_module_versions.return_value = {'vm': '2.0.3'}  # pylint: disable=protected-access
+        try:
+            self.assertEqual(self._indexed_commands(), ['vm', 'vm create', 'vm delete'])
+        finally:
+            del _CORPUS['vm']['vm delete']
+        self.assertEqual(self.indexed_modules, [None, ['vm']])
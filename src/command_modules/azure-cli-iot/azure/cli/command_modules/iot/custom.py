@@ -8,7 +8,9 @@ from __future__ import print_function
 from os.path import exists
 from enum import Enum
 from azure.cli.core.util import CLIError
+from azure.cli.core._resource_cache import call_with_resource_ids, get_resource_id_cache
 from azure.cli.core.commands import LongRunningOperation
+from azure.cli.core.commands.arm import parse_resource_id
 from azure.mgmt.iothub.models.iot_hub_client_enums import IotHubSku, AccessRights
 from azure.mgmt.iothub.models.iot_hub_description import IotHubDescription
 from azure.mgmt.iothub.models.iot_hub_sku_info import IotHubSkuInfo
@@ -22,6 +24,15 @@ from ._factory import resource_service_factory
 from ._utils import create_self_signed_certificate
 
 
+# The maximum number of concurrent requests to the devices of an IoT Hub
+MAX_CONCURRENT_DEVICE_REQUESTS = 20
+
+IOT_HUB_RESOURCE_TYPE = 'Microsoft.Devices/IotHubs'
+
+# IoT Hub access policies resolved by this process
+_hub_policies = {}
+
+
 # CUSTOM TYPE
 class KeyType(Enum):
     primary = 'primary'
@@ -71,13 +82,15 @@ def iot_hub_list(client, resource_group_name=None):
 
 
 def iot_hub_update(client, hub_name, parameters, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.create_or_update(resource_group_name, hub_name, parameters, {'IF-MATCH': parameters.etag})
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.create_or_update(group, hub_name, parameters, {'IF-MATCH': parameters.etag}))
 
 
 def iot_hub_delete(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.delete(resource_group_name, hub_name)
+    def _delete(group):
+        _forget_hub(client, hub_name)
+        return client.delete(group, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name, _delete)
 
 
 # Deleting IoT Hub is a long running operation. Due to API implementation issue, 404 error will be thrown during
@@ -104,7 +117,6 @@ def iot_hub_show_connection_string(client, hub_name=None, resource_group_name=No
             return _get_single_hub_connection_string(client, h.name, h.resourcegroup, policy_name, key_type)
         return [{'name': h.name, 'connectionString': conn_str_getter(h)} for h in hubs]
     else:
-        resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
         conn_str = _get_single_hub_connection_string(client, hub_name, resource_group_name, policy_name, key_type)
         return {'connectionString': conn_str}
 
@@ -112,43 +124,43 @@ def iot_hub_show_connection_string(client, hub_name=None, resource_group_name=No
 def _get_single_hub_connection_string(client, hub_name, resource_group_name, policy_name, key_type):
     access_policy = iot_hub_policy_get(client, hub_name, policy_name, resource_group_name)
     conn_str_template = 'HostName={}.azure-devices.net;SharedAccessKeyName={};SharedAccessKey={}'
-    key = access_policy.secondary_key if key_type == KeyType.secondary else access_policy.primary_key
+    key = access_policy.secondary_key if key_type == KeyType.secondary.value else access_policy.primary_key
     return conn_str_template.format(hub_name, policy_name, key)
 
 
 def iot_hub_sku_list(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_valid_skus(resource_group_name, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_valid_skus(group, hub_name))
 
 
 def iot_hub_consumer_group_create(client, hub_name, consumer_group_name, resource_group_name=None, event_hub_name='events'):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.create_event_hub_consumer_group(resource_group_name, hub_name, event_hub_name, consumer_group_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.create_event_hub_consumer_group(group, hub_name, event_hub_name, consumer_group_name))
 
 
 def iot_hub_consumer_group_list(client, hub_name, resource_group_name=None, event_hub_name='events'):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.list_event_hub_consumer_groups(resource_group_name, hub_name, event_hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.list_event_hub_consumer_groups(group, hub_name, event_hub_name))
 
 
 def iot_hub_consumer_group_get(client, hub_name, consumer_group_name, resource_group_name=None, event_hub_name='events'):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_event_hub_consumer_group(resource_group_name, hub_name, event_hub_name, consumer_group_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_event_hub_consumer_group(group, hub_name, event_hub_name, consumer_group_name))
 
 
 def iot_hub_consumer_group_delete(client, hub_name, consumer_group_name, resource_group_name=None, event_hub_name='events'):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.delete_event_hub_consumer_group(resource_group_name, hub_name, event_hub_name, consumer_group_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.delete_event_hub_consumer_group(group, hub_name, event_hub_name, consumer_group_name))
 
 
 def iot_hub_policy_list(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.list_keys(resource_group_name, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.list_keys(group, hub_name))
 
 
 def iot_hub_policy_get(client, hub_name, policy_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_keys_for_key_name(resource_group_name, hub_name, policy_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_keys_for_key_name(group, hub_name, policy_name))
 
 
 def iot_hub_policy_create(client, hub_name, policy_name, permissions, resource_group_name=None):
@@ -171,6 +183,7 @@ def iot_hub_policy_delete(client, hub_name, policy_name, resource_group_name=Non
         raise CLIError('Policy {0} not found.'.format(policy_name))
     updated_policies = [p for p in policies if p.key_name.lower() != policy_name.lower()]
     hub.properties.authorization_policies = updated_policies
+    _forget_hub(client, hub_name, policies_only=True)
     return client.create_or_update(hub.resourcegroup, hub_name, hub, {'IF-MATCH': hub.etag})
 
 
@@ -186,13 +199,13 @@ class PolicyUpdateResultTransform(LongRunningOperation):  # pylint: disable=too-
 
 
 def iot_hub_job_list(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.list_jobs(resource_group_name, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.list_jobs(group, hub_name))
 
 
 def iot_hub_job_get(client, hub_name, job_id, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_job(resource_group_name, hub_name, job_id)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_job(group, hub_name, job_id))
 
 
 def iot_hub_job_cancel(client, hub_name, job_id, resource_group_name=None):
@@ -201,13 +214,13 @@ def iot_hub_job_cancel(client, hub_name, job_id, resource_group_name=None):
 
 
 def iot_hub_get_quota_metrics(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_quota_metrics(resource_group_name, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_quota_metrics(group, hub_name))
 
 
 def iot_hub_get_stats(client, hub_name, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.get_stats(resource_group_name, hub_name)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.get_stats(group, hub_name))
 
 
 def iot_device_create(client, hub_name, device_id, resource_group_name=None, x509=False, primary_thumbprint=None,
@@ -267,15 +280,19 @@ def iot_device_delete(client, hub_name, device_id, resource_group_name=None, eta
 
 def iot_device_show_connection_string(client, hub_name, device_id=None, resource_group_name=None, top=20,
                                       key_type=KeyType.primary.value):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
     if device_id is None:
         devices = iot_device_list(client, hub_name, resource_group_name, top)
         if devices is None:
             raise CLIError('No devices found in IoT Hub {}.'.format(hub_name))
 
-        def conn_str_getter(d):
-            return _get_single_device_connection_string(client, hub_name, d.device_id, resource_group_name, key_type)
-        return [{'deviceId': d.device_id, 'connectionString': conn_str_getter(d)} for d in devices]
+        # device identities listed without their authentication are fetched concurrently
+        devices = list(devices)
+        missing = [d.device_id for d in devices if d.authentication is None]
+        if missing:
+            fetched = dict(zip(missing, _get_devices(client, resource_group_name, hub_name, missing)))
+            devices = [d if d.authentication is not None else fetched[d.device_id] for d in devices]
+        return [{'deviceId': d.device_id, 'connectionString': _build_device_connection_string(hub_name, d, key_type)}
+                for d in devices]
     else:
         conn_str = _get_single_device_connection_string(client, hub_name, device_id, resource_group_name, key_type)
         return {'connectionString': conn_str}
@@ -322,13 +339,13 @@ def iot_device_abandon_message(client, hub_name, device_id, lock_token, resource
 
 
 def iot_device_export(client, hub_name, blob_container_uri, include_keys=False, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.export_devices(resource_group_name, hub_name, blob_container_uri, not include_keys)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.export_devices(group, hub_name, blob_container_uri, not include_keys))
 
 
 def iot_device_import(client, hub_name, input_blob_container_uri, output_blob_container_uri, resource_group_name=None):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    return client.import_devices(resource_group_name, hub_name, input_blob_container_uri, output_blob_container_uri)
+    return _call_with_resource_group(client, resource_group_name, hub_name,
+                                     lambda group: client.import_devices(group, hub_name, input_blob_container_uri, output_blob_container_uri))
 
 
 def _get_single_device_connection_string(client, hub_name, device_id, resource_group_name, key_type):
@@ -336,36 +353,69 @@ def _get_single_device_connection_string(client, hub_name, device_id, resource_g
     device = device_client.get(device_id)
     if device is None:
         raise CLIError('Device {} not found.'.format(device_id))
+    return _build_device_connection_string(hub_name, device, key_type)
+
 
+def _build_device_connection_string(hub_name, device, key_type):
     conn_str_template = 'HostName={0}.azure-devices.net;DeviceId={1};{2}={3}'
     keys = device.authentication.symmetric_key
     if any([keys.primary_key, keys.secondary_key]):
-        key = keys.secondary_key if key_type == KeyType.secondary else keys.primary_key
+        key = keys.secondary_key if key_type == KeyType.secondary.value else keys.primary_key
         if key is None:
             raise CLIError('{0} key not found.'.format(key_type))
-        return conn_str_template.format(hub_name, device_id, 'SharedAccessKey', key)
+        return conn_str_template.format(hub_name, device.device_id, 'SharedAccessKey', key)
     else:
-        return conn_str_template.format(hub_name, device_id, 'x509', 'true')
+        return conn_str_template.format(hub_name, device.device_id, 'x509', 'true')
 
 
-def _get_device_client(client, resource_group_name, hub_name, device_id):
-    resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
+def _get_devices(client, resource_group_name, hub_name, device_ids):
+    from concurrent.futures import ThreadPoolExecutor
+    # a client scoped to the hub is shared by the requests for all the devices
+    device_client = _get_device_client(client, resource_group_name, hub_name)
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_DEVICE_REQUESTS, len(device_ids))) as executor:
+        return list(executor.map(device_client.get, device_ids))
+
+
+def _get_device_client(client, resource_group_name, hub_name, device_id=None):
     base_url = '{0}.azure-devices.net'.format(hub_name)
-    uri = '{0}/devices/{1}'.format(base_url, device_id)
-    access_policy = iot_hub_policy_get(client, hub_name, 'iothubowner', resource_group_name)
+    uri = base_url if device_id is None else '{0}/devices/{1}'.format(base_url, device_id)
+    access_policy = _call_with_resource_group(client, resource_group_name, hub_name,
+                                              lambda group: _get_hub_policy(client, hub_name, 'iothubowner', group))
     creds = SasTokenAuthentication(uri, access_policy.key_name, access_policy.primary_key)
     return IotHubDeviceClient(creds, client.config.subscription_id, base_url='https://' + base_url).iot_hub_devices
 
 
+def _forget_hub(client, hub_name, policies_only=False):
+    subscription_id, hub_name = client.config.subscription_id, hub_name.lower()
+    if not policies_only:
+        get_resource_id_cache().remove(subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name)
+    for key in [k for k in _hub_policies if k[0] == subscription_id and k[2] == hub_name]:
+        del _hub_policies[key]
+
+
+def _get_hub_policy(client, hub_name, policy_name, resource_group_name):
+    key = (client.config.subscription_id, resource_group_name.lower(), hub_name.lower(), policy_name)
+    if key not in _hub_policies:
+        _hub_policies[key] = iot_hub_policy_get(client, hub_name, policy_name, resource_group_name)
+    return _hub_policies[key]
+
+
 def _get_iot_hub_by_name(client, hub_name):
-    all_hubs = iot_hub_list(client)
-    if all_hubs is None:
-        raise CLIError('No IoT Hub found in current subscription.')
-    try:
-        target_hub = next(x for x in all_hubs if hub_name.lower() == x.name.lower())
-    except StopIteration:
-        raise CLIError('No IoT Hub found with name {} in current subscription.'.format(hub_name))
-    return target_hub
+    listed_hubs = []
+
+    def _list_hubs():
+        listed_hubs.extend(client.list_by_subscription())
+        return listed_hubs
+
+    def _get_hub(hub_ids):
+        if not hub_ids:
+            raise CLIError('No IoT Hub found with name {} in current subscription.'.format(hub_name))
+        # a hub just listed is not fetched again
+        return next((x for x in listed_hubs if x.id == hub_ids[0]), None) or \
+            client.get(parse_resource_id(hub_ids[0])['resource_group'], hub_name)
+
+    return call_with_resource_ids(client.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name,
+                                  _list_hubs, _get_hub)
 
 
 def _ensure_location(resource_group_name, location):
@@ -376,11 +426,19 @@ def _ensure_location(resource_group_name, location):
         return location
 
 
-def _ensure_resource_group_name(client, resource_group_name, hub_name):
-    if resource_group_name is None:
-        return _get_iot_hub_by_name(client, hub_name).resourcegroup
-    else:
-        return resource_group_name
+def _call_with_resource_group(client, resource_group_name, hub_name, operation):
+    # the group of a hub taken from the cache is looked up again when ARM doesn't find the hub in
+    # it, not when the operation doesn't find a consumer group, job or policy of the hub
+    if resource_group_name is not None:
+        return operation(resource_group_name)
+
+    def _call(hub_ids):
+        if not hub_ids:
+            raise CLIError('No IoT Hub found with name {} in current subscription.'.format(hub_name))
+        return operation(parse_resource_id(hub_ids[0])['resource_group'])
+
+    return call_with_resource_ids(client.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name,
+                                  client.list_by_subscription, _call, child_operation=True)
 
 
 # Convert permission list to AccessRights from IoT SDK.
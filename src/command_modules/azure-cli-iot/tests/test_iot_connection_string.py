@@ -0,0 +1,122 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=line-too-long
+
+import unittest
+
+import mock
+from msrest.exceptions import ClientException
+
+from azure.cli.core._resource_cache import ResourceIdCache, get_resource_id_cache
+from azure.cli.core._session import Session
+import azure.cli.command_modules.iot.custom as iot_custom
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.authentication import Authentication
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.device_description import DeviceDescription
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.symmetric_key import SymmetricKey
+
+
+def _device(device_id, with_keys=True):
+    device = DeviceDescription(device_id)
+    if with_keys:
+        device.authentication = Authentication(
+            symmetric_key=SymmetricKey(device_id + '-primary', device_id + '-secondary'))
+    return device
+
+
+def _not_found(code, message):
+    ex = ClientException(message)
+    ex.status_code = 404
+    ex.response = mock.MagicMock(status_code=404)
+    ex.response.json.return_value = {'error': {'code': code, 'message': message}}
+    return ex
+
+
+class _Hub(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, name, resourcegroup):
+        self.id = '/subscriptions/sub/resourceGroups/{}/providers/Microsoft.Devices/IotHubs/{}'.format(
+            resourcegroup, name)
+        self.name = name
+        self.resourcegroup = resourcegroup
+
+
+class TestIotDeviceConnectionString(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = 'sub'
+        self.client.list_by_subscription.return_value = [_Hub('otherhub', 'rg1'), _Hub('myhub', 'rg2')]
+        self.client.get_keys_for_key_name.return_value = mock.MagicMock(key_name='iothubowner',
+                                                                        primary_key='a2V5')
+        self.device_client = mock.MagicMock()
+        self.device_client.get.side_effect = _device
+
+        patcher = mock.patch('azure.cli.command_modules.iot.custom.IotHubDeviceClient')
+        self.device_client_factory = patcher.start()
+        self.device_client_factory.return_value.iot_hub_devices = self.device_client
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('azure.cli.core._resource_cache._resource_id_cache', ResourceIdCache(Session()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(iot_custom._hub_policies.clear)  # pylint: disable=protected-access
+
+    def test_hub_and_policy_resolved_once(self):
+        for device_id in ['d1', 'd2', 'd3']:
+            result = iot_custom.iot_device_show_connection_string(self.client, 'MyHub', device_id)
+            self.assertEqual(result, {'connectionString': 'HostName=MyHub.azure-devices.net;DeviceId={0};'
+                                                          'SharedAccessKey={0}-primary'.format(device_id)})
+        self.assertEqual(self.client.list_by_subscription.call_count, 1)
+        self.client.get_keys_for_key_name.assert_called_once_with('rg2', 'MyHub', 'iothubowner')
+
+    def test_connection_strings_of_listed_devices(self):
+        self.device_client.list.return_value = [_device('d1'), _device('d2', with_keys=False), _device('d3')]
+        result = iot_custom.iot_device_show_connection_string(self.client, 'myhub', top=3, key_type='secondary')
+        self.assertEqual(result, [
+            {'deviceId': d, 'connectionString': 'HostName=myhub.azure-devices.net;DeviceId={0};'
+                                                'SharedAccessKey={0}-secondary'.format(d)}
+            for d in ['d1', 'd2', 'd3']])
+        # only the device listed without its keys is fetched
+        self.device_client.get.assert_called_once_with('d2')
+        self.assertEqual(self.client.list_by_subscription.call_count, 1)
+        self.assertEqual(self.client.get_keys_for_key_name.call_count, 1)
+
+    def test_hub_connection_string_with_secondary_key(self):
+        self.client.get_keys_for_key_name.return_value = mock.MagicMock(key_name='iothubowner', primary_key='a2V5',
+                                                                        secondary_key='c2Vj')
+        result = iot_custom.iot_hub_show_connection_string(self.client, 'myhub', key_type='secondary')
+        self.assertEqual(result, {'connectionString': 'HostName=myhub.azure-devices.net;'
+                                                      'SharedAccessKeyName=iothubowner;SharedAccessKey=c2Vj'})
+
+    def test_hub_delete_forgets_hub(self):
+        iot_custom.iot_device_show_connection_string(self.client, 'myhub', 'd1')
+        iot_custom.iot_hub_delete(self.client, 'myhub')
+        iot_custom.iot_device_show_connection_string(self.client, 'myhub', 'd1')
+        self.assertEqual(self.client.list_by_subscription.call_count, 2)
+        self.assertEqual(self.client.get_keys_for_key_name.call_count, 2)
+
+    def test_hub_moved_since_cached(self):
+        get_resource_id_cache().add([_Hub('myhub', 'rg1').id])
+
+        def _get_keys(resource_group_name, hub_name, policy_name):
+            if resource_group_name == 'rg1':
+                raise _not_found('ResourceNotFound', "The Resource 'Microsoft.Devices/IotHubs/myhub' "
+                                                     "under resource group 'rg1' was not found.")
+            return mock.MagicMock(key_name=policy_name, primary_key='a2V5')
+        self.client.get_keys_for_key_name.side_effect = _get_keys
+        iot_custom.iot_device_show_connection_string(self.client, 'myhub', 'd1')
+        self.assertEqual(self.client.list_by_subscription.call_count, 1)
+        self.assertEqual([c[0][0] for c in self.client.get_keys_for_key_name.call_args_list], ['rg1', 'rg2'])
+
+    def test_missing_consumer_group_does_not_locate_hub_again(self):
+        get_resource_id_cache().add([_Hub('myhub', 'rg2').id])
+        self.client.get_event_hub_consumer_group.side_effect = _not_found(
+            'NotFound', "Consumer group 'missing' was not found.")
+        with self.assertRaises(ClientException):
+            iot_custom.iot_hub_consumer_group_get(self.client, 'myhub', 'missing')
+        self.client.get_event_hub_consumer_group.assert_called_once_with('rg2', 'myhub', 'events', 'missing')
+        self.client.list_by_subscription.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,38 @@ helps['keyvault secret'] = """
     short-summary: Manage secrets.
 """
 
+helps['keyvault key backup-all'] = """
+    type: command
+    short-summary: Back up all the keys of a vault into a local archive.
+    long-summary: The keys are backed up concurrently and appended to the archive one by one. Running the command again with the same archive resumes an interrupted backup.
+    examples:
+        - name: Back up the keys of a vault.
+          text: az keyvault key backup-all --vault-name MyVault -f keys.archive
+"""
+
+helps['keyvault key restore-all'] = """
+    type: command
+    short-summary: Restore all the keys of a local archive into a vault.
+    long-summary: The keys are restored concurrently. Running the command again with the same archive resumes an interrupted restore.
+"""
+
+helps['keyvault secret backup-all'] = """
+    type: command
+    short-summary: Back up all the secrets of a vault into a local archive.
+    long-summary: The secrets are fetched concurrently and appended to the archive one by one. The archive holds the secret values in plain text and is created readable by its owner only. Running the command again with the same archive resumes an interrupted backup.
+    examples:
+        - name: Copy the secrets of a vault to another vault.
+          text: >
+            az keyvault secret backup-all --vault-name MyVault -f secrets.archive &&
+            az keyvault secret restore-all --vault-name MyOtherVault -f secrets.archive
+"""
+
+helps['keyvault secret restore-all'] = """
+    type: command
+    short-summary: Restore all the secrets of a local archive into a vault.
+    long-summary: The secrets are set concurrently, as new versions of the secrets existing in the vault. Running the command again with the same archive resumes an interrupted restore.
+"""
+
 helps['keyvault certificate'] = """
     type: group
     short-summary: Manage certificates.
@@ -138,6 +138,10 @@ register_cli_argument('keyvault key backup', 'file_path', options_list=('--file'
 
 register_cli_argument('keyvault key restore', 'file_path', options_list=('--file', '-f'), type=file_type, completer=FilesCompleter(), help='Local key backup from which to restore key.')
 
+for item in ['key', 'secret']:
+    register_cli_argument('keyvault {} backup-all'.format(item), 'file_path', options_list=('--file', '-f'), type=file_type, completer=FilesCompleter(), help='Local archive in which to store the {0} backups. {0}s already in the archive are skipped.'.format(item.capitalize()))
+    register_cli_argument('keyvault {} restore-all'.format(item), 'file_path', options_list=('--file', '-f'), type=file_type, completer=FilesCompleter(), help='Local archive from which to restore the {}s.'.format(item))
+
 register_attributes_argument('keyvault key set-attributes', 'key', KeyAttributes)
 
 register_cli_argument('keyvault secret', 'secret_version', options_list=('--version', '-v'), help='The secret version. If omitted, uses the latest version.', default='', required=False, completer=get_keyvault_version_completion_list('secret'))
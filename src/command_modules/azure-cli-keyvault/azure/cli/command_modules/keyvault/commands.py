@@ -46,6 +46,8 @@ cli_keyvault_data_plane_command('keyvault key show', base_client_path.format('Ke
 cli_keyvault_data_plane_command('keyvault key delete', convenience_path.format('KeyVaultClient.delete_key'))
 cli_keyvault_data_plane_command('keyvault key backup', custom_path.format('backup_key'))
 cli_keyvault_data_plane_command('keyvault key restore', custom_path.format('restore_key'))
+cli_keyvault_data_plane_command('keyvault key backup-all', custom_path.format('backup_all_keys'))
+cli_keyvault_data_plane_command('keyvault key restore-all', custom_path.format('restore_all_keys'))
 cli_keyvault_data_plane_command('keyvault key import', custom_path.format('import_key'))
 
 cli_keyvault_data_plane_command('keyvault secret list', convenience_path.format('KeyVaultClient.get_secrets'))
@@ -55,6 +57,8 @@ cli_keyvault_data_plane_command('keyvault secret set-attributes', base_client_pa
 cli_keyvault_data_plane_command('keyvault secret show', base_client_path.format('KeyVaultClient.get_secret'))
 cli_keyvault_data_plane_command('keyvault secret delete', convenience_path.format('KeyVaultClient.delete_secret'))
 cli_keyvault_data_plane_command('keyvault secret download', custom_path.format('download_secret'))
+cli_keyvault_data_plane_command('keyvault secret backup-all', custom_path.format('backup_all_secrets'))
+cli_keyvault_data_plane_command('keyvault secret restore-all', custom_path.format('restore_all_secrets'))
 
 cli_keyvault_data_plane_command('keyvault certificate create', custom_path.format('create_certificate'))
 cli_keyvault_data_plane_command('keyvault certificate list', convenience_path.format('KeyVaultClient.get_certificates'))
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import base64
 import codecs
 import json
 import os
@@ -39,6 +40,9 @@ from azure.cli.command_modules.keyvault._validators import secret_text_encoding_
 
 logger = azlogging.get_az_logger(__name__)
 
+MAX_CONCURRENT_VAULT_REQUESTS = 10
+MAX_VAULT_REQUEST_ATTEMPTS = 5
+
 
 def _default_certificate_profile():
     template = CertificatePolicy(
@@ -393,6 +397,25 @@ def restore_key(client, vault_base_url, file_path):
 restore_key.__doc__ = KeyVaultClient.restore_key.__doc__
 
 
+def backup_all_keys(client, vault_base_url, file_path):
+    """ Back up all the keys of a KeyVault into an archive. Keys already in the archive are
+    skipped, so an interrupted backup resumes where it stopped. """
+    def _backup(name):
+        backup = _call_with_retry(client.backup_key, vault_base_url, name).value
+        return {'type': 'key', 'name': name,
+                'backup': base64.b64encode(backup).decode('utf-8')}
+    items = _list_with_retry(client.get_keys(vault_base_url))
+    return _backup_all(file_path, (_get_vault_object_name(i.kid) for i in items), _backup)
+
+
+def restore_all_keys(client, vault_base_url, file_path):
+    """ Restore all the keys backed up in an archive into a KeyVault. Keys restored by an
+    interrupted restore are skipped. """
+    def _restore(record):
+        _call_with_retry(client.restore_key, vault_base_url, base64.b64decode(record['backup']))
+    return _restore_all(file_path, 'key', _restore)
+
+
 # pylint: disable=too-many-arguments,assignment-from-no-return,unused-variable
 def import_key(client, vault_base_url, key_name, destination=None, key_ops=None, disabled=False,
                expires=None, not_before=None, tags=None, pem_file=None, pem_password=None,
@@ -490,7 +513,6 @@ def download_secret(client, vault_base_url, secret_name, file_path, encoding=Non
                 f.write(secret_value)
         else:
             if encoding == 'base64':
-                import base64
                 decoded = base64.b64decode(secret_value)
             elif encoding == 'hex':
                 import binascii
@@ -504,6 +526,184 @@ def download_secret(client, vault_base_url, secret_name, file_path, encoding=Non
         raise ex
 
 
+def backup_all_secrets(client, vault_base_url, file_path):
+    """ Back up all the secrets of a KeyVault into an archive. Secrets already in the archive are
+    skipped, so an interrupted backup resumes where it stopped. """
+    from azure.keyvault.generated.models import SecretAttributes
+
+    def _backup(name):
+        secret = _call_with_retry(client.keyvault.get_secret, vault_base_url, name, '')
+        return {'type': 'secret', 'name': name, 'value': secret.value,
+                'contentType': secret.content_type, 'tags': secret.tags,
+                'attributes': client.keyvault._serialize.body(  # pylint: disable=protected-access
+                    secret.attributes or SecretAttributes(), 'SecretAttributes')}
+    # secrets backing certificates are managed by KeyVault and restored with the certificates
+    items = (i for i in _list_with_retry(client.get_secrets(vault_base_url))
+             if not getattr(i, 'managed', None))
+    return _backup_all(file_path, (_get_vault_object_name(i.id) for i in items), _backup)
+
+
+def restore_all_secrets(client, vault_base_url, file_path):
+    """ Restore all the secrets backed up in an archive into a KeyVault. Secrets restored by an
+    interrupted restore are skipped. """
+    def _restore(record):
+        attributes = client.keyvault._deserialize('SecretAttributes', record['attributes'])  # pylint: disable=protected-access
+        _call_with_retry(client.set_secret, vault_base_url, record['name'], record['value'],
+                         tags=record['tags'], content_type=record['contentType'],
+                         secret_attributes=attributes)
+    return _restore_all(file_path, 'secret', _restore)
+
+
+def _get_vault_object_name(object_id):
+    # https://{vault}.vault.azure.net/{collection}/{name}
+    return object_id.rstrip('/').rsplit('/', 1)[1]
+
+
+def _call_with_retry(func, *args, **kwargs):
+    """ Call a KeyVault operation, backing off while the vault throttles the requests. """
+    from azure.keyvault.generated.models import KeyVaultErrorException
+    from azure.cli.core.commands._polling import PollingBackoff, get_retry_after
+    backoff = PollingBackoff()
+    for attempt in range(1, MAX_VAULT_REQUEST_ATTEMPTS + 1):
+        try:
+            return func(*args, **kwargs)
+        except KeyVaultErrorException as ex:
+            if getattr(ex.response, 'status_code', None) not in (429, 503) or \
+                    attempt == MAX_VAULT_REQUEST_ATTEMPTS:
+                raise
+            time.sleep(backoff.next_delay(get_retry_after(ex.response)))
+
+
+def _list_with_retry(paged):
+    """ Iterate a paged KeyVault listing, retrying the pages the vault throttles. An empty
+    listing, whose null value msrest fails to iterate with a TypeError (see
+    https://github.com/Azure/autorest/issues/1309), has no items. A listing failing after some
+    items fails rather than ending early. """
+    items = iter(paged)
+    listed = False
+    while True:
+        try:
+            item = _call_with_retry(next, items)
+        except StopIteration:
+            return
+        except TypeError as ex:
+            if not listed:
+                return
+            raise CLIError('Unable to list the rest of the vault: {}. The objects listed so far '
+                           'are kept, run the command again to resume.'.format(ex))
+        listed = True
+        yield item
+
+
+def _map_concurrently(func, items):
+    """ Yield (item, result, error) for every item in order, calling `func` on up to
+    MAX_CONCURRENT_VAULT_REQUESTS items at a time without consuming `items` ahead of them. When
+    `items` fails, the items consumed before are yielded before the error is raised. """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _outcome(item, future):
+        try:
+            return item, future.result(), None
+        except Exception as ex:  # pylint: disable=broad-except
+            return item, None, ex
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VAULT_REQUESTS) as executor:
+        window = deque()
+        try:
+            for item in items:
+                window.append((item, executor.submit(func, item)))
+                if len(window) == 2 * MAX_CONCURRENT_VAULT_REQUESTS:
+                    yield _outcome(*window.popleft())
+        except Exception:
+            while window:
+                yield _outcome(*window.popleft())
+            raise
+        while window:
+            yield _outcome(*window.popleft())
+
+
+def _read_archive(file_path):
+    """ Return the records of an archive, dropping a record partially written when a backup
+    was interrupted. """
+    records = []
+    if not os.path.exists(file_path):
+        return records
+    with open(file_path, 'rb+') as f:
+        valid_size = 0
+        for line in f:
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError('partial record')
+                records.append(json.loads(line.decode('utf-8')))
+            except ValueError:
+                logger.warning("Dropping the partial record at the end of '%s'", file_path)
+                break
+            valid_size += len(line)
+        f.truncate(valid_size)
+    return records
+
+
+def _open_for_append(file_path):
+    # archives hold secret values, keep them readable by the owner only
+    return os.fdopen(os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600), 'ab')
+
+
+def _backup_all(file_path, names, backup):
+    archived = set(r['name'] for r in _read_archive(file_path))
+    result = {'backedUp': 0, 'skipped': 0, 'failed': []}
+
+    def _pending_names():
+        for name in names:
+            if name in archived:
+                result['skipped'] += 1
+            else:
+                yield name
+
+    with _open_for_append(file_path) as archive:
+        for name, record, error in _map_concurrently(backup, _pending_names()):
+            if error:
+                logger.warning("Failed to back up '%s': %s", name, error)
+                result['failed'].append({'name': name, 'error': str(error)})
+                continue
+            archive.write((json.dumps(record) + '\n').encode('utf-8'))
+            archive.flush()
+            result['backedUp'] += 1
+    return result
+
+
+def _restore_all(file_path, record_type, restore):
+    """ Restore the records of an archive. The names restored are appended to a progress file
+    next to the archive, which is removed once every record is restored. """
+    if not os.path.exists(file_path):
+        raise CLIError("Archive '{}' does not exist.".format(file_path))
+    records = _read_archive(file_path)
+    if any(r.get('type') != record_type for r in records):
+        raise CLIError("Archive '{}' does not hold {} backups.".format(file_path, record_type))
+    progress_path = file_path + '.restored'
+    restored = set(r['name'] for r in _read_archive(progress_path))
+    result = {'restored': 0, 'skipped': 0, 'failed': []}
+    pending = []
+    for record in records:
+        if record['name'] in restored:
+            result['skipped'] += 1
+        else:
+            pending.append(record)
+
+    with _open_for_append(progress_path) as progress:
+        for record, _, error in _map_concurrently(restore, pending):
+            if error:
+                logger.warning("Failed to restore '%s': %s", record['name'], error)
+                result['failed'].append({'name': record['name'], 'error': str(error)})
+                continue
+            progress.write((json.dumps({'name': record['name']}) + '\n').encode('utf-8'))
+            progress.flush()
+            result['restored'] += 1
+    if not result['failed']:
+        os.remove(progress_path)
+    return result
+
+
 def create_certificate(client, vault_base_url, certificate_name, certificate_policy,
                        disabled=False, expires=None, not_before=None, tags=None):
     cert_attrs = CertificateAttributes(not disabled, not_before, expires)
@@ -625,7 +825,6 @@ def download_certificate(client, vault_base_url, certificate_name, file_path,
             if encoding == 'binary':
                 f.write(cert)
             else:
-                import base64
                 try:
                     f.write(base64.encodebytes(cert))
                 except AttributeError:
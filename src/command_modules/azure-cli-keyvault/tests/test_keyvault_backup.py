@@ -0,0 +1,166 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import requests
+from msrest import Serializer, Deserializer
+
+from azure.keyvault.generated import models
+from azure.cli.core.util import CLIError
+from azure.cli.command_modules.keyvault.custom import (backup_all_secrets, restore_all_secrets,
+                                                       backup_all_keys, restore_all_keys)
+
+VAULT = 'https://myvault.vault.azure.net'
+_MODELS = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+
+
+def _throttled():
+    response = requests.Response()
+    response.status_code = 429
+    response.headers['Retry-After'] = '0'
+    response._content = b'{"error": {"code": "Throttled", "message": "too many requests"}}'  # pylint: disable=protected-access
+    return models.KeyVaultErrorException(Deserializer(_MODELS), response)
+
+
+class _Vault(object):
+    """ A vault whose listing and reads are throttled once. """
+
+    def __init__(self, secrets):
+        self.secrets = dict(secrets)
+        self.keyvault = mock.MagicMock()
+        self.keyvault._serialize = Serializer(_MODELS)  # pylint: disable=protected-access
+        self.keyvault._deserialize = Deserializer(_MODELS)  # pylint: disable=protected-access
+        self.keyvault.get_secret.side_effect = self._get_secret
+        self.throttled = set()
+        self.set_secret = mock.MagicMock(side_effect=self._set_secret)
+
+    def get_secrets(self, vault_base_url):
+        assert vault_base_url == VAULT
+        return [models.SecretItem(id='{}/secrets/{}'.format(VAULT, name))
+                for name in sorted(self.secrets)]
+
+    def _get_secret(self, vault_base_url, name, version):
+        assert (vault_base_url, version) == (VAULT, '')
+        if name not in self.throttled:
+            self.throttled.add(name)
+            raise _throttled()
+        if name == 'broken':
+            raise ValueError('cannot read')
+        return models.SecretBundle(value=self.secrets[name], content_type='text/plain',
+                                   tags={'env': 'test'},
+                                   attributes=models.SecretAttributes(enabled=True))
+
+    def _set_secret(self, vault_base_url, name, value, tags=None, content_type=None,
+                    secret_attributes=None):
+        assert vault_base_url == VAULT
+        assert (tags, content_type, secret_attributes.enabled) == ({'env': 'test'}, 'text/plain', True)
+        self.secrets[name] = value
+
+
+@mock.patch('time.sleep')
+class TestKeyVaultBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.archive = os.path.join(self.folder, 'secrets.archive')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _read_names(self, path):
+        with open(path) as f:
+            return sorted(json.loads(line)['name'] for line in f)
+
+    def test_backup_and_restore_secrets(self, _):
+        secrets = {'secret{}'.format(i): 'value{}'.format(i) for i in range(25)}
+        result = backup_all_secrets(_Vault(secrets), VAULT, self.archive)
+        self.assertEqual(result, {'backedUp': 25, 'skipped': 0, 'failed': []})
+        self.assertEqual(self._read_names(self.archive), sorted(secrets))
+        self.assertEqual(os.stat(self.archive).st_mode & 0o777, 0o600)
+
+        target = _Vault({})
+        result = restore_all_secrets(target, VAULT, self.archive)
+        self.assertEqual(result, {'restored': 25, 'skipped': 0, 'failed': []})
+        self.assertEqual(target.secrets, secrets)
+        self.assertFalse(os.path.exists(self.archive + '.restored'))
+
+    def test_backup_resumes(self, _):
+        vault = _Vault({'a': '1', 'b': '2', 'broken': '3'})
+        result = backup_all_secrets(vault, VAULT, self.archive)
+        self.assertEqual((result['backedUp'], [f['name'] for f in result['failed']]), (2, ['broken']))
+
+        # a backup interrupted while writing a record
+        with open(self.archive, 'ab') as f:
+            f.write(b'{"type": "secret", "na')
+        vault.secrets['c'] = '4'
+        del vault.secrets['broken']
+        result = backup_all_secrets(vault, VAULT, self.archive)
+        self.assertEqual(result, {'backedUp': 1, 'skipped': 2, 'failed': []})
+        self.assertEqual(self._read_names(self.archive), ['a', 'b', 'c'])
+
+    def test_backup_fails_when_listing_stops_early(self, _):
+        vault = _Vault({'a': '1', 'b': '2'})
+
+        def get_secrets(vault_base_url):
+            yield models.SecretItem(id='{}/secrets/a'.format(vault_base_url))
+            raise TypeError("'NoneType' object is not iterable")
+        vault.get_secrets = get_secrets
+        with self.assertRaises(CLIError):
+            backup_all_secrets(vault, VAULT, self.archive)
+        self.assertEqual(self._read_names(self.archive), ['a'])
+
+    def test_backup_of_empty_vault(self, _):
+        vault = _Vault({})
+
+        def get_secrets(vault_base_url):  # pylint: disable=unused-argument
+            raise TypeError("'NoneType' object is not iterable")
+            yield  # pylint: disable=unreachable
+        vault.get_secrets = get_secrets
+        self.assertEqual(backup_all_secrets(vault, VAULT, self.archive),
+                         {'backedUp': 0, 'skipped': 0, 'failed': []})
+
+    def test_restore_resumes(self, _):
+        backup_all_secrets(_Vault({'a': '1', 'b': '2'}), VAULT, self.archive)
+        target = _Vault({})
+
+        def set_secret(vault_base_url, name, *args, **kwargs):
+            if name != 'a':
+                raise ValueError('conflict')
+            target._set_secret(vault_base_url, name, *args, **kwargs)  # pylint: disable=protected-access
+        target.set_secret.side_effect = set_secret
+        result = restore_all_secrets(target, VAULT, self.archive)
+        self.assertEqual((result['restored'], [f['name'] for f in result['failed']]), (1, ['b']))
+        self.assertEqual(self._read_names(self.archive + '.restored'), ['a'])
+
+        target.set_secret.side_effect = target._set_secret  # pylint: disable=protected-access
+        result = restore_all_secrets(target, VAULT, self.archive)
+        self.assertEqual(result, {'restored': 1, 'skipped': 1, 'failed': []})
+        self.assertEqual(target.secrets, {'a': '1', 'b': '2'})
+        self.assertFalse(os.path.exists(self.archive + '.restored'))
+
+    def test_backup_and_restore_keys(self, _):
+        client = mock.MagicMock()
+        client.get_keys.return_value = [models.KeyItem(kid='{}/keys/{}'.format(VAULT, name))
+                                        for name in ['k1', 'k2']]
+        client.backup_key.side_effect = [_throttled(), mock.MagicMock(value=b'\x01'),
+                                         mock.MagicMock(value=b'\x02')]
+        result = backup_all_keys(client, VAULT, self.archive)
+        self.assertEqual(result, {'backedUp': 2, 'skipped': 0, 'failed': []})
+
+        with self.assertRaises(CLIError):
+            restore_all_secrets(client, VAULT, self.archive)
+        result = restore_all_keys(client, VAULT, self.archive)
+        self.assertEqual(result['restored'], 2)
+        self.assertEqual(sorted(c[0][1] for c in client.restore_key.call_args_list), [b'\x01', b'\x02'])
+
+
+if __name__ == '__main__':
+    unittest.main()
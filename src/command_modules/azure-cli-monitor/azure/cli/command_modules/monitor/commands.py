@@ -11,6 +11,7 @@ from ._client_factory import (get_monitor_alert_rules_operation,
                               get_monitor_activity_log_operation,
                               get_monitor_metric_definitions_operation,
                               get_monitor_metrics_operation)
+from azure.cli.core.commands.query_pushdown import QueryPushdown, EQ
 from azure.cli.core.sdk.util import (ServiceGroup, create_service_adapter)
 
 
@@ -89,7 +90,9 @@ with ServiceGroup(__name__, get_monitor_autoscale_settings_operation,
 with ServiceGroup(__name__, get_monitor_activity_log_operation,
                   custom_operations) as s:
     with s.group('monitor activity-log') as c:
-        c.command('list', 'list_activity_log')
+        # the other fields of the filter cannot be combined, or are not strings (status)
+        c.command('list', 'list_activity_log',
+                  query_pushdown=QueryPushdown({'caller': ('caller', EQ)}, unless_args=['filters']))
 
 with ServiceGroup(__name__, get_monitor_metric_definitions_operation,
                   custom_operations) as s:
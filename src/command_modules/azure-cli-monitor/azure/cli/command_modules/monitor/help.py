@@ -84,6 +84,15 @@ helps['monitor activity-log'] = """
             type: group
             short-summary: Commands to manage activity log.
             """
+helps['monitor activity-log list'] = """
+            type: command
+            short-summary: Lists the events of the activity log.
+            long-summary: At most --max-events events are returned. When --query selects the
+                events of a caller, e.g. "[?caller=='user@contoso.com']", and --caller and
+                --filters are not given, the caller is passed to the service filter. The command
+                then returns up to --max-events events of that caller, rather than the events of
+                that caller among the latest --max-events events.
+            """
 helps['monitor metrics'] = """
             type: group
             short-summary: Commands to manage metrics.
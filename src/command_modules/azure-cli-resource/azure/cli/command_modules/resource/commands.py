@@ -4,10 +4,12 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=line-too-long
+import re
 from collections import OrderedDict
 
 from azure.cli.core.commands import cli_command
 from azure.cli.core.commands.arm import cli_generic_update_command, cli_generic_wait_command
+from azure.cli.core.commands.query_pushdown import QueryPushdown, EQ, is_unquoted
 from azure.cli.core.util import empty_on_404
 
 from azure.cli.command_modules.resource._client_factory import (_resource_client_factory,
@@ -47,9 +49,17 @@ def transform_resource_list(result):
         transformed.append(res)
     return transformed
 
+
+def _is_resource_type(value):
+    return is_unquoted(value) and re.match('[^/]+/[^/]+', value) is not None
+
 cli_command(__name__, 'resource delete', 'azure.cli.command_modules.resource.custom#delete_resource')
 cli_command(__name__, 'resource show', 'azure.cli.command_modules.resource.custom#show_resource', exception_handler=empty_on_404)
-cli_command(__name__, 'resource list', 'azure.cli.command_modules.resource.custom#list_resources', table_transformer=transform_resource_list)
+# a tag filter cannot be combined with the other filters of the service
+cli_command(__name__, 'resource list', 'azure.cli.command_modules.resource.custom#list_resources', table_transformer=transform_resource_list,
+            query_pushdown=QueryPushdown({'name': ('name', EQ, is_unquoted), 'location': ('location', EQ, is_unquoted),
+                                          'type': ('resource_type', EQ, _is_resource_type)},
+                                         unless_args=['tag', 'resource_provider_namespace']))
 cli_command(__name__, 'resource tag', 'azure.cli.command_modules.resource.custom#tag_resource')
 cli_command(__name__, 'resource move', 'azure.cli.command_modules.resource.custom#move_resource')
 
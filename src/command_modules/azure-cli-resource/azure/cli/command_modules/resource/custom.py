@@ -23,6 +23,7 @@ from azure.cli.core.parser import IncorrectUsageError
 from azure.cli.core.prompting import prompt, prompt_pass, prompt_t_f, prompt_choice_list, prompt_int
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 import azure.cli.core.azlogging as azlogging
+from azure.cli.core._completion_cache import cached_completer
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.commands.arm import is_valid_resource_id, parse_resource_id
 
@@ -310,11 +311,13 @@ def _list_resources_odata_filter_builder(resource_group_name=None,
                     filters.append("tagvalue eq '%s'" % tag_value)
     return ' and '.join(filters)
 
+@cached_completer()
 def get_providers_completion_list(prefix, **kwargs): #pylint: disable=unused-argument
     rcf = _resource_client_factory()
     result = rcf.providers.list()
     return [r.namespace for r in result]
 
+@cached_completer()
 def get_resource_types_completion_list(prefix, **kwargs): #pylint: disable=unused-argument
     rcf = _resource_client_factory()
     result = rcf.providers.list()
@@ -8,10 +8,19 @@ from collections import OrderedDict
 
 from azure.cli.core.commands import cli_command
 from azure.cli.core.commands.arm import cli_generic_update_command
+from azure.cli.core.commands.query_pushdown import QueryPushdown, EQ, STARTS_WITH, is_unquoted
+from azure.cli.core._http_cache import register_http_cache_policy
 from azure.cli.core.util import empty_on_404
 
 from .custom import (_auth_client_factory, _graph_client_factory)
 
+# custom role definitions change and have no ETag, their responses are cached for a short time
+# and removed when a role definition is written
+register_http_cache_policy('role_definitions',
+                           ['/**/providers/Microsoft.Authorization/roleDefinitions',
+                            '/**/providers/Microsoft.Authorization/roleDefinitions/*'],
+                           max_age=300)
+
 
 def transform_definition_list(result):
     return [OrderedDict([('Name', r['properties']['roleName']), ('Type', r['properties']['type']),
@@ -74,7 +83,9 @@ cli_command(__name__, 'ad app create', 'azure.cli.command_modules.role.custom#cr
 cli_command(__name__, 'ad app delete', 'azure.cli.command_modules.role.custom#delete_application',
             get_graph_client_applications)
 cli_command(__name__, 'ad app list', 'azure.cli.command_modules.role.custom#list_apps',
-            get_graph_client_applications)
+            get_graph_client_applications,
+            query_pushdown=QueryPushdown({'appId': ('app_id', EQ, is_unquoted),
+                                          'displayName': ('display_name', STARTS_WITH, is_unquoted)}))
 cli_command(__name__, 'ad app show', 'azure.cli.command_modules.role.custom#show_application',
             get_graph_client_applications, exception_handler=empty_on_404)
 cli_command(__name__, 'ad app update', 'azure.cli.command_modules.role.custom#update_application',
@@ -86,7 +97,8 @@ cli_command(__name__, 'ad sp delete',
             'azure.cli.command_modules.role.custom#delete_service_principal',
             get_graph_client_service_principals)
 cli_command(__name__, 'ad sp list', 'azure.cli.command_modules.role.custom#list_sps',
-            get_graph_client_service_principals)
+            get_graph_client_service_principals,
+            query_pushdown=QueryPushdown({'displayName': ('display_name', STARTS_WITH, is_unquoted)}))
 cli_command(__name__, 'ad sp show', 'azure.cli.command_modules.role.custom#show_service_principal',
             get_graph_client_service_principals, exception_handler=empty_on_404)
 
@@ -104,7 +116,9 @@ cli_command(__name__, 'ad user show',
             get_graph_client_users,
             exception_handler=empty_on_404)
 cli_command(__name__, 'ad user list', 'azure.cli.command_modules.role.custom#list_users',
-            get_graph_client_users)
+            get_graph_client_users,
+            query_pushdown=QueryPushdown({'userPrincipalName': ('upn', EQ, is_unquoted),
+                                          'displayName': ('display_name', STARTS_WITH, is_unquoted)}))
 cli_command(__name__, 'ad user create', 'azure.cli.command_modules.role.custom#create_user',
             get_graph_client_users)
 
@@ -116,4 +130,5 @@ cli_command(__name__, 'ad group show',
             get_graph_client_groups,
             exception_handler=empty_on_404)
 cli_command(__name__, 'ad group list', 'azure.cli.command_modules.role.custom#list_groups',
-            get_graph_client_groups)
+            get_graph_client_groups,
+            query_pushdown=QueryPushdown({'displayName': ('display_name', STARTS_WITH, is_unquoted)}))
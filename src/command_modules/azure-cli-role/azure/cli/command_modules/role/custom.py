@@ -11,6 +11,7 @@ import dateutil.parser
 
 from azure.cli.core.util import CLIError, todict, get_file_json, shell_safe_json_parse
 import azure.cli.core.azlogging as azlogging
+from azure.cli.core._completion_cache import cached_completer
 
 from azure.mgmt.authorization.models import (RoleAssignmentProperties, Permission, RoleDefinition,
                                              RoleDefinitionProperties)
@@ -38,6 +39,7 @@ def list_role_definitions(name=None, resource_group_name=None, scope=None,
     return _search_role_definitions(definitions_client, name, scope, custom_role_only)
 
 
+@cached_completer()
 def get_role_definition_name_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
     definitions = list_role_definitions()
     return [x.properties.role_name for x in list(definitions)]
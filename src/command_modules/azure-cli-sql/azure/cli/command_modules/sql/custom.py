@@ -12,6 +12,7 @@ from azure.cli.core.commands.client_factory import (
     get_mgmt_service_client,
     get_subscription_id)
 from azure.cli.core.util import CLIError
+from azure.cli.core._resource_cache import call_with_resource_ids
 from azure.mgmt.sql.models.sql_management_client_enums import (
     BlobAuditingPolicyState,
     CreateMode,
@@ -404,35 +405,45 @@ def db_update(
 #####
 
 
-# Finds a storage account's resource group by querying ARM resource cache.
+# Finds a storage account's resource group by querying ARM resource cache, and calls operation
+# with it.
 # Why do we have to do this: so we know the resource group in order to later query the storage API
 # to determine the account's keys and endpoint. Why isn't this just a command line parameter:
 # because if it was a command line parameter then the customer would need to specify storage
 # resource group just to update some unrelated property, which is annoying and makes no sense to
 # the customer.
-def _find_storage_account_resource_group(name):
+def _call_with_storage_account_resource_group(name, operation):
     storage_type = 'Microsoft.Storage/storageAccounts'
     classic_storage_type = 'Microsoft.ClassicStorage/storageAccounts'
 
-    query = "name eq '{}' and (resourceType eq '{}' or resourceType eq '{}')".format(
-        name, storage_type, classic_storage_type)
-
     client = get_mgmt_service_client(ResourceManagementClient)
-    resources = list(client.resources.list(filter=query))
+    resources = []
+
+    def _list_storage_accounts():
+        query = "name eq '{}' and (resourceType eq '{}' or resourceType eq '{}')".format(
+            name, storage_type, classic_storage_type)
+        resources.extend(client.resources.list(filter=query))
+        return resources
 
-    if len(resources) == 0:
-        raise CLIError("No storage account with name '{}' was found.".format(name))
+    def _call(resource_ids):
+        if len(resource_ids) == 0:
+            if any(r.type == classic_storage_type for r in resources):
+                raise CLIError("The storage account with name '{}' is a classic storage account"
+                               " which is not supported by this command. Use a non-classic"
+                               " storage account or specify storage endpoint and key"
+                               " instead.".format(name))
+            raise CLIError("No storage account with name '{}' was found.".format(name))
 
-    if len(resources) > 1:
-        raise CLIError("Multiple storage accounts with name '{}' were found.".format(name))
+        if len(resource_ids) > 1:
+            raise CLIError("Multiple storage accounts with name '{}' were found.".format(name))
 
-    if resources[0].type == classic_storage_type:
-        raise CLIError("The storage account with name '{}' is a classic storage account which is"
-                       " not supported by this command. Use a non-classic storage account or"
-                       " specify storage endpoint and key instead.".format(name))
+        # Split the uri and pass just the resource group
+        return operation(resource_ids[0].split('/')[4])
 
-    # Split the uri and return just the resource group
-    return resources[0].id.split('/')[4]
+    # The resource group is remembered across commands, and located again when the storage
+    # account is not found in it anymore.
+    return call_with_resource_ids(client.config.subscription_id, storage_type, name,
+                                  _list_storage_accounts, _call)
 
 
 # Determines storage account name from endpoint url string.
@@ -496,8 +507,10 @@ def _db_security_policy_update(  # pylint: disable=too-many-arguments
     if storage_endpoint is not None:
         instance.storage_endpoint = storage_endpoint
     if storage_account is not None:
-        storage_resource_group = _find_storage_account_resource_group(storage_account)
-        instance.storage_endpoint = _get_storage_endpoint(storage_account, storage_resource_group)
+        instance.storage_endpoint, storage_resource_group = \
+            _call_with_storage_account_resource_group(
+                storage_account,
+                lambda group: (_get_storage_endpoint(storage_account, group), group))
 
     # Set storage access key
     if storage_account_access_key is not None:
@@ -514,12 +527,14 @@ def _db_security_policy_update(  # pylint: disable=too-many-arguments
         # function, but at least we tried.
         if storage_account is None:
             storage_account = _get_storage_account_name(instance.storage_endpoint)
-            storage_resource_group = _find_storage_account_resource_group(storage_account)
-
-        instance.storage_account_access_key = _get_storage_key(
-            storage_account,
-            storage_resource_group,
-            use_secondary_key)
+            instance.storage_account_access_key = _call_with_storage_account_resource_group(
+                storage_account,
+                lambda group: _get_storage_key(storage_account, group, use_secondary_key))
+        else:
+            instance.storage_account_access_key = _get_storage_key(
+                storage_account,
+                storage_resource_group,
+                use_secondary_key)
 
 
 # Update audit policy. Custom update function to apply parameters to instance.
@@ -33,14 +33,18 @@ storage_account_key_options = {'primary': 'key1', 'secondary': 'key2'}
 # Utilities
 
 def _query_account_key(account_name):
+    from azure.cli.core._resource_cache import call_with_resource_ids
+    from azure.cli.core.commands.arm import parse_resource_id
     scf = get_mgmt_service_client(StorageManagementClient)
-    acc = next((x for x in scf.storage_accounts.list() if x.name == account_name), None)
-    if acc:
-        from azure.cli.core.commands.arm import parse_resource_id
-        rg = parse_resource_id(acc.id)['resource_group']
+
+    def _list_keys(account_ids):
+        if not account_ids:
+            raise ValueError("Storage account '{}' not found.".format(account_name))
+        rg = parse_resource_id(account_ids[0])['resource_group']
         return scf.storage_accounts.list_keys(rg, account_name).keys[0].value  # pylint: disable=no-member
-    else:
-        raise ValueError("Storage account '{}' not found.".format(account_name))
+
+    return call_with_resource_ids(scf.config.subscription_id, 'Microsoft.Storage/storageAccounts',
+                                  account_name, scf.storage_accounts.list, _list_keys)
 
 
 def _create_short_lived_blob_sas(account_name, account_key, container, blob):
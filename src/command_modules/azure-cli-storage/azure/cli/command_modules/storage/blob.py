@@ -113,6 +113,7 @@ def storage_blob_download_batch(client, source, destination, source_container_na
     source_blobs = collect_blobs(client, source_container_name, pattern)
 
     if dryrun:
+        source_blobs = list(source_blobs)
         logger = get_az_logger(__name__)
         logger.warning('download action: from %s to %s', source, destination)
         logger.warning('    pattern %s', pattern)
@@ -7,15 +7,16 @@ import os
 import os.path
 from fnmatch import fnmatch
 
+_PATTERN_WILDCARDS = '*?['
+_LIST_PAGE_SIZE = 5000
+
 
 def collect_blobs(blob_service, container, pattern=None):
     """
     List the blobs in the given blob container, filter the blob by comparing their path to the given
-    pattern.
+    pattern. The literal prefix of the pattern is passed to the service so only the blobs which can
+    possibly match are listed. The names are yielded lazily as the result pages arrive.
     """
-    # TODO: deal with container which contains more that 5000 files.
-    #       In that case, the listing operation will page the results.
-
     if not blob_service:
         raise ValueError('missing parameter blob_service')
 
@@ -24,9 +25,11 @@ def collect_blobs(blob_service, container, pattern=None):
 
     if not _pattern_has_wildcards(pattern):
         return [pattern]
-    else:
-        return (blob.name for blob in blob_service.list_blobs(container)
-                if _match_path(pattern, blob.name))
+
+    prefix = _get_pattern_prefix(pattern) if pattern else ''
+    return (blob.name for blob in _list_all_pages(blob_service.list_blobs, container,
+                                                  prefix=prefix or None)
+            if _match_path(pattern, blob.name))
 
 
 def collect_files(file_service, share, pattern=None):
@@ -80,20 +83,35 @@ def glob_files_locally(folder_path, pattern):
 
 
 def glob_files_remotely(client, share_name, pattern):
-    """glob the files in remote file share based on the given pattern"""
+    """
+    glob the files in remote file share based on the given pattern. The search starts from the
+    deepest directory named literally in the pattern and skips the directories which can't contain
+    a match. Nothing matches when that directory doesn't exist.
+    """
     from collections import deque
+    from azure.common import AzureMissingResourceHttpError
     from azure.storage.file.models import Directory, File
 
-    queue = deque([""])
+    prefix = _get_pattern_prefix(pattern) if pattern else ''
+    start_dir, _ = _split_remote_path(prefix)
+
+    queue = deque([start_dir])
     while len(queue) > 0:
         current_dir = queue.pop()
-        for f in client.list_directories_and_files(share_name, current_dir):
-            if isinstance(f, File):
-                if (pattern and fnmatch(os.path.join(current_dir, f.name), pattern)) or \
-                   (not pattern):
-                    yield current_dir, f.name
-            elif isinstance(f, Directory):
-                queue.appendleft(os.path.join(current_dir, f.name))
+        name_prefix = _get_name_prefix(current_dir, prefix)
+        try:
+            for f in _list_all_pages(client.list_directories_and_files, share_name, current_dir,
+                                     prefix=name_prefix or None):
+                path = _join_remote_path(current_dir, f.name)
+                if isinstance(f, File):
+                    if (pattern and fnmatch(path, pattern)) or \
+                       (not pattern):
+                        yield current_dir, f.name
+                elif isinstance(f, Directory) and _may_contain_match(path, prefix):
+                    queue.appendleft(path)
+        except AzureMissingResourceHttpError:
+            if current_dir != start_dir:
+                raise
 
 
 def create_short_lived_container_sas(account_name, account_key, container):
@@ -133,6 +151,56 @@ def _pattern_has_wildcards(p):
     return not p or p.find('*') != -1 or p.find('?') != -1 or p.find('[') != -1
 
 
+def _get_pattern_prefix(pattern):
+    """Return the literal part of the pattern which precedes the first wildcard."""
+    for index, c in enumerate(pattern):
+        if c in _PATTERN_WILDCARDS:
+            return pattern[:index]
+    return pattern
+
+
+def _list_all_pages(list_method, *args, **kwargs):
+    """
+    Invoke a storage list method page by page, following the continuation marker until the listing
+    is exhausted. The items are yielded as soon as each page is received.
+    """
+    marker = None
+    while True:
+        page = list_method(*args, num_results=_LIST_PAGE_SIZE, marker=marker, **kwargs)
+        for item in page:
+            yield item
+
+        marker = page.next_marker
+        if not marker:
+            break
+
+
+def _split_remote_path(path):
+    """Split a remote path into its directory part and the (partial) name following it."""
+    if '/' not in path:
+        return '', path
+    directory, name = path.rsplit('/', 1)
+    return directory, name
+
+
+def _join_remote_path(directory, name):
+    return '{}/{}'.format(directory, name) if directory else name
+
+
+def _get_name_prefix(directory, prefix):
+    """Return the prefix the entries directly under the given directory must start with."""
+    directory = directory + '/' if directory else ''
+    if not prefix.startswith(directory):
+        return ''
+    return prefix[len(directory):].split('/', 1)[0]
+
+
+def _may_contain_match(directory, prefix):
+    """Whether the paths under the given directory can start with the given prefix."""
+    directory = directory + '/'
+    return directory.startswith(prefix) or prefix.startswith(directory)
+
+
 def _match_path(pattern, *args):
     if not pattern:
         return True
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import mock
+
+from azure.common import AzureMissingResourceHttpError
+from azure.storage.file.models import Directory, File
+from azure.cli.command_modules.storage.util import (collect_blobs, glob_files_remotely,
+                                                    _get_pattern_prefix)
+
+
+class _FakePage(list):
+    def __init__(self, items, next_marker=None):
+        super(_FakePage, self).__init__(items)
+        self.next_marker = next_marker
+
+
+def _blob(name):
+    blob = mock.MagicMock()
+    blob.name = name
+    return blob
+
+
+class TestStorageUtil(unittest.TestCase):
+    def test_pattern_prefix(self):
+        self.assertEqual(_get_pattern_prefix('logs/2017-05-*'), 'logs/2017-05-')
+        self.assertEqual(_get_pattern_prefix('logs/?/a'), 'logs/')
+        self.assertEqual(_get_pattern_prefix('[ab]*'), '')
+        self.assertEqual(_get_pattern_prefix('*'), '')
+        self.assertEqual(_get_pattern_prefix('exact/name'), 'exact/name')
+
+    def test_collect_blobs_pushes_prefix_and_follows_markers(self):
+        pages = {
+            None: _FakePage([_blob('logs/2017-05-01.txt'), _blob('logs/2017-05-02.log')], 'm1'),
+            'm1': _FakePage([_blob('logs/2017-05-03.txt')], None)
+        }
+        service = mock.MagicMock()
+        service.list_blobs.side_effect = lambda container, **kwargs: pages[kwargs['marker']]
+
+        result = collect_blobs(service, 'cont', 'logs/2017-05-*.txt')
+        self.assertFalse(service.list_blobs.called, 'listing should be lazy')
+
+        self.assertEqual(list(result), ['logs/2017-05-01.txt', 'logs/2017-05-03.txt'])
+        self.assertEqual(service.list_blobs.call_count, 2)
+        for call in service.list_blobs.call_args_list:
+            self.assertEqual(call[0], ('cont',))
+            self.assertEqual(call[1]['prefix'], 'logs/2017-05-')
+
+    def test_collect_blobs_without_wildcards(self):
+        service = mock.MagicMock()
+        self.assertEqual(collect_blobs(service, 'cont', 'logs/a.txt'), ['logs/a.txt'])
+        self.assertFalse(service.list_blobs.called)
+
+    def test_collect_blobs_without_pattern(self):
+        service = mock.MagicMock()
+        service.list_blobs.return_value = _FakePage([_blob('a.txt'), _blob('logs/b.txt')])
+        self.assertEqual(list(collect_blobs(service, 'cont')), ['a.txt', 'logs/b.txt'])
+        self.assertIsNone(service.list_blobs.call_args[1]['prefix'])
+
+    def test_glob_files_remotely_starts_from_literal_directory(self):
+        tree = {
+            'logs': [Directory('2017-05-01'), Directory('2017-05-02'),
+                     File('2017-05-31.txt'), File('2017-06-01.txt')],
+            'logs/2017-05-01': [File('a.txt'), File('b.bin')],
+            'logs/2017-05-02': [Directory('nested')],
+            'logs/2017-05-02/nested': [File('c.txt')]
+        }
+
+        def _list(share, directory, **kwargs):
+            self.assertEqual(share, 'share')
+            entries = [e for e in tree[directory] if e.name.startswith(kwargs['prefix'] or '')]
+            return _FakePage(entries)
+
+        client = mock.MagicMock()
+        client.list_directories_and_files.side_effect = _list
+
+        result = sorted(glob_files_remotely(client, 'share', 'logs/2017-05-*.txt'))
+        self.assertEqual(result, [('logs', '2017-05-31.txt'),
+                                  ('logs/2017-05-01', 'a.txt'),
+                                  ('logs/2017-05-02/nested', 'c.txt')])
+
+        listed = [call[0][1] for call in client.list_directories_and_files.call_args_list]
+        self.assertNotIn('', listed)
+        self.assertEqual(listed[0], 'logs')
+
+    def test_glob_files_remotely_in_missing_directory(self):
+        client = mock.MagicMock()
+        client.list_directories_and_files.side_effect = AzureMissingResourceHttpError(
+            'The specified resource does not exist.', 404)
+        self.assertEqual(list(glob_files_remotely(client, 'share', 'missing/dir/*.txt')), [])
+        self.assertEqual(client.list_directories_and_files.call_args[0], ('share', 'missing/dir'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ from azure.mgmt.compute.models import (CachingTypes,
 from azure.mgmt.storage.models import SkuName
 
 from azure.cli.core.commands import register_cli_argument, CliArgumentType, register_extra_cli_argument
+from azure.cli.core._completion_cache import cached_completer
 from azure.cli.core.commands.validators import \
     (get_default_location_from_resource_group, validate_file_or_dict)
 from azure.cli.core.commands.parameters import \
@@ -25,11 +26,13 @@ from azure.cli.command_modules.vm._validators import \
      process_disk_encryption_namespace)
 
 
+@cached_completer()
 def get_urn_aliases_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
     images = load_images_from_aliases_doc()
     return [i['urnAlias'] for i in images]
 
 
+@cached_completer(args=['location'])
 def get_vm_size_completion_list(prefix, action, parsed_args, **kwargs):  # pylint: disable=unused-argument
     try:
         location = parsed_args.location
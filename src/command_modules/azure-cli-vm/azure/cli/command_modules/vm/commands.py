@@ -13,12 +13,20 @@ from azure.cli.command_modules.vm._client_factory import (cf_vm, cf_avail_set, c
                                                           cf_images)
 from azure.cli.core.commands import DeploymentOutputLongRunningOperation, cli_command
 from azure.cli.core.commands.arm import cli_generic_update_command, cli_generic_wait_command
+from azure.cli.core._http_cache import register_http_cache_policy
 from azure.cli.core.util import empty_on_404
 # pylint: disable=line-too-long
 
 custom_path = 'azure.cli.command_modules.vm.custom#{}'
 mgmt_path = 'azure.mgmt.compute.operations.{}#{}.{}'
 
+_compute_path = '/subscriptions/*/providers/Microsoft.Compute/'
+register_http_cache_policy('vm_sizes', [_compute_path + 'locations/*/vmSizes'], max_age=24 * 3600)
+register_http_cache_policy('vm_skus', [_compute_path + 'skus'], max_age=24 * 3600)
+register_http_cache_policy('vm_images', [_compute_path + 'locations/*/publishers',
+                                         _compute_path + 'locations/*/publishers/**'],
+                           max_age=3600)
+
 # VM
 
 